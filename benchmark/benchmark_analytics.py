@@ -0,0 +1,98 @@
+"""
+Check src/analytics.py against db/query_the_data.sql and time both on a synthetic star schema.
+
+Loads a synthetic star schema into the database of --upload-creds, replacing its star schema tables,
+so point it at a scratch database. Every task of the SQL script is run against the database and
+compared with the SalesAnalytics method answering the same question on the cleaned DataFrames.
+
+Usage:
+    PYTHONPATH=$(pwd) python benchmark/benchmark_analytics.py --upload-creds ./scratch_db_creds.yaml --orders 500000
+"""
+from argparse import ArgumentParser
+from time import perf_counter
+import re
+import pandas as pd
+from pandas import DataFrame
+from benchmark.benchmark_queries import load_star_schema, make_star_schema, time_query
+from src.analytics import SalesAnalytics
+from src.database_utils import DatabaseConnector
+
+QUERIES_SCRIPT = "./db/query_the_data.sql"
+
+
+def read_tasks(path: str) -> list:
+    """
+    Split the query script into the query of every "-- task N" section, without psql meta-commands.
+
+    Returns:
+        list: Queries in task order.
+    """
+    with open(path) as file:
+        sections = re.split(r"^-- task \d+$", file.read(), flags=re.MULTILINE)[1:]
+    return ["\n".join(line for line in section.splitlines() if not line.startswith("\\")).strip()
+            for section in sections]
+
+
+def comparable(df: DataFrame) -> DataFrame:
+    """
+    Convert df to plain float and object columns (intervals in seconds) sorted on all columns,
+    so results of PostgreSQL and pandas with ties in a different order compare equal.
+    """
+    columns = {}
+    for column, values in df.items():
+        is_interval = values.map(lambda value: hasattr(value, "days")).any()
+        is_number = values.map(lambda value: hasattr(value, "as_integer_ratio")).any()
+        if pd.api.types.is_timedelta64_dtype(values) or is_interval:
+            columns[column] = pd.to_timedelta(values).dt.total_seconds()
+        elif pd.api.types.is_numeric_dtype(values) or is_number:
+            columns[column] = pd.to_numeric(values).astype("float64")
+        else:
+            columns[column] = values.astype(object).where(values.notna(), None)
+    df = DataFrame(columns)
+    return df.sort_values(list(df.columns), kind="stable").reset_index(drop=True)
+
+
+def benchmark_analytics(upload_creds: str, orders: int, seed: int, repeat: int) -> None:
+    """
+    Load a synthetic star schema, then run and compare every task in SQL and in SalesAnalytics.
+    """
+    tables = make_star_schema(orders, seed)
+    with DatabaseConnector() as connector:
+        connector.upload_creds_url = upload_creds
+        engine = connector.init_upload_db_engine()
+        load_star_schema(connector, engine, tables)
+        connection = engine.raw_connection()
+        try:
+            connection.cursor().execute("ANALYZE")
+            connection.commit()
+            print(f"business questions  orders={orders:,}")
+            for method, query in zip(SalesAnalytics.QUESTIONS, read_tasks(QUERIES_SCRIPT)):
+                rows, sql_time = time_query(connection, query, repeat)
+                with connection.cursor() as cursor:
+                    cursor.execute(query)
+                    columns = [column.name for column in cursor.description]
+                expected = DataFrame(rows, columns=columns)
+
+                best = float("inf")
+                for _ in range(repeat):
+                    # a new instance per run, so the fact_sales join is part of the timing
+                    analytics = SalesAnalytics(tables)
+                    start = perf_counter()
+                    result = getattr(analytics, method)()
+                    best = min(best, perf_counter() - start)
+                # floating point sums may differ in the last digits with the order of the rows
+                pd.testing.assert_frame_equal(comparable(result), comparable(expected), check_exact=False)
+                print(f"  {method:<26} SQL {sql_time * 1000:8.1f}ms  pandas {best * 1000:8.1f}ms")
+            connection.rollback()
+        finally:
+            connection.close()
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--upload-creds", required=True, help="YAML credentials of a scratch database")
+    parser.add_argument("--orders", type=int, default=500_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    benchmark_analytics(args.upload_creds, args.orders, args.seed, args.repeat)
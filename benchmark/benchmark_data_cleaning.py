@@ -0,0 +1,87 @@
+"""
+Compare the per-row DataCleaning helpers with their vectorized counterparts.
+
+Usage:
+    PYTHONPATH=$(pwd) python benchmark/benchmark_data_cleaning.py --rows 1000000
+"""
+from argparse import ArgumentParser
+from time import perf_counter
+import numpy as np
+import pandas as pd
+from benchmark.generators import GENERATORS
+from src.data_cleaning import DataCleaning
+
+cleaning_util = DataCleaning()
+
+FIRST_NAMES = ["Allen", "Sophie", "Jürgen", "FIEOPTNBWZ", "LUVV7GL3QQ", "NULL", "Mary Ann"]
+UNIQUE_VALUES = 50_000
+
+
+def make_names(rows: int, rng) -> pd.Series:
+    """
+    Build a 'first_name' like column with UNIQUE_VALUES distinct values.
+    """
+    letters = np.array(list("abcdefghijklmnopqrstuvwxyz0123456789"))
+    suffixes = ["".join(word) for word in rng.choice(letters, size=(UNIQUE_VALUES, 5))]
+    pool = [f"{rng.choice(FIRST_NAMES)}{suffix}" for suffix in suffixes]
+    pool = [name.upper() if i % 10 == 0 else name for i, name in enumerate(pool)]
+    return pd.Series(rng.choice(pool, size=rows))
+
+
+def time_call(func, *args) -> tuple:
+    """
+    Time a single call of func.
+
+    Returns:
+        tuple: (result, elapsed seconds)
+    """
+    start = perf_counter()
+    result = func(*args)
+    return result, perf_counter() - start
+
+
+def compare_helpers(scalar, vector, sample: pd.Series) -> None:
+    """
+    Time sample.apply(scalar) against vector(sample), check they agree and print both throughputs.
+    """
+    rows = len(sample)
+    expected, scalar_time = time_call(sample.apply, scalar)
+    result, vector_time = time_call(vector, sample)
+    # batch helpers may return a more compact dtype than apply, e.g. Arrow backed strings
+    assert result.equals(expected.astype(result.dtype)), f"{vector.__name__} does not match {scalar.__name__}"
+
+    scalar_label = f"apply({scalar.__name__}):"
+    vector_label = f"{vector.__name__}:"
+    width = max(len(scalar_label), len(vector_label))
+    print(f"{vector.__name__}  rows={rows:>10,}")
+    print(f"  {scalar_label:<{width}} {scalar_time:8.3f}s  {rows / scalar_time:>14,.0f} rows/s")
+    print(f"  {vector_label:<{width}} {vector_time:8.3f}s  {rows / vector_time:>14,.0f} rows/s")
+    print(f"  speed-up: {scalar_time / vector_time:.1f}x")
+
+
+def benchmark_helpers(rows: int, seed: int) -> None:
+    """
+    Benchmark every per-row helper against its batch counterpart on synthetic columns.
+    """
+    rng = np.random.default_rng(seed)
+    compare_helpers(cleaning_util.is_invalid_data_point, cleaning_util.is_invalid_data_points, make_names(rows, rng))
+
+    cards = cleaning_util.replace_null_with_nan(GENERATORS["cards"](rows, seed))
+    compare_helpers(cleaning_util.clean_card_number, cleaning_util.clean_card_numbers, cards["card_number"])
+    card_numbers = cleaning_util.clean_card_numbers(cards["card_number"])
+    compare_helpers(cleaning_util.is_valid_card_number, cleaning_util.is_valid_card_numbers, card_numbers)
+
+    staff_numbers = GENERATORS["stores"](rows, seed)["staff_numbers"]
+    compare_helpers(cleaning_util.remove_alpha_letters_from_staff_number,
+                    cleaning_util.remove_alpha_letters_from_staff_numbers, staff_numbers)
+
+    countries = GENERATORS["users"](rows, seed)["country"]
+    compare_helpers(cleaning_util.assign_valid_country_code, cleaning_util.assign_valid_country_codes, countries)
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    benchmark_helpers(args.rows, args.seed)
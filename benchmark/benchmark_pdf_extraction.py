@@ -0,0 +1,108 @@
+"""
+Compare the PDF backends and serial and page-sharded extraction of a generated card details PDF.
+
+Usage:
+    PYTHONPATH=$(pwd) python benchmark/benchmark_pdf_extraction.py --pages 300 --workers 4 --backend pdfplumber
+"""
+from argparse import ArgumentParser
+from tempfile import TemporaryDirectory
+from time import perf_counter
+import os
+import shutil
+import numpy as np
+import pandas as pd
+import sys
+import tabula
+from src.data_extraction import DataExtractor
+from src.extraction_cache import ExtractionCache
+
+# the PDF writer lives with the tests; test/ is not a package (the standard library has one of
+# that name), so its directory is put on the path
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(ROOT, "test", "test_data_extraction"))
+from card_details_pdf import ROWS_PER_PAGE, write_card_details_pdf  # noqa: E402
+
+
+def time_call(func, *args, **kwargs) -> tuple:
+    """
+    Time a single call of func.
+
+    Returns:
+        tuple: (result, elapsed seconds)
+    """
+    start = perf_counter()
+    result = func(*args, **kwargs)
+    return result, perf_counter() - start
+
+
+def read_all_pages(backend, pdf_path: str, pages: int) -> pd.DataFrame:
+    """
+    Read every page of a PDF in this process with a backend.
+    """
+    tables = backend.read_pages(pdf_path, list(range(1, pages + 1)))
+    return pd.concat([table for page_tables in tables for table in page_tables])
+
+
+def benchmark_pdf_backends(pdf_path: str, pages: int, backends: list) -> None:
+    """
+    Benchmark the backends reading every page in this process, and check they extract the same table.
+    """
+    print(f"PDF backends  pages={pages:,}  rows={pages * ROWS_PER_PAGE:,}")
+    results = {}
+    for name in backends:
+        backend = DataExtractor.PDF_BACKENDS[name]()
+        results[name], elapsed = time_call(read_all_pages, backend, pdf_path, pages)
+        print(f"  {name + ':':<30}{elapsed:8.3f}s  {pages / elapsed:>10,.1f} pages/s")
+    if "tabula" in results:
+        _, elapsed = time_call(lambda: pd.concat(tabula.read_pdf(pdf_path, pages="all", force_subprocess=True)))
+        print(f"  {'tabula pages=all, subprocess:':<30}{elapsed:8.3f}s  {pages / elapsed:>10,.1f} pages/s")
+
+    expected = next(iter(results.values()))
+    for name, result in results.items():
+        assert result.columns.tolist() == expected.columns.tolist(), f"{name} columns differ"
+        assert result.astype(str).values.tolist() == expected.astype(str).values.tolist(), f"{name} rows differ"
+
+
+def benchmark_retrieve_pdf_data(pdf_path: str, pages: int, workers: int, backend: str) -> None:
+    """
+    Benchmark reading every page in this process against the sharded retrieve_pdf_data.
+    """
+    expected, serial_time = time_call(read_all_pages, DataExtractor.PDF_BACKENDS[backend](), pdf_path, pages)
+    with TemporaryDirectory() as cache_dir:
+        extractor = DataExtractor(cache=ExtractionCache(cache_dir), pdf_backend=backend)
+        result, sharded_time = time_call(extractor.retrieve_pdf_data, pdf_path, max_workers=workers)
+        assert result.equals(expected), "sharded extraction does not match a serial extraction"
+
+        # change one page and extract again, only that page is parsed
+        with open(pdf_path, "r+b") as file:
+            pdf = file.read().replace(b"VISA 16 digit", b"VISA 19 digit", 1)
+            file.seek(0)
+            file.write(pdf)
+        _, rerun_time = time_call(extractor.retrieve_pdf_data, pdf_path, max_workers=workers)
+
+    print(f"retrieve_pdf_data  pages={pages:,}  workers={workers}  backend={backend}")
+    print(f"  serial:                       {serial_time:8.3f}s  {pages / serial_time:>10,.1f} pages/s")
+    print(f"  sharded, cold cache:          {sharded_time:8.3f}s  {pages / sharded_time:>10,.1f} pages/s")
+    print(f"  sharded, one page changed:    {rerun_time:8.3f}s")
+    print(f"  speed-up: {serial_time / sharded_time:.1f}x cold, {serial_time / rerun_time:.1f}x rerun")
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, default=300)
+    parser.add_argument("--workers", type=int, default=DataExtractor.MAX_PDF_WORKERS)
+    parser.add_argument("--backend", choices=DataExtractor.PDF_BACKENDS, default="pdfplumber")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    backends = list(DataExtractor.PDF_BACKENDS)
+    if shutil.which("java") is None:
+        print("no Java runtime on the PATH, skipping tabula")
+        backends.remove("tabula")
+        if args.backend == "tabula":
+            raise SystemExit("tabula needs a Java runtime on the PATH")
+    with TemporaryDirectory() as tmp_dir:
+        pdf_path = os.path.join(tmp_dir, "card_details.pdf")
+        write_card_details_pdf(pdf_path, args.pages, np.random.default_rng(args.seed))
+        benchmark_pdf_backends(pdf_path, args.pages, backends)
+        benchmark_retrieve_pdf_data(pdf_path, args.pages, args.workers, args.backend)
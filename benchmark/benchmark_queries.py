@@ -0,0 +1,201 @@
+"""
+Compare the reporting queries joining orders_table with the dimension tables against the fact_sales view.
+
+Loads a synthetic star schema into the database of --upload-creds, replacing its star schema tables,
+so point it at a scratch database.
+
+Usage:
+    PYTHONPATH=$(pwd) python benchmark/benchmark_queries.py --upload-creds ./scratch_db_creds.yaml --orders 500000
+"""
+from argparse import ArgumentParser
+from time import perf_counter
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+from benchmark.generators import GENERATORS
+from src.data_cleaning import DataCleaning
+from src.database_utils import DatabaseConnector
+
+cleaning_util = DataCleaning()
+
+SCHEMA_SCRIPT = "./db/create_db_schema.sql"
+# dimension table -> (generator, cleaning method, key column, rows per order)
+DIMENSIONS = {
+    "dim_users": ("users", cleaning_util.clean_user_data, "user_uuid", 0.1),
+    "dim_card_details": ("cards", cleaning_util.clean_card_data, "card_number", 0.1),
+    "dim_store_details": ("stores", cleaning_util.clean_store_data, "store_code", 0.005),
+    "dim_products": ("products", cleaning_util.clean_products_data, "product_code", 0.02)
+}
+# task -> (query joining the tables, query reading fact_sales), as in db/query_the_data.sql
+QUERIES = {
+    "task 3": (
+        """
+        WITH sales_table AS (
+        SELECT orders_table.product_quantity, dim_date_times.month, dim_products.product_price,
+            (dim_products.product_price * orders_table.product_quantity) AS total_payment
+        FROM orders_table
+        INNER JOIN dim_date_times ON dim_date_times.date_uuid = orders_table.date_uuid
+        INNER JOIN dim_products ON dim_products.product_code = orders_table.product_code
+        )
+        SELECT ROUND(SUM(total_payment)::decimal, 2) AS total_sales, "month"
+        FROM sales_table GROUP BY "month" ORDER BY total_sales DESC
+        """,
+        """
+        SELECT ROUND(SUM(total_payment)::decimal, 2) AS total_sales, "month"
+        FROM fact_sales GROUP BY "month" ORDER BY total_sales DESC
+        """
+    ),
+    "task 5": (
+        """
+        WITH sales_by_location AS (
+        SELECT orders_table.product_quantity, dim_store_details.store_type, dim_products.product_price,
+            (orders_table.product_quantity * dim_products.product_price) AS total_payment
+        FROM orders_table
+        JOIN dim_store_details ON dim_store_details.store_code = orders_table.store_code
+        JOIN dim_products ON dim_products.product_code = orders_table.product_code
+        )
+        SELECT store_type, ROUND(SUM(total_payment)::decimal, 2) As total_sales,
+            ((ROUND(SUM(total_payment)) / (SELECT SUM(total_payment) FROM sales_by_location)) * 100)
+        FROM sales_by_location GROUP BY store_type ORDER BY total_sales DESC
+        """,
+        """
+        SELECT store_type, ROUND(SUM(total_payment)::decimal, 2) As total_sales,
+            ((ROUND(SUM(total_payment)) / (SELECT SUM(total_payment) FROM fact_sales)) * 100)
+        FROM fact_sales GROUP BY store_type ORDER BY total_sales DESC
+        """
+    ),
+    "task 6": (
+        """
+        WITH sales_table AS (
+        SELECT orders_table.product_quantity, dim_date_times.month, dim_date_times.year,
+            dim_products.product_price, (dim_products.product_price * orders_table.product_quantity) AS total_payment
+        FROM orders_table
+        INNER JOIN dim_date_times ON dim_date_times.date_uuid = orders_table.date_uuid
+        INNER JOIN dim_products ON dim_products.product_code = orders_table.product_code
+        )
+        SELECT ROUND(SUM(total_payment)::decimal, 2) AS total_sales, "year", "month"
+        FROM sales_table GROUP BY "year", "month" ORDER BY total_sales DESC LIMIT 10
+        """,
+        """
+        SELECT ROUND(SUM(total_payment)::decimal, 2) AS total_sales, "year", "month"
+        FROM fact_sales GROUP BY "year", "month" ORDER BY total_sales DESC LIMIT 10
+        """
+    ),
+    "task 8": (
+        """
+        WITH sales_by_location AS (
+        SELECT orders_table.product_quantity, dim_store_details.store_type, dim_store_details.country_code,
+            dim_products.product_price, (orders_table.product_quantity * dim_products.product_price) AS total_payment
+        FROM orders_table
+        JOIN dim_store_details ON dim_store_details.store_code = orders_table.store_code
+        JOIN dim_products ON dim_products.product_code = orders_table.product_code
+        WHERE dim_store_details.country_code = 'DE'
+        )
+        SELECT ROUND(SUM(total_payment)::decimal, 2) AS total_sales, store_type,
+            (SELECT DISTINCT country_code FROM sales_by_location) AS country_code
+        FROM sales_by_location GROUP BY store_type ORDER BY total_sales
+        """,
+        """
+        SELECT ROUND(SUM(total_payment)::decimal, 2) AS total_sales, store_type, country_code
+        FROM fact_sales WHERE country_code = 'DE' GROUP BY store_type, country_code ORDER BY total_sales
+        """
+    )
+}
+
+
+def make_star_schema(orders: int, seed: int) -> dict:
+    """
+    Build cleaned star schema tables whose orders only reference existing dimension rows.
+
+    Returns:
+        dict: DataFrames by table name.
+    """
+    rng = np.random.default_rng(seed)
+    tables = {}
+    for table_name, (generator, clean, key, rows_per_order) in DIMENSIONS.items():
+        df = clean(GENERATORS[generator](max(int(orders * rows_per_order), 10), seed))
+        tables[table_name] = df.dropna(subset=[key]).drop_duplicates(subset=key, ignore_index=True)
+    date_times = cleaning_util.clean_date_events(GENERATORS["date_events"](orders, seed))
+    tables["dim_date_times"] = date_times.dropna(subset=["date_uuid"]).reset_index(drop=True)
+
+    df = GENERATORS["orders"](len(tables["dim_date_times"]), seed)
+    df["date_uuid"] = tables["dim_date_times"]["date_uuid"].to_numpy()
+    for table_name, (_, _, key, _) in DIMENSIONS.items():
+        df[key] = rng.choice(tables[table_name][key].to_numpy(), size=len(df))
+    tables["orders_table"] = cleaning_util.clean_orders_data(df)
+    return tables
+
+
+def load_star_schema(connector, engine, tables: dict) -> float:
+    """
+    Replace the star schema tables with tables, then build the schema and fact_sales.
+
+    Returns:
+        float: Seconds taken by the schema script.
+    """
+    with engine.begin() as connection:
+        for table_name in tables:
+            connection.execute(text(f'DROP TABLE IF EXISTS "{table_name}" CASCADE'))
+    for table_name, df in tables.items():
+        connector.upload_to_db(df, table_name, engine)
+    start = perf_counter()
+    connector.run_sql_file(SCHEMA_SCRIPT, engine)
+    return perf_counter() - start
+
+
+def time_query(connection, query: str, repeat: int) -> tuple:
+    """
+    Run a query repeat times.
+
+    Returns:
+        tuple: (rows, best elapsed seconds)
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        with connection.cursor() as cursor:
+            start = perf_counter()
+            cursor.execute(query)
+            rows = cursor.fetchall()
+            best = min(best, perf_counter() - start)
+    return rows, best
+
+
+def benchmark_queries(upload_creds: str, orders: int, seed: int, repeat: int) -> None:
+    """
+    Load a synthetic star schema, build the schema and fact_sales, then time both versions of every query.
+    """
+    with DatabaseConnector() as connector:
+        connector.upload_creds_url = upload_creds
+        engine = connector.init_upload_db_engine()
+        schema_time = load_star_schema(connector, engine, make_star_schema(orders, seed))
+
+        connection = engine.raw_connection()
+        try:
+            connection.cursor().execute("ANALYZE")
+            connection.commit()
+            print(f"reporting queries  orders={orders:,}")
+            for task, (join_query, fact_sales_query) in QUERIES.items():
+                expected, join_time = time_query(connection, join_query, repeat)
+                result, fact_sales_time = time_query(connection, fact_sales_query, repeat)
+                # floating point sums may differ in the last digits with the order of the rows
+                pd.testing.assert_frame_equal(pd.DataFrame(result), pd.DataFrame(expected), check_exact=False)
+                print(f"  {task}:  joins {join_time * 1000:8.1f}ms  fact_sales {fact_sales_time * 1000:8.1f}ms"
+                      f"  speed-up {join_time / fact_sales_time:5.1f}x")
+            connection.rollback()
+        finally:
+            connection.close()
+
+        start = perf_counter()
+        connector.refresh_materialized_view("fact_sales", engine)
+        refresh_time = perf_counter() - start
+        print(f"  schema script with fact_sales: {schema_time:.2f}s, concurrent refresh: {refresh_time:.2f}s")
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--upload-creds", required=True, help="YAML credentials of a scratch database")
+    parser.add_argument("--orders", type=int, default=500_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    benchmark_queries(args.upload_creds, args.orders, args.seed, args.repeat)
@@ -0,0 +1,266 @@
+"""
+Benchmark the cleaning and loading hot paths on seeded synthetic data, against stored baselines.
+
+Every target runs on the dirty data of benchmark/generators.py at each size. Throughput is
+the best of --repeat runs; peak memory is the tracemalloc peak of a separate run. Results are
+compared with the baselines file and the script exits with status 1 when a target is more than
+--threshold slower or hungrier than its baseline. Baselines are machine specific: save new ones
+(--save-baseline) on the machine the comparison runs on. With --backend and --partitions the
+cleaning targets run on row partitions (see src/execution.py) and are stored under their own keys;
+the peak memory of process and Dask backends only covers this process. --handoff also reports the
+cost of handing every dirty dataset to a worker process: a pickle round trip against a SharedFrame
+(src/execution.py) written, its handle pickled and the DataFrame loaded on the mapped file.
+
+Usage:
+    PYTHONPATH=$(pwd) python benchmark/benchmark_suite.py --sizes 10k 100k --repeat 3
+    PYTHONPATH=$(pwd) python benchmark/benchmark_suite.py --sizes 10k 100k --save-baseline
+    PYTHONPATH=$(pwd) python benchmark/benchmark_suite.py --sizes 1M --backend processes --partitions 4
+    PYTHONPATH=$(pwd) python benchmark/benchmark_suite.py --sizes 1M --targets clean_orders_data --handoff
+"""
+from argparse import ArgumentParser
+from time import perf_counter
+import gc
+import json
+import os
+import pickle
+import tracemalloc
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from benchmark.generators import GENERATORS
+from src.data_cleaning import DataCleaning
+from src.database_utils import DatabaseConnector
+from src.execution import BACKENDS, SharedFrame
+
+cleaning_util = DataCleaning()
+
+SIZES = {"10k": 10_000, "100k": 100_000, "1M": 1_000_000, "10M": 10_000_000}
+BASELINES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+REGRESSION_THRESHOLD = 0.2
+UPLOAD_TABLE = "benchmark_orders"
+# target name -> (generator, cleaning method)
+CLEANING_TARGETS = {
+    "clean_user_data": ("users", cleaning_util.clean_user_data),
+    "clean_card_data": ("cards", cleaning_util.clean_card_data),
+    "clean_store_data": ("stores", cleaning_util.clean_store_data),
+    "clean_products_data": ("products", cleaning_util.clean_products_data),
+    "clean_orders_data": ("orders", cleaning_util.clean_orders_data),
+    "clean_date_events": ("date_events", cleaning_util.clean_date_events)
+}
+
+
+def time_best(func, make_input, repeat: int) -> float:
+    """
+    Time func on a fresh input from make_input, returning the best of repeat runs in seconds.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        df = make_input()
+        gc.collect()
+        start = perf_counter()
+        func(df)
+        best = min(best, perf_counter() - start)
+    return best
+
+
+def peak_memory(func, make_input) -> int:
+    """
+    Run func once on a fresh input under tracemalloc, returning the peak of the memory it allocated in bytes.
+    """
+    df = make_input()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func(df)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure(func, make_input, rows: int, repeat: int) -> dict:
+    """
+    Measure the throughput and peak memory of func on inputs of rows rows.
+    """
+    elapsed = time_best(func, make_input, repeat)
+    return {"rows": rows, "seconds": elapsed, "rows_per_sec": rows / elapsed,
+            "peak_memory": peak_memory(func, make_input)}
+
+
+def benchmark_cleaning(rows: int, seed: int, repeat: int, targets: list) -> dict:
+    """
+    Benchmark the DataCleaning methods of targets on synthetic data of rows rows.
+    """
+    results = {}
+    for name in targets:
+        generator, clean = CLEANING_TARGETS[name]
+        df = GENERATORS[generator](rows, seed)
+        results[name] = measure(clean, df.copy, rows, repeat)
+    return results
+
+
+def benchmark_upload(rows: int, seed: int, repeat: int, upload_creds: str) -> dict:
+    """
+    Benchmark DatabaseConnector.upload_to_db with cleaned synthetic orders into UPLOAD_TABLE.
+
+    Returns:
+        dict: The result of the upload target, or an empty dict if the database is unreachable.
+    """
+    df = cleaning_util.clean_orders_data(GENERATORS["orders"](rows, seed))
+    with DatabaseConnector() as connector:
+        connector.upload_creds_url = upload_creds
+        engine = connector.init_upload_db_engine()
+        try:
+            with engine.connect():
+                pass
+        except OperationalError:
+            print(f"...database of {upload_creds} unreachable, skipping upload_to_db")
+            return {}
+        try:
+            return {"upload_to_db": measure(
+                lambda chunk: connector.upload_to_db(chunk, UPLOAD_TABLE, engine), lambda: df, rows, repeat
+            )}
+        finally:
+            with engine.begin() as connection:
+                connection.execute(text(f"DROP TABLE IF EXISTS {UPLOAD_TABLE}"))
+
+
+def pickle_round_trip(df):
+    """
+    Hand df over the way process workers receive it by default.
+    """
+    return pickle.loads(pickle.dumps(df))
+
+
+def shared_round_trip(df):
+    """
+    Hand df over as a SharedFrame, removing its file once loaded.
+    """
+    frame = SharedFrame(df)
+    try:
+        return pickle.loads(pickle.dumps(frame)).load()
+    finally:
+        frame.unlink()
+
+
+def benchmark_handoff(rows: int, seed: int, repeat: int, targets: list) -> dict:
+    """
+    Time the pickle and shared memory handoffs of the synthetic inputs of the cleaning targets.
+
+    Returns:
+        dict: Per generator, the size of its DataFrame and the best time of both handoffs in seconds.
+    """
+    results = {}
+    for name in targets:
+        generator = CLEANING_TARGETS[name][0]
+        df = GENERATORS[generator](rows, seed)
+        results[generator] = {
+            "bytes": int(df.memory_usage(deep=True).sum()),
+            "pickle_seconds": time_best(pickle_round_trip, lambda: df, repeat),
+            "shared_seconds": time_best(shared_round_trip, lambda: df, repeat)
+        }
+    return results
+
+
+def print_handoff(results: dict) -> None:
+    """
+    Print the handoff times of every "generator@size" next to each other.
+    """
+    print(f"{'handoff':<24}{'MiB':>10}{'pickle s':>12}{'shared s':>12}{'speed-up':>10}")
+    for key, result in results.items():
+        print(f"{key:<24}{result['bytes'] / 2**20:>10.1f}{result['pickle_seconds']:>12.3f}"
+              f"{result['shared_seconds']:>12.3f}{result['pickle_seconds'] / result['shared_seconds']:>9.1f}x")
+
+
+def compare(results: dict, baselines: dict, threshold: float) -> list:
+    """
+    Compare results with baselines, both keyed by "target@size".
+
+    Returns:
+        list: Keys whose throughput dropped or peak memory grew by more than threshold.
+    """
+    regressions = []
+    for key, result in results.items():
+        baseline = baselines.get(key)
+        if baseline is None:
+            continue
+        slower = result["rows_per_sec"] < baseline["rows_per_sec"] * (1 - threshold)
+        hungrier = result["peak_memory"] > baseline["peak_memory"] * (1 + threshold)
+        if slower or hungrier:
+            regressions.append(key)
+    return regressions
+
+
+def print_results(results: dict, baselines: dict, regressions: list) -> None:
+    """
+    Print rows/sec and peak memory of every result next to its baseline.
+    """
+    print(f"{'target':<32}{'rows/s':>14}{'baseline':>14}{'peak MiB':>10}{'baseline':>10}")
+    for key, result in results.items():
+        baseline = baselines.get(key, {})
+        baseline_rate = f"{baseline['rows_per_sec']:,.0f}" if baseline else "-"
+        baseline_memory = f"{baseline['peak_memory'] / 2**20:.1f}" if baseline else "-"
+        flag = "  REGRESSION" if key in regressions else ""
+        print(f"{key:<32}{result['rows_per_sec']:>14,.0f}{baseline_rate:>14}"
+              f"{result['peak_memory'] / 2**20:>10.1f}{baseline_memory:>10}{flag}")
+
+
+def load_baselines(path: str) -> dict:
+    """
+    Load the baselines file, returning no baselines if it does not exist.
+    """
+    if not os.path.exists(path):
+        return {}
+    with open(path) as file:
+        return json.load(file)
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", choices=SIZES, default=["10k", "100k"])
+    parser.add_argument("--targets", nargs="+", choices=list(CLEANING_TARGETS) + ["upload_to_db"],
+                        default=list(CLEANING_TARGETS) + ["upload_to_db"])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--upload-creds", default="./local_db_creds.yaml",
+                        help="YAML credentials of the database upload_to_db writes to")
+    parser.add_argument("--baselines", default=BASELINES)
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help="relative drop in rows/sec or growth in peak memory reported as a regression")
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the baselines")
+    parser.add_argument("--backend", choices=BACKENDS, default="serial",
+                        help="execution backend cleaning the row partitions")
+    parser.add_argument("--partitions", type=int, default=1, help="row partitions of every cleaned DataFrame")
+    parser.add_argument("--handoff", action="store_true",
+                        help="also report the pickle and shared memory handoff times of the cleaning inputs")
+    args = parser.parse_args()
+
+    cleaning_targets = [name for name in args.targets if name in CLEANING_TARGETS]
+    partitioned = args.backend != "serial" or args.partitions > 1
+    suffix = f"[{args.backend}x{args.partitions}]" if partitioned else ""
+    results = {}
+    handoff_results = {}
+    with BACKENDS[args.backend](max_workers=args.partitions) as backend:
+        cleaning_util.backend, cleaning_util.partitions = backend, args.partitions
+        for size in args.sizes:
+            rows = SIZES[size]
+            print(f"...benchmarking {rows:,} rows")
+            size_results = benchmark_cleaning(rows, args.seed, args.repeat, cleaning_targets)
+            results.update({f"{name}{suffix}@{size}": result for name, result in size_results.items()})
+            if "upload_to_db" in args.targets:
+                upload_results = benchmark_upload(rows, args.seed, args.repeat, args.upload_creds)
+                results.update({f"{name}@{size}": result for name, result in upload_results.items()})
+            if args.handoff:
+                size_results = benchmark_handoff(rows, args.seed, args.repeat, cleaning_targets)
+                handoff_results.update({f"{name}@{size}": result for name, result in size_results.items()})
+
+    baselines = load_baselines(args.baselines)
+    regressions = compare(results, baselines, args.threshold)
+    print_results(results, baselines, regressions)
+    if handoff_results:
+        print_handoff(handoff_results)
+    if args.save_baseline:
+        with open(args.baselines, "w") as file:
+            json.dump({**baselines, **results}, file, indent=2, sort_keys=True)
+        print(f"baselines written to {args.baselines}")
+    elif regressions:
+        print(f"{len(regressions)} targets regressed by more than {args.threshold:.0%}")
+        raise SystemExit(1)
@@ -0,0 +1,114 @@
+"""
+Measure how the uploads scale with the number of parallel COPY streams against a local Postgres.
+
+For every number of --streams, the cleaned synthetic orders are uploaded with upload_to_db, split
+into row partitions copied in parallel into an UNLOGGED staging table, and the cleaned dimension
+tables are uploaded one after the other and then at the same time with upload_tables_to_db.
+Tables are named benchmark_<table> and dropped afterwards, so any database can be used.
+
+Usage:
+    PYTHONPATH=$(pwd) python benchmark/benchmark_uploads.py --sizes 1M --streams 1 2 4 8
+"""
+from argparse import ArgumentParser
+from time import perf_counter
+import warnings
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from benchmark.benchmark_suite import CLEANING_TARGETS, SIZES, time_best
+from benchmark.generators import GENERATORS
+from src.database_utils import DatabaseConnector
+
+# dimension table -> cleaning target
+DIMENSION_TABLES = {
+    "dim_users": "clean_user_data",
+    "dim_card_details": "clean_card_data",
+    "dim_store_details": "clean_store_data",
+    "dim_products": "clean_products_data",
+    "dim_date_times": "clean_date_events"
+}
+ORDERS_TABLE = "benchmark_orders_table"
+
+
+def clean_tables(rows: int, seed: int) -> tuple:
+    """
+    Clean synthetic orders and dimension tables of rows rows.
+
+    Returns:
+        tuple: (cleaned orders, dict of the cleaned dimension tables by benchmark table name)
+    """
+    generator, clean = CLEANING_TARGETS["clean_orders_data"]
+    orders = clean(GENERATORS[generator](rows, seed))
+    dimensions = {}
+    for table_name, target in DIMENSION_TABLES.items():
+        generator, clean = CLEANING_TARGETS[target]
+        dimensions[f"benchmark_{table_name}"] = clean(GENERATORS[generator](rows, seed))
+    return orders, dimensions
+
+
+def benchmark_streams(connector: DatabaseConnector, orders, dimensions: dict, repeat: int) -> dict:
+    """
+    Time the uploads of connector, returning the best of repeat runs of each in seconds.
+    """
+    engine = connector.init_upload_db_engine()
+
+    def upload_dimensions(_):
+        for table_name, df in dimensions.items():
+            connector.upload_to_db(df, table_name, engine)
+
+    return {
+        "orders": time_best(lambda df: connector.upload_to_db(df, ORDERS_TABLE, engine), lambda: orders, repeat),
+        "sequential": time_best(upload_dimensions, lambda: None, repeat),
+        "concurrent": time_best(lambda _: connector.upload_tables_to_db(dimensions, engine), lambda: None, repeat)
+    }
+
+
+def print_results(results: dict, rows: int, dimension_rows: int) -> None:
+    """
+    Print the throughput of every number of streams and its speed-up over a single stream.
+    """
+    print(f"{'streams':>8}{'orders rows/s':>16}{'speed-up':>10}{'dims one by one s':>20}"
+          f"{'dims at once s':>16}{'speed-up':>10}")
+    single = results[min(results)]
+    for streams, result in results.items():
+        print(f"{streams:>8}{rows / result['orders']:>16,.0f}{single['orders'] / result['orders']:>9.2f}x"
+              f"{result['sequential']:>20.2f}{result['concurrent']:>16.2f}"
+              f"{single['sequential'] / result['concurrent']:>9.2f}x")
+    print(f"dimension tables: {dimension_rows:,} rows in all")
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", choices=SIZES, default=["1M"])
+    parser.add_argument("--streams", nargs="+", type=int, default=[1, 2, 4, 8])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--upload-creds", default="./local_db_creds.yaml",
+                        help="YAML credentials of the database the benchmark tables are written to")
+    args = parser.parse_args()
+
+    # the dirty dates of the generators make dateutil warn about unknown time zones
+    warnings.filterwarnings("ignore", module="dateutil")
+    for size in args.sizes:
+        rows = SIZES[size]
+        print(f"...cleaning {rows:,} rows of every table")
+        start = perf_counter()
+        orders, dimensions = clean_tables(rows, args.seed)
+        print(f"...cleaned in {perf_counter() - start:.1f}s")
+        results = {}
+        for streams in sorted(args.streams):
+            with DatabaseConnector(upload_streams=streams) as connector:
+                connector.upload_creds_url = args.upload_creds
+                engine = connector.init_upload_db_engine()
+                try:
+                    with engine.connect():
+                        pass
+                except OperationalError:
+                    raise SystemExit(f"database of {args.upload_creds} unreachable")
+                try:
+                    results[streams] = benchmark_streams(connector, orders, dimensions, args.repeat)
+                finally:
+                    with engine.begin() as connection:
+                        for table_name in [ORDERS_TABLE, *dimensions]:
+                            connection.execute(text(f"DROP TABLE IF EXISTS {table_name}"))
+        print(f"uploads of {rows:,} orders")
+        print_results(results, len(orders), sum(len(df) for df in dimensions.values()))
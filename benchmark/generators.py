@@ -0,0 +1,242 @@
+"""
+Seeded generators of dirty synthetic data shaped like each source of the ETL.
+
+Every generator returns the DataFrame as the matching DataExtractor method would, with
+the defects DataCleaning has to handle: "NULL" strings, rows of random upper case
+letters and digits, "@@" emails, alphanumeric staff numbers, mixed weight units and
+mixed date formats. Values are drawn from pools with numpy, so 10M rows stay practical.
+"""
+import numpy as np
+import pandas as pd
+
+FIRST_NAMES = ["Sigfried", "Guy", "Harry", "Darren", "Garry", "Sophie", "Jürgen", "Ann-Marie", "Mary Ann", "Allen"]
+LAST_NAMES = ["Noack", "Allen", "Lewis", "Hughes", "Stone", "Mayer", "O'Brien", "Smith", "Cunningham", "Hardy"]
+COMPANIES = ["Heydrich Junitz KG", "Warner Ltd", "Taylor and Sons", "Acme plc", "Freeman Group", "Ruppert GmbH"]
+COUNTRIES = {"Germany": "DE", "United Kingdom": "GB", "United States": "US"}
+EMAIL_DOMAINS = ["gmail.com", "outlook.de", "hotmail.co.uk", "yahoo.com", "web.de"]
+CARD_PROVIDERS = ["VISA 16 digit", "VISA 19 digit", "Mastercard", "American Express", "JCB 16 digit", "Maestro"]
+STORE_TYPES = ["Local", "Super Store", "Mall Kiosk", "Outlet"]
+LOCALITIES = ["High Wycombe", "Landshut", "Lancaster", "Chapletown", "Belper", "Heidenheim", "Gainesville"]
+CONTINENTS = ["Europe", "America", "eeEurope", "eeAmerica"]
+CATEGORIES = ["toys-and-games", "sports-and-leisure", "pets", "homeware", "health-and-beauty", "food-and-drink", "diy"]
+WEIGHTS = ["1.6kg", "0.45kg", "125g", "590g", "12 x 100g", "6 x 410g", "16oz", "77g .", "500ml", "1kg"]
+TIME_PERIODS = ["Morning", "Midday", "Evening", "Late_Hours"]
+DATE_FORMATS = ["%Y-%m-%d", "%Y/%m/%d", "%B %Y %d", "%Y %B %d", "%d %B %Y"]
+# share of rows holding "NULL" strings and random upper case tokens
+NULL_SHARE = 0.001
+GARBAGE_SHARE = 0.001
+POOL_SIZE = 50_000
+
+
+def make_pool(rng, size: int, *parts) -> np.ndarray:
+    """
+    Build a pool of strings by concatenating values drawn from each part (a list or an array of strings).
+    """
+    result = np.full(size, "", dtype=object)
+    for part in parts:
+        result = result + rng.choice(np.asarray(part, dtype=object), size=size)
+    return result
+
+
+def make_tokens(rng, size: int, length: int = 10) -> np.ndarray:
+    """
+    Build random upper case alphanumeric tokens such as "FIEOPTNBWZ".
+    """
+    letters = np.array(list("ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"))
+    return np.array(["".join(token) for token in rng.choice(letters, size=(size, length))], dtype=object)
+
+
+def make_dates(rng, size: int, start: str, end: str, formats=DATE_FORMATS) -> np.ndarray:
+    """
+    Draw dates between start and end, written in one of formats each.
+    """
+    days = pd.date_range(start, end, freq="D")
+    pool = np.concatenate([days.strftime(date_format).to_numpy(dtype=object) for date_format in formats])
+    return rng.choice(pool, size=size)
+
+
+def make_digits(rng, size: int, low: int, high: int) -> np.ndarray:
+    """
+    Draw integers in [low, high) as strings.
+    """
+    return rng.integers(low, high, size=size).astype(str).astype(object)
+
+
+def make_uuids(rng, size: int) -> list:
+    """
+    Draw random version 4 like UUID strings.
+    """
+    hexes = rng.bytes(16 * size).hex()
+    return [
+        f"{hexes[i:i + 8]}-{hexes[i + 8:i + 12]}-{hexes[i + 12:i + 16]}-{hexes[i + 16:i + 20]}-{hexes[i + 20:i + 32]}"
+        for i in range(0, 32 * size, 32)
+    ]
+
+
+def add_defects(df: pd.DataFrame, rng, skip: tuple = ()) -> pd.DataFrame:
+    """
+    Replace NULL_SHARE of the rows with "NULL" strings and GARBAGE_SHARE with random tokens.
+
+    Columns listed in skip (e.g. the source index) are left as they are.
+    """
+    columns = [column for column in df.columns if column not in skip]
+    rows = len(df)
+    null_rows = rng.random(rows) < NULL_SHARE
+    df.loc[null_rows, columns] = "NULL"
+    garbage_rows = np.flatnonzero(rng.random(rows) < GARBAGE_SHARE)
+    if len(garbage_rows):
+        tokens = make_tokens(rng, len(garbage_rows))
+        for column in columns:
+            df[column] = df[column].astype(object)
+            df.loc[df.index[garbage_rows], column] = tokens
+    return df
+
+
+def make_users(rows: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Generate 'legacy_users' rows as returned by DataExtractor.read_rds_table.
+    """
+    rng = np.random.default_rng(seed)
+    pool = min(rows, POOL_SIZE)
+    country = rng.choice(list(COUNTRIES), size=rows)
+    country_code = pd.Series(country).map(COUNTRIES).to_numpy(dtype=object)
+    country_code[(country_code == "GB") & (rng.random(rows) < 0.1)] = "GGB"
+    emails = make_pool(rng, pool, FIRST_NAMES, make_digits(rng, pool, 1, 999), ["@"] * 19 + ["@@"], EMAIL_DOMAINS)
+    phones = make_pool(rng, pool, ["+44(0)", "+49", "001-", "0"], make_digits(rng, pool, 1_000_000, 99_999_999),
+                       ["", "", "", "x123", "x4567"])
+    df = pd.DataFrame({
+        "index": np.arange(rows),
+        "first_name": rng.choice(FIRST_NAMES, size=rows).astype(object),
+        "last_name": rng.choice(LAST_NAMES, size=rows).astype(object),
+        "date_of_birth": make_dates(rng, rows, "1940-01-01", "2006-12-31"),
+        "company": rng.choice(COMPANIES, size=rows).astype(object),
+        "email_address": rng.choice(emails, size=rows),
+        "address": make_pool(rng, rows, make_digits(rng, pool, 1, 300), [" "], LOCALITIES, [" Road", " Street"]),
+        "country": country.astype(object),
+        "country_code": country_code,
+        "phone_number": rng.choice(phones, size=rows),
+        "join_date": make_dates(rng, rows, "1992-01-01", "2022-12-31"),
+        "user_uuid": make_uuids(rng, rows)
+    })
+    return add_defects(df, rng, skip=("index",))
+
+
+def make_cards(rows: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Generate card details rows as returned by DataExtractor.retrieve_pdf_data.
+    """
+    rng = np.random.default_rng(seed)
+    card_number = make_digits(rng, rows, 10**11, 10**16)
+    question_marks = rng.random(rows) < 0.01
+    card_number[question_marks] = "???" + card_number[question_marks]
+    months = rng.integers(1, 13, size=rows).astype(str)
+    df = pd.DataFrame({
+        "card_number": card_number,
+        "expiry_date": np.char.add(np.char.add(np.char.zfill(months, 2), "/"), rng.integers(22, 32, rows).astype(str)),
+        "card_provider": rng.choice(CARD_PROVIDERS, size=rows).astype(object),
+        "date_payment_confirmed": make_dates(rng, rows, "1992-01-01", "2022-12-31")
+    })
+    df["expiry_date"] = df["expiry_date"].astype(object)
+    return add_defects(df, rng)
+
+
+def make_stores(rows: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Generate store details rows as returned by DataExtractor.retrieve_store_data.
+    """
+    rng = np.random.default_rng(seed)
+    pool = min(rows, POOL_SIZE)
+    staff_numbers = make_pool(rng, pool, ["", "", "", "J", "e"], make_digits(rng, pool, 1, 200), ["", "", "", "R"])
+    df = pd.DataFrame({
+        "index": np.arange(rows),
+        "address": make_pool(rng, rows, make_digits(rng, pool, 1, 300), [" "], LOCALITIES, [" Road", " Street"]),
+        "longitude": rng.uniform(-120, 15, rows).round(5).astype(str).astype(object),
+        "lat": None,
+        "locality": rng.choice(LOCALITIES, size=rows).astype(object),
+        "store_code": make_pool(rng, rows, ["HI-", "LA-", "GA-", "BE-"], make_digits(rng, pool, 10**7, 10**8)),
+        "staff_numbers": rng.choice(staff_numbers, size=rows),
+        "opening_date": make_dates(rng, rows, "1992-01-01", "2022-12-31"),
+        "store_type": rng.choice(STORE_TYPES, size=rows).astype(object),
+        "latitude": rng.uniform(25, 60, rows).round(5).astype(str).astype(object),
+        "country_code": rng.choice(list(COUNTRIES.values()), size=rows).astype(object),
+        "continent": rng.choice(CONTINENTS, size=rows).astype(object)
+    })
+    return add_defects(df, rng, skip=("index", "lat"))
+
+
+def make_products(rows: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Generate product rows as returned by DataExtractor.extract_from_s3.
+    """
+    rng = np.random.default_rng(seed)
+    pool = min(rows, POOL_SIZE)
+    weights = rng.choice(WEIGHTS, size=rows).astype(object)
+    weights[rng.random(rows) < 0.001] = np.nan
+    df = pd.DataFrame({
+        "product_name": make_pool(rng, rows, ["FURGLE ", "Oak ", "Eco "], CATEGORIES, [" set", " kit", " pack"]),
+        "product_price": np.char.add("£", rng.uniform(0.5, 500, rows).round(2).astype(str)).astype(object),
+        "weight": weights,
+        "category": rng.choice(CATEGORIES, size=rows).astype(object),
+        "EAN": make_digits(rng, rows, 10**12, 10**13),
+        "date_added": make_dates(rng, rows, "2005-01-01", "2022-12-31"),
+        "uuid": make_uuids(rng, rows),
+        "removed": rng.choice(["Still_avaliable", "Removed"], size=rows, p=[0.9, 0.1]).astype(object),
+        "product_code": make_pool(rng, rows, ["a", "b", "c", "r"], make_digits(rng, pool, 1, 10), ["-"],
+                                  make_digits(rng, pool, 10**6, 10**7), ["a", "g", "m", "x"])
+    })
+    return add_defects(df, rng)
+
+
+def make_orders(rows: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Generate 'orders_table' rows as returned by DataExtractor.read_rds_table.
+    """
+    rng = np.random.default_rng(seed)
+    pool = min(rows, POOL_SIZE)
+    return pd.DataFrame({
+        "level_0": np.arange(rows),
+        "index": np.arange(rows),
+        "date_uuid": make_uuids(rng, rows),
+        "first_name": None,
+        "last_name": None,
+        "user_uuid": rng.choice(np.array(make_uuids(rng, pool), dtype=object), size=rows),
+        "card_number": rng.choice(make_digits(rng, pool, 10**11, 10**16), size=rows),
+        "store_code": rng.choice(make_pool(rng, pool, ["HI-", "LA-", "WEB-"], make_digits(rng, pool, 10**7, 10**8)),
+                                 size=rows),
+        "product_code": rng.choice(make_pool(rng, pool, ["a", "b", "r"], make_digits(rng, pool, 1, 10), ["-"],
+                                             make_digits(rng, pool, 10**6, 10**7), ["g", "m"]), size=rows),
+        "1": np.nan,
+        "product_quantity": rng.integers(1, 14, size=rows)
+    })
+
+
+def make_date_events(rows: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Generate date events rows as returned by DataExtractor.extract_date_events_data.
+    """
+    rng = np.random.default_rng(seed)
+    seconds = rng.integers(0, 24 * 3600, size=rows)
+    timestamp = pd.to_timedelta(np.unique(seconds), unit="s")
+    times = pd.Series(
+        [f"{t.components.hours:02d}:{t.components.minutes:02d}:{t.components.seconds:02d}" for t in timestamp],
+        index=np.unique(seconds)
+    )
+    df = pd.DataFrame({
+        "timestamp": times.loc[seconds].to_numpy(dtype=object),
+        "month": make_digits(rng, rows, 1, 13),
+        "year": make_digits(rng, rows, 1992, 2023),
+        "day": make_digits(rng, rows, 1, 29),
+        "time_period": rng.choice(TIME_PERIODS, size=rows).astype(object),
+        "date_uuid": make_uuids(rng, rows)
+    })
+    return add_defects(df, rng)
+
+
+GENERATORS = {
+    "users": make_users,
+    "cards": make_cards,
+    "stores": make_stores,
+    "products": make_products,
+    "orders": make_orders,
+    "date_events": make_date_events
+}
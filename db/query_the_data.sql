@@ -1,6 +1,8 @@
 \c sales_data
 
 -- Querying the data
+-- tasks 3, 5, 6 and 8 read the pre-joined fact_sales view built by create_db_schema.sql
+-- src/analytics.py answers the same questions from the cleaned DataFrames
 
 
 -- task 1
@@ -18,28 +20,17 @@ ORDER BY total_no_stores DESC
 SELECT locality, COUNT(store_code) AS total_no_stores
 FROM dim_store_details
 GROUP BY locality
-ORDER BY total_no_stores DESC
+ORDER BY total_no_stores DESC, locality
 LIMIT 10
 ;
 
 
 -- task 3
 \echo '\n*** which months produced the largest amount of sales ?'
-
-WITH sales_table AS (
-SELECT
-	orders_table.product_quantity,
-	dim_date_times.month,
-	dim_products.product_price,
-	(dim_products.product_price * orders_table.product_quantity) AS total_payment
-FROM orders_table
-INNER JOIN dim_date_times ON dim_date_times.date_uuid = orders_table.date_uuid
-INNER JOIN dim_products ON dim_products.product_code = orders_table.product_code
-)
 SELECT
 	ROUND(SUM(total_payment)::decimal, 2) AS total_sales,
 	"month"
-FROM sales_table
+FROM fact_sales
 GROUP BY "month"
 ORDER BY
 	total_sales DESC
@@ -71,24 +62,11 @@ ORDER BY numbers_of_sales
 
 -- task 5
 \echo '\n*** what percentage of sales come through each type of stores ?'
-WITH sales_by_location AS (
-SELECT 
-	orders_table.product_quantity,
-	dim_store_details.store_type,
-	dim_products.product_price,
-	(orders_table.product_quantity * dim_products.product_price) AS total_payment
-FROM 
-	orders_table
-JOIN dim_store_details
-	ON dim_store_details.store_code = orders_table.store_code
-JOIN dim_products
-	ON dim_products.product_code = orders_table.product_code
-)
 SELECT
 	store_type,
 	ROUND(SUM(total_payment)::decimal, 2) As total_sales,
-	((ROUND(SUM(total_payment)) / (SELECT SUM(total_payment) FROM sales_by_location))* 100 )AS "percentage_total_(%)"
-FROM sales_by_location
+	((ROUND(SUM(total_payment)) / (SELECT SUM(total_payment) FROM fact_sales))* 100 )AS "percentage_total_(%)"
+FROM fact_sales
 GROUP BY store_type
 ORDER BY total_sales DESC
 ;
@@ -96,26 +74,12 @@ ORDER BY total_sales DESC
 
 -- task 6
 \echo '\n*** which month in each year produced the highest cost of sales ?'
-WITH sales_table AS (
-SELECT
-	orders_table.product_quantity,
-	dim_date_times.month,
-	dim_date_times.year,
-	dim_products.product_price,
-	(dim_products.product_price * orders_table.product_quantity) AS total_payment
-FROM
-	orders_table
-INNER JOIN dim_date_times
-	ON dim_date_times.date_uuid = orders_table.date_uuid
-INNER JOIN dim_products
-	ON dim_products.product_code = orders_table.product_code
-)
 SELECT
 	ROUND(SUM(total_payment)::decimal, 2) AS total_sales,
 	"year",
 	"month"
 FROM
-	sales_table
+	fact_sales
 GROUP BY
 	"year",
 	"month"
@@ -140,29 +104,17 @@ ORDER BY
 
 -- task 8
 \echo '\n*** which German store type is selling the most ?'
-WITH sales_by_location AS (
-SELECT 
-	orders_table.product_quantity,
-	dim_store_details.store_type,
-	dim_store_details.country_code,
-	dim_products.product_price,
-	(orders_table.product_quantity * dim_products.product_price) AS total_payment
-FROM 
-	orders_table
-JOIN dim_store_details
-	ON dim_store_details.store_code = orders_table.store_code
-JOIN dim_products
-	ON dim_products.product_code = orders_table.product_code
-WHERE
-	dim_store_details.country_code = 'DE'
-)
 SELECT
 	ROUND(SUM(total_payment)::decimal, 2) AS total_sales,
 	store_type,
-	(SELECT DISTINCT country_code FROM sales_by_location) AS country_code
+	country_code
 FROM
-	sales_by_location
-GROUP BY store_type
+	fact_sales
+WHERE
+	country_code = 'DE'
+GROUP BY
+	store_type,
+	country_code
 ORDER BY
 	total_sales
 ;
@@ -170,3 +122,24 @@ ORDER BY
 
 -- task 9
 \echo '\n*** how quickly the company making sales ?'
+WITH sale_times AS (
+SELECT
+	"year",
+	("year" || '-' || "month" || '-' || "day" || ' ' || "timestamp")::timestamp AS sale_time
+FROM dim_date_times
+),
+time_to_next_sale AS (
+SELECT
+	"year",
+	LEAD(sale_time) OVER (PARTITION BY "year" ORDER BY sale_time) - sale_time AS time_taken
+FROM sale_times
+)
+SELECT
+	"year",
+	AVG(time_taken) AS actual_time_taken
+FROM time_to_next_sale
+WHERE time_taken IS NOT NULL
+GROUP BY "year"
+ORDER BY actual_time_taken DESC
+LIMIT 5
+;
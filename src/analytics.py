@@ -0,0 +1,303 @@
+from argparse import ArgumentParser
+import os
+import pandas as pd
+from pandas import DataFrame
+
+
+class SalesAnalytics():
+    """
+    SalesAnalytics class answering the business questions of db/query_the_data.sql in memory.
+
+    Works on the cleaned star schema tables (the DataFrames returned by DataCleaning, or Parquet
+    snapshots of them) instead of the loaded database. Orders are joined with the dimension tables
+    through categorical codes of their keys, and grouped on the categorical columns of the cleaned
+    tables, so joins and groupbys run on integer codes. Every method returns the columns, row order
+    and rounding of its SQL task.
+
+    Attributes:
+        TABLES (tuple): Names of the star schema tables.
+        QUESTIONS (dict): Business question answered by each task method.
+        tables (dict): Cleaned DataFrames by table name.
+
+    Methods:
+        read_parquet(directory: str) -> None
+        write_parquet(directory: str) -> None
+        fact_sales() -> DataFrame
+        store_counts_by_country() -> DataFrame
+        top_localities(limit: int) -> DataFrame
+        sales_by_month() -> DataFrame
+        sales_by_location() -> DataFrame
+        sales_by_store_type() -> DataFrame
+        best_months(limit: int) -> DataFrame
+        staff_headcount() -> DataFrame
+        german_store_type_sales() -> DataFrame
+        sales_velocity(limit: int) -> DataFrame
+        report() -> dict
+    """
+    TABLES = ("orders_table", "dim_users", "dim_card_details", "dim_store_details", "dim_products", "dim_date_times")
+    QUESTIONS = {
+        "store_counts_by_country": "how many stores does the buisness have and in which country ?",
+        "top_localities": "which locations currently have the most number of stores ?",
+        "sales_by_month": "which months produced the largest amount of sales ?",
+        "sales_by_location": "how many sales are coming from online ?",
+        "sales_by_store_type": "what percentage of sales come through each type of stores ?",
+        "best_months": "which month in each year produced the highest cost of sales ?",
+        "staff_headcount": "what is our staff headcount ?",
+        "german_store_type_sales": "which German store type is selling the most ?",
+        "sales_velocity": "how quickly the company making sales ?"
+    }
+
+    def __init__(self, tables: dict = None) -> None:
+        self.tables = dict(tables or {})
+        self.__fact_sales = None
+
+    def read_parquet(self, directory: str) -> None:
+        """
+        Read the <table name>.parquet files of directory into tables.
+
+        Args:
+            directory (str): Directory written by 'write_parquet'.
+
+        Returns:
+            None
+        """
+        for table_name in self.TABLES:
+            path = os.path.join(directory, f"{table_name}.parquet")
+            if os.path.exists(path):
+                self.tables[table_name] = pd.read_parquet(path)
+        self.__fact_sales = None
+
+    def write_parquet(self, directory: str) -> None:
+        """
+        Write every table to directory as <table name>.parquet, keeping the compact dtypes.
+
+        Args:
+            directory (str): Output directory, created if missing.
+
+        Returns:
+            None
+        """
+        os.makedirs(directory, exist_ok=True)
+        for table_name, df in self.tables.items():
+            df.to_parquet(os.path.join(directory, f"{table_name}.parquet"), index=False)
+
+    def fact_sales(self) -> DataFrame:
+        """
+        Join orders with products, date times and stores, as the fact_sales view does.
+
+        Returns:
+            DataFrame: One row per order with its product_price, total_payment, year, month,
+            store_type and country_code.
+        """
+        if self.__fact_sales is None:
+            orders = self.tables["orders_table"][
+                ["date_uuid", "user_uuid", "card_number", "store_code", "product_code", "product_quantity"]
+            ]
+            df = self.__join(orders, "dim_products", "product_code", ["product_price"])
+            df = self.__join(df, "dim_date_times", "date_uuid", ["year", "month"])
+            df = self.__join(df, "dim_store_details", "store_code", ["store_type", "country_code"])
+            df["total_payment"] = df["product_price"] * df["product_quantity"].astype("float64")
+            self.__fact_sales = df
+        return self.__fact_sales
+
+    def store_counts_by_country(self) -> DataFrame:
+        """
+        Task 1: number of stores per country.
+
+        Returns:
+            DataFrame: country, total_no_stores
+        """
+        df = self.tables["dim_store_details"]
+        result = self.__group(df, "country_code")["store_code"].count().rename("total_no_stores")
+        result = result.reset_index().rename(columns={"country_code": "country"})
+        return self.__sort(result, "total_no_stores", ascending=False)
+
+    def top_localities(self, limit: int = 10) -> DataFrame:
+        """
+        Task 2: localities with the most stores.
+
+        Args:
+            limit (int): Number of localities returned.
+
+        Returns:
+            DataFrame: locality, total_no_stores
+        """
+        df = self.tables["dim_store_details"]
+        result = self.__group(df, "locality")["store_code"].count().rename("total_no_stores").reset_index()
+        result = result.sort_values(["total_no_stores", "locality"], ascending=[False, True], kind="stable")
+        return result.head(limit).reset_index(drop=True)
+
+    def sales_by_month(self) -> DataFrame:
+        """
+        Task 3: total sales per month.
+
+        Returns:
+            DataFrame: total_sales, month
+        """
+        result = self.__total_sales(self.fact_sales(), ["month"])
+        return self.__sort(result, "total_sales", ascending=False)
+
+    def sales_by_location(self) -> DataFrame:
+        """
+        Task 4: number of sales and products sold online ('Web Portal' stores) and offline.
+
+        Returns:
+            DataFrame: numbers_of_sales, product_quantity_count, location
+        """
+        df = self.__join(self.tables["orders_table"][["date_uuid", "store_code", "product_quantity"]],
+                         "dim_store_details", "store_code", ["store_type"])
+        location = (df["store_type"] == "Web Portal").map({True: "Web", False: "Offline"})
+        df = df.assign(location=location, product_quantity=df["product_quantity"].astype("Int64"))
+        grouped = self.__group(df, "location")
+        result = pd.concat([
+            grouped["date_uuid"].count().rename("numbers_of_sales"),
+            grouped["product_quantity"].sum(min_count=1).rename("product_quantity_count")
+        ], axis=1).reset_index()
+        return self.__sort(result[["numbers_of_sales", "product_quantity_count", "location"]], "numbers_of_sales")
+
+    def sales_by_store_type(self) -> DataFrame:
+        """
+        Task 5: total sales per store type and their share of all sales.
+
+        The share is computed from the group total rounded to an integer, as in the SQL task.
+
+        Returns:
+            DataFrame: store_type, total_sales, percentage_total_(%)
+        """
+        df = self.fact_sales()
+        totals = self.__group(df, "store_type")["total_payment"].sum(min_count=1)
+        result = DataFrame({
+            "total_sales": totals.round(2),
+            "percentage_total_(%)": totals.round() / df["total_payment"].sum() * 100
+        }).reset_index()
+        return self.__sort(result, "total_sales", ascending=False)
+
+    def best_months(self, limit: int = 10) -> DataFrame:
+        """
+        Task 6: months with the highest total sales across all years.
+
+        Args:
+            limit (int): Number of months returned.
+
+        Returns:
+            DataFrame: total_sales, year, month
+        """
+        result = self.__total_sales(self.fact_sales(), ["year", "month"])
+        return self.__sort(result, "total_sales", ascending=False).head(limit)
+
+    def staff_headcount(self) -> DataFrame:
+        """
+        Task 7: total staff numbers per country.
+
+        Returns:
+            DataFrame: total_staff_numbers, country_code
+        """
+        df = self.tables["dim_store_details"]
+        df = df.assign(staff_numbers=df["staff_numbers"].astype("Int64"))
+        result = self.__group(df, "country_code")["staff_numbers"].sum(min_count=1)
+        result = result.rename("total_staff_numbers").reset_index()[["total_staff_numbers", "country_code"]]
+        return self.__sort(result, "total_staff_numbers", ascending=False)
+
+    def german_store_type_sales(self) -> DataFrame:
+        """
+        Task 8: total sales per store type in Germany.
+
+        Returns:
+            DataFrame: total_sales, store_type, country_code
+        """
+        df = self.fact_sales()
+        result = self.__total_sales(df[df["country_code"] == "DE"], ["store_type", "country_code"])
+        return self.__sort(result, "total_sales")
+
+    def sales_velocity(self, limit: int = 5) -> DataFrame:
+        """
+        Task 9: average time between two consecutive sales of each year, slowest years first.
+
+        Sale times are built from the year, month, day and timestamp of dim_date_times; years with
+        a single sale have no time between sales and are left out.
+
+        Args:
+            limit (int): Number of years returned.
+
+        Returns:
+            DataFrame: year, actual_time_taken (Timedelta)
+        """
+        df = self.tables["dim_date_times"]
+        sale_time = pd.to_datetime(
+            df["year"].astype("string[pyarrow]") + "-" + df["month"].astype("string[pyarrow]") + "-"
+            + df["day"].astype("string[pyarrow]") + " " + df["timestamp"].astype("string[pyarrow]"),
+            format="ISO8601", errors="coerce"
+        )
+        sales = DataFrame({"year": df["year"], "sale_time": sale_time}).dropna().sort_values("sale_time")
+        time_taken = self.__group(sales, "year")["sale_time"].shift(-1) - sales["sale_time"]
+        result = self.__group(sales.assign(time_taken=time_taken), "year")["time_taken"].mean().dropna()
+        result = result.rename("actual_time_taken").reset_index()
+        result["year"] = result["year"].astype(str)
+        return self.__sort(result, "actual_time_taken", ascending=False).head(limit)
+
+    def report(self) -> dict:
+        """
+        Answer every business question.
+
+        Returns:
+            dict: Result DataFrame by question.
+        """
+        return {question: getattr(self, method)() for method, question in self.QUESTIONS.items()}
+
+    def __join(self, left: DataFrame, table_name: str, key: str, columns: list) -> DataFrame:
+        """
+        Inner join left with the columns of a dimension table on its primary key.
+
+        Keys of left are encoded as codes of a categorical whose categories are the keys of the
+        table, so each code is the position of the matching row (-1, dropped, when there is none,
+        as for NULL keys in SQL). This needs unique keys: a table with duplicate keys, which the
+        loaded primary key would reject, raises a ValueError.
+        """
+        right = self.tables[table_name][[key] + columns].dropna(subset=[key])
+        duplicated = right[key].duplicated()
+        if duplicated.any():
+            examples = right[key][duplicated].unique()[:3].tolist()
+            raise ValueError(f"{table_name} has duplicate {key} values, e.g. {examples}")
+        codes = pd.Categorical(left[key], categories=right[key]).codes
+        matched = codes >= 0
+        return pd.concat([
+            left[matched].reset_index(drop=True),
+            right.drop(columns=key).iloc[codes[matched]].reset_index(drop=True)
+        ], axis=1)
+
+    def __group(self, df: DataFrame, by):
+        """
+        Group df like SQL GROUP BY: NULL is a group of its own and unused categories are not.
+        """
+        return df.groupby(by, observed=True, dropna=False, sort=False)
+
+    def __total_sales(self, df: DataFrame, by: list) -> DataFrame:
+        """
+        Sum total_payment per group of by, rounded to 2 decimals.
+
+        Returns:
+            DataFrame: total_sales, *by
+        """
+        totals = self.__group(df, by)["total_payment"].sum(min_count=1).round(2)
+        return totals.rename("total_sales").reset_index()[["total_sales"] + by]
+
+    def __sort(self, df: DataFrame, column: str, ascending: bool = True) -> DataFrame:
+        """
+        Sort df on column with NULLs where PostgreSQL puts them (first when descending).
+        """
+        na_position = "last" if ascending else "first"
+        return df.sort_values(column, ascending=ascending, na_position=na_position, kind="stable").reset_index(
+            drop=True
+        )
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Answer the business questions from Parquet snapshots of the cleaned tables")
+    parser.add_argument("directory", help="directory of <table name>.parquet files")
+    args = parser.parse_args()
+
+    analytics = SalesAnalytics()
+    analytics.read_parquet(args.directory)
+    for question, result in analytics.report().items():
+        print(f"\n*** {question}")
+        print(result.to_string(index=False))
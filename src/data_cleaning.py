@@ -1,8 +1,10 @@
 from dateutil.parser import parse, ParserError
 from datetime import datetime as dt
-from pandas import DataFrame
+from pandas import DataFrame, Series
+from pandas.api.types import union_categoricals
 import numpy as np
 import pandas as pd
+import copy
 
 
 class DataCleaning():
@@ -11,6 +13,22 @@ class DataCleaning():
 
     Attributes:
     - COUNTRY_CODE_MAP (dict): A mapping of country names to their corresponding country codes.
+    - DATE_FORMATS (tuple): Date layouts (regex, strftime format) converted in bulk by 'fix_date_formats'.
+    - WEIGHT_PATTERN (str): Regex extracting multiplier, magnitude and unit from a product weight.
+    - WEIGHT_UNIT_DIVISORS (dict): A mapping of weight units to the divisor converting them to kilograms.
+    - WEIGHT_CLASSES (dict): Weight classes of products by their lower bound in kilograms.
+    - AVAILABILITY_MAP (dict): A mapping of the 'removed' values to product availability.
+    - LUHN_DOUBLED_DIGITS (tuple): Luhn value of every digit at a doubled position (2 * digit, minus 9 above 9).
+    - MIN_PARTITION_ROWS (int): Fewest rows of a partition cleaned by the execution backend.
+    - COMPACT_DTYPES (dict): Per dataset, the dtype of each cleaned column converted by 'compact_dtypes'.
+    - CLEANING_RULES (dict): Per dataset, the declarative cleaning rules applied by 'apply_rules'.
+    - unmatched_weights (DataFrame): Weights that 'convert_product_weights' could not convert on its last call.
+    - memory_report (dict): Per dataset, the bytes of the cleaned DataFrames before and after 'compact_dtypes'.
+    - report_memory (bool): Whether the clean_* methods fill 'memory_report'. Off by default, as the deep
+      memory scans of the text columns can take longer than the cleaning itself.
+    - lean (bool): Whether 'apply_rules' cleans column by column to bound its peak memory (see 'apply_rules').
+    - backend: Execution backend (see src/execution.py) cleaning the partitions of a DataFrame, None for none.
+    - partitions (int): Number of row partitions cleaned by the backend.
 
     Methods:
     - clean_user_data(users_df: DataFrame) -> DataFrame
@@ -19,23 +37,187 @@ class DataCleaning():
     - clean_products_data(products_df: DataFrame) -> DataFrame
     - clean_orders_data(orders_df: pd.DataFrame) -> pd.DataFrame
     - clean_date_events(date_events_df: pd.DataFrame) -> pd.DataFrame
+    - apply_rules(df: DataFrame, dataset: str) -> DataFrame
+    - compact_dtypes(df: DataFrame, dataset: str) -> DataFrame
     - replace_null_with_nan(df: DataFrame) -> DataFrame
     - fix_date_format(date: str) -> dt
+    - fix_date_formats(dates: Series) -> Series
     - assign_valid_country_code(country: str) -> str
+    - assign_valid_country_codes(countries: Series) -> Series
     - clean_card_number(card_number: str) -> str
+    - clean_card_numbers(card_numbers: Series) -> Series
+    - is_valid_card_number(card_number: str) -> bool
+    - is_valid_card_numbers(card_numbers: Series) -> Series
     - remove_alpha_letters_from_staff_number(staff_number: str) -> str
+    - remove_alpha_letters_from_staff_numbers(staff_numbers: Series) -> Series
     - convert_product_weights(products_df: DataFrame) -> DataFrame
+    - convert_weights_to_kg(weights: Series) -> Series
+    - assign_weight_classes(weights: Series) -> Series
+    - parse_prices(prices: Series) -> Series
     - convert_to_kg(value: str) -> str
     - is_invalid_data_point(value: str) -> bool
+    - is_invalid_data_points(values: Series) -> Series
     """
     COUNTRY_CODE_MAP = {
         "United Kingdom": "GB",
         "United States": "US",
         "Germany": "DE"
     }
+    DATE_FORMATS = (
+        (r"\d{4}([-/])\d{1,2}\1\d{1,2}", "%Y-%m-%d"),
+        (r"[A-Z][a-z]+ \d{4} \d{1,2}", "%B %Y %d"),
+        (r"\d{4} [A-Z][a-z]+ \d{1,2}", "%Y %B %d"),
+        (r"\d{1,2} [A-Z][a-z]+ \d{4}", "%d %B %Y")
+    )
+
+    WEIGHT_PATTERN = (
+        r"^\s*(?:(?P<multiplier>\d+)\s*x\s*)?"
+        r"(?P<magnitude>\d+(?:\.\d*)?|\.\d+)\s*(?P<unit>kg|g|ml|oz)[\s.]*$"
+    )
+    WEIGHT_UNIT_DIVISORS = {
+        "kg": 1,
+        "g": 1000,
+        "ml": 1000,
+        "oz": 35.274
+    }
+    WEIGHT_CLASSES = {
+        "Light": 0,
+        "Mid_Sized": 2,
+        "Heavy": 40,
+        "Truck_Required": 140
+    }
+    AVAILABILITY_MAP = {
+        "Still_avaliable": True,
+        "Removed": False
+    }
+    LUHN_DOUBLED_DIGITS = (0, 2, 4, 6, 8, 1, 3, 5, 7, 9)
+    MIN_PARTITION_ROWS = 10_000
+    # low-cardinality text -> category, SMALLINT columns -> Int16, numbers -> float64,
+    # "%Y-%m-%d" dates -> datetime64, UUIDs and other high-cardinality text -> Arrow backed strings
+    COMPACT_DTYPES = {
+        "users": {
+            "date_of_birth": "datetime64[ns]",
+            "country": "category",
+            "country_code": "category",
+            "join_date": "datetime64[ns]",
+            "user_uuid": "string[pyarrow]"
+        },
+        "cards": {
+            "card_number": "string[pyarrow]",
+            "expiry_date": "category",
+            "card_provider": "category",
+            "date_payment_confirmed": "datetime64[ns]",
+            "card_number_valid": "boolean"
+        },
+        "stores": {
+            "longitude": "float64",
+            "locality": "category",
+            "staff_numbers": "Int16",
+            "opening_date": "datetime64[ns]",
+            "store_type": "category",
+            "latitude": "float64",
+            "country_code": "category",
+            "continent": "category"
+        },
+        "products": {
+            "weight_class": "category",
+            "category": "category",
+            "date_added": "datetime64[ns]",
+            "uuid": "string[pyarrow]",
+            "still_avaliable": "boolean"
+        },
+        "orders": {
+            "date_uuid": "string[pyarrow]",
+            "user_uuid": "string[pyarrow]",
+            "card_number": "string[pyarrow]",
+            "store_code": "category",
+            "product_code": "category",
+            "product_quantity": "Int16"
+        },
+        "date_events": {
+            "month": "category",
+            "year": "category",
+            "day": "category",
+            "time_period": "category",
+            "date_uuid": "string[pyarrow]"
+        }
+    }
+
+    # Per dataset, the rules 'apply_rules' runs in a single pass over the columns:
+    # - drop_columns: input columns left out of the result (still usable as a source)
+    # - null_tokens: values read as missing in every column
+    # - transforms: column -> steps applied in order; a step is the name of a DataCleaning
+    #   method taking and returning a Series, ("replace", old, new) for a literal substring
+    #   or ("map", mapping)
+    # - derived: column -> (source column, steps), replacing the column or inserted after its source
+    # - invalid_rows: column -> "isna" or the name of a DataCleaning method returning a boolean
+    #   mask; rows matching any of them are dropped, as are rows left without any value
+    # - keep_rows: keep every row and the index (no row is dropped)
+    CLEANING_RULES = {
+        "users": {
+            "drop_columns": ("index",),
+            "null_tokens": ("NULL",),
+            "transforms": {
+                "date_of_birth": ("fix_date_formats",),
+                "join_date": ("fix_date_formats",),
+                "email_address": (("replace", "@@", "@"),),
+                "phone_number": (("replace", "x", ""),)
+            },
+            "derived": {
+                "country_code": ("country", ("assign_valid_country_codes",))
+            },
+            "invalid_rows": {"first_name": "is_invalid_data_points"}
+        },
+        "cards": {
+            "null_tokens": ("NULL",),
+            "transforms": {
+                "card_number": ("clean_card_numbers",),
+                "date_payment_confirmed": ("fix_date_formats",)
+            },
+            "derived": {
+                "card_number_valid": ("card_number", ("is_valid_card_numbers",))
+            },
+            "invalid_rows": {"card_number": "isna"}
+        },
+        "stores": {
+            "drop_columns": ("index", "lat"),
+            "transforms": {
+                "staff_numbers": ("remove_alpha_letters_from_staff_numbers",),
+                "opening_date": ("fix_date_formats",),
+                "continent": (("replace", "ee", ""),)
+            },
+            "invalid_rows": {"store_type": "is_invalid_data_points"}
+        },
+        "products": {
+            "drop_columns": ("weight", "removed"),
+            "transforms": {
+                "product_price": ("parse_prices",),
+                "date_added": ("fix_date_formats",)
+            },
+            "derived": {
+                "weight_kg": ("weight", ("convert_weights_to_kg",)),
+                "weight_class": ("weight_kg", ("assign_weight_classes",)),
+                "still_avaliable": ("removed", (("map", AVAILABILITY_MAP),))
+            },
+            "invalid_rows": {"weight_kg": "isna"}
+        },
+        "orders": {
+            "drop_columns": ("first_name", "last_name", "1", "level_0", "index"),
+            "keep_rows": True
+        },
+        "date_events": {
+            "null_tokens": ("NULL",),
+            "invalid_rows": {"time_period": "is_invalid_data_points"}
+        }
+    }
 
-    def __init__(self) -> None:
-        pass
+    def __init__(self, lean: bool = False, backend=None, partitions: int = 1, report_memory: bool = False) -> None:
+        self.unmatched_weights = DataFrame(columns=["weight"])
+        self.memory_report = {}
+        self.report_memory = report_memory
+        self.lean = lean
+        self.backend = backend
+        self.partitions = partitions
 
     def clean_user_data(self, users_df: DataFrame) -> DataFrame:
         """
@@ -47,43 +229,21 @@ class DataCleaning():
         Returns:
         - DataFrame: Cleaned user data.
 
-        This method performs the following steps:
+        This method applies the CLEANING_RULES["users"] rules with the 'apply_rules' method:
         1. Drops the 'index' column from the DataFrame.
         2. Replaces NULL values with NaN.
-        3. Masks invalid user data points in the 'first_name' column using the 'is_invalid_data_point' method.
-        4. Replaces invalid data points with NaN.
-        5. Cleans the date format in the 'date_of_birth' and 'join_date' columns using the 'fix_date_format' method.
-        6. Cleans the 'email_address' column by replacing double '@@' with a single '@'.
-        7. Assigns valid country codes to the 'country_code' column using the 'assign_valid_country_code' method.
-        8. Cleans the 'phone_number' column by removing 'x'.
-        9. Drops rows where all values are NaN.
-        10. Resets the index of the DataFrame.
+        3. Cleans the date format in the 'date_of_birth' and 'join_date' columns using the 'fix_date_formats' method.
+        4. Cleans the 'email_address' column by replacing double '@@' with a single '@'.
+        5. Cleans the 'phone_number' column by removing 'x'.
+        6. Assigns valid country codes to the 'country_code' column using the 'assign_valid_country_codes' method.
+        7. Drops the rows with invalid data points in the 'first_name' column using the 'is_invalid_data_points'
+           method, and the rows where all values are NaN.
+        8. Resets the index of the DataFrame.
+        9. Converts the columns to compact dtypes using the 'compact_dtypes' method.
 
         Note: The original DataFrame is not modified; a cleaned copy is returned.
         """
-        df = users_df.drop(columns="index")
-        df = self.replace_null_with_nan(df)
-
-        invalid_name_mask = df["first_name"].apply(self.is_invalid_data_point)
-        df.mask(invalid_name_mask, inplace=True)
-
-        column = "date_of_birth"
-        df[column] = df[column].apply(self.fix_date_format)
-        column = "join_date"
-        df[column] = df[column].apply(self.fix_date_format)
-
-        column = "email_address"
-        df[column] = df[column].str.replace("@@", "@")
-
-        column = "country_code"
-        df[column] = df["country"].apply(self.assign_valid_country_code)
-
-        column = "phone_number"
-        df[column] = df[column].str.replace("x", "")
-
-        df.dropna(how="all", inplace=True)
-        df.reset_index(inplace=True, drop=True)
-        return df
+        return self.apply_rules(users_df, "users")
 
     def clean_card_data(self, cards_df: DataFrame) -> DataFrame:
         """
@@ -95,30 +255,19 @@ class DataCleaning():
         Returns:
         - DataFrame: Cleaned card data.
 
-        This method performs the following steps:
+        This method applies the CLEANING_RULES["cards"] rules with the 'apply_rules' method:
         1. Replaces NULL values with NaN.
-        2. Cleans the 'card_number' column using the 'clean_card_number' method.
-        3. Masks invalid card numbers with NaN.
-        4. Fixes the date format in the 'date_payment_confirmed' column.
-        5. Drops rows where all values are NaN.
+        2. Cleans the 'card_number' column using the 'clean_card_numbers' method.
+        3. Fixes the date format in the 'date_payment_confirmed' column using the 'fix_date_formats' method.
+        4. Flags the card numbers passing the Luhn checksum in a 'card_number_valid' column, after 'card_number',
+           using the 'is_valid_card_numbers' method.
+        5. Drops the rows with invalid card numbers, and the rows where all values are NaN.
         6. Resets the index of the DataFrame.
+        7. Converts the columns to compact dtypes using the 'compact_dtypes' method.
 
         Note: The original DataFrame is not modified; a cleaned copy is returned.
         """
-        df = self.replace_null_with_nan(cards_df)
-
-        column = "card_number"
-        df[column] = df[column].apply(self.clean_card_number)
-
-        invalid_card_number_mask = df["card_number"].isna()
-        df.mask(invalid_card_number_mask, inplace=True)
-
-        column = "date_payment_confirmed"
-        df.loc[:, column] = df[column].apply(self.fix_date_format)
-
-        df.dropna(how="all", inplace=True)
-        df.reset_index(inplace=True, drop=True)
-        return df
+        return self.apply_rules(cards_df, "cards")
 
     def clean_store_data(self, stores_df: DataFrame) -> DataFrame:
         """
@@ -130,38 +279,19 @@ class DataCleaning():
         Returns:
         - DataFrame: Cleaned store data.
 
-        This method performs the following steps:
-        1. Drops the 'index' column from the DataFrame.
-        2. Masks invalid store types using the 'is_invalid_data_point' method and replaces them with NaN.
-        3. Drops the 'lat' column.
-        4. Cleans the 'staff_numbers' column using the 'remove_alpha_letters_from_staff_number' method.
-        5. Cleans the date format in the 'opening_date' column using the 'fix_date_format' method.
-        6. Cleans the 'continent' column by replacing occurrences of "ee" with an empty string.
-        7. Drops rows where all values are NaN.
-        8. Resets the index of the DataFrame.
+        This method applies the CLEANING_RULES["stores"] rules with the 'apply_rules' method:
+        1. Drops the 'index' and 'lat' columns from the DataFrame.
+        2. Cleans the 'staff_numbers' column using the 'remove_alpha_letters_from_staff_numbers' method.
+        3. Cleans the date format in the 'opening_date' column using the 'fix_date_formats' method.
+        4. Cleans the 'continent' column by replacing occurrences of "ee" with an empty string.
+        5. Drops the rows with invalid store types using the 'is_invalid_data_points' method,
+           and the rows where all values are NaN.
+        6. Resets the index of the DataFrame.
+        7. Converts the columns to compact dtypes using the 'compact_dtypes' method.
 
         Note: The original DataFrame is not modified; a cleaned copy is returned.
         """
-        df = stores_df.drop(columns="index")
-
-        column = "store_type"
-        invalid_store_type_mask = df[column].apply(self.is_invalid_data_point)
-        df.mask(invalid_store_type_mask, inplace=True)
-
-        df.drop(columns="lat", inplace=True)
-
-        column = "staff_numbers"
-        df[column] = df[column].apply(self.remove_alpha_letters_from_staff_number)
-
-        column = "opening_date"
-        df[column] = df[column].apply(self.fix_date_format)
-
-        column = "continent"
-        df[column] = df[column].str.replace("ee", "")
-
-        df.dropna(how="all", inplace=True)
-        df.reset_index(inplace=True, drop=True)
-        return df
+        return self.apply_rules(stores_df, "stores")
 
     def clean_products_data(self, products_df: DataFrame) -> DataFrame:
         """
@@ -173,27 +303,19 @@ class DataCleaning():
         Returns:
         - DataFrame: Cleaned product data.
 
-        This method performs the following steps:
-        1. Converts product weights to kilograms using the 'convert_product_weights' method.
-        2. Fixes the date format in the 'date_added' column using the 'fix_date_format' method.
-        3. Masks invalid data points in the 'weight' column by checking for NaN values.
-        4. Replaces invalid data points with NaN.
-        5. Drops rows where all values are NaN.
-        6. Resets the index of the DataFrame.
+        This method applies the CLEANING_RULES["products"] rules with the 'apply_rules' method:
+        1. Converts 'product_price' to a number using the 'parse_prices' method.
+        2. Fixes the date format in the 'date_added' column using the 'fix_date_formats' method.
+        3. Replaces the 'weight' column with a numeric 'weight_kg' column using the 'convert_weights_to_kg' method.
+        4. Adds a 'weight_class' column after 'weight_kg' using the 'assign_weight_classes' method.
+        5. Replaces the 'removed' column with a boolean 'still_avaliable' column using the AVAILABILITY_MAP.
+        6. Drops the rows whose weight could not be converted.
+        7. Resets the index of the DataFrame.
+        8. Converts the columns to compact dtypes using the 'compact_dtypes' method.
 
         Note: The original DataFrame is not modified; a cleaned copy is returned.
         """
-        df = self.convert_product_weights(products_df)
-
-        column = "date_added"
-        df[column] = df[column].apply(self.fix_date_format)
-
-        invalid_weight_mask = df["weight"].isna()
-        df.mask(invalid_weight_mask, inplace=True)
-
-        df.dropna(how="all", inplace=True)
-        df.reset_index(inplace=True, drop=True)
-        return df
+        return self.apply_rules(products_df, "products")
 
     def clean_orders_data(self, orders_df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -205,15 +327,13 @@ class DataCleaning():
         Returns:
         - pd.DataFrame: Cleaned order data.
 
-        This method performs the following steps:
+        This method applies the CLEANING_RULES["orders"] rules with the 'apply_rules' method:
         1. Drops specified columns ('first_name', 'last_name', '1', 'level_0', 'index').
-        2. Returns the cleaned DataFrame.
+        2. Converts the columns to compact dtypes using the 'compact_dtypes' method.
 
-        Note: The original DataFrame is modified in place.
+        Note: The original DataFrame is not modified; a cleaned copy is returned.
         """
-        columns = ["first_name", "last_name", "1", "level_0", "index"]
-        df = orders_df.drop(columns=columns)
-        return df
+        return self.apply_rules(orders_df, "orders")
 
     def clean_date_events(self, date_events_df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -225,25 +345,310 @@ class DataCleaning():
         Returns:
         - pd.DataFrame: Cleaned date events data.
 
-        This method performs the following steps:
+        This method applies the CLEANING_RULES["date_events"] rules with the 'apply_rules' method:
         1. Replaces NULL values with NaN.
-        2. Masks invalid data points in the 'time_period' column using the 'is_invalid_data_point' method.
-        3. Replaces invalid data points with NaN.
-        4. Drops rows where all columns are NaN.
-        5. Resets the index of the DataFrame.
+        2. Drops the rows with invalid data points in the 'time_period' column using the 'is_invalid_data_points'
+           method, and the rows where all columns are NaN.
+        3. Resets the index of the DataFrame.
+        4. Converts the columns to compact dtypes using the 'compact_dtypes' method.
 
         Note: The original DataFrame is not modified; a cleaned copy is returned.
         """
-        df = self.replace_null_with_nan(date_events_df)
+        return self.apply_rules(date_events_df, "date_events")
 
-        column = "time_period"
-        invalid_time_period_mask = df[column].apply(self.is_invalid_data_point)
-        df.mask(invalid_time_period_mask, inplace=True)
+    def apply_rules(self, df: DataFrame, dataset: str) -> DataFrame:
+        """
+        Clean a DataFrame with the declarative rules of a dataset.
 
-        df.dropna(inplace=True, how="all")
-        df.reset_index(inplace=True, drop=True)
+        Parameters:
+        - df (DataFrame): Input DataFrame.
+        - dataset (str): Key of CLEANING_RULES and COMPACT_DTYPES, e.g. "users".
+
+        Returns:
+        - DataFrame: Cleaned DataFrame.
+
+        This method compiles the rules into as few whole-column passes as possible:
+        1. Reads the null tokens as NaN in each kept column, inferring the dtypes of the object
+           columns again when any token was found (as 'replace_null_with_nan' does).
+        2. Runs the transforms of every column, then computes the derived columns in order.
+        3. Builds a single mask of the rows to drop from the invalid_rows predicates and the rows
+           without any value, and takes the kept rows in one pass with a new index.
+        4. Converts the columns to compact dtypes using the 'compact_dtypes' method.
+
+        Adding a source only takes a CLEANING_RULES and a COMPACT_DTYPES entry.
+
+        When 'lean' is set, the same rules run column by column with a bounded peak memory:
+        1. Null tokens are only looked for in object and string columns.
+        2. Each column is converted to its compact dtype as soon as it is cleaned, so at most one
+           uncompacted column is alive besides the input.
+        3. The rows to drop are taken out of every compact column by position, one column at a time.
+        The result is the same, except that 'memory_report' then measures the bytes before
+        'compact_dtypes' on every row, including the rows dropped afterwards.
+
+        With a 'backend', the DataFrame is split into up to 'partitions' row partitions of at least
+        MIN_PARTITION_ROWS rows, cleaned by the backend and concatenated in their order (see
+        '__apply_rules_partitioned').
+
+        Note: The original DataFrame is not modified; a cleaned copy is returned.
+        """
+        partitions = min(self.partitions, len(df) // self.MIN_PARTITION_ROWS)
+        if self.backend is not None and partitions > 1:
+            return self.__apply_rules_partitioned(df, dataset, partitions)
+        if self.lean:
+            return self.__apply_rules_lean(df, dataset)
+        rules = self.CLEANING_RULES[dataset]
+        drop_columns = set(rules.get("drop_columns", ()))
+        derived = rules.get("derived", {})
+        sources = {source for source, _ in derived.values()}
+
+        columns = {column: values for column, values in df.items()
+                   if column not in drop_columns or column in sources}
+        null_tokens = list(rules.get("null_tokens", ()))
+        if null_tokens:
+            found_null_token = False
+            for column, values in columns.items():
+                is_null = values.isin(null_tokens)
+                if is_null.any():
+                    columns[column] = values.mask(is_null)
+                    found_null_token = True
+            if found_null_token:
+                columns = {column: values.infer_objects(copy=False) for column, values in columns.items()}
+
+        for column, steps in rules.get("transforms", {}).items():
+            columns[column] = self.__apply_steps(columns[column], steps)
+        for column, (source, steps) in derived.items():
+            values = self.__apply_steps(columns[source], steps)
+            if column not in columns:
+                order = list(columns)
+                order.insert(order.index(source) + 1, column)
+                columns[column] = values
+                columns = {name: columns[name] for name in order}
+            columns[column] = values
+
+        # columns are not copied here, only once by the row filter
+        result = DataFrame(
+            {column: values for column, values in columns.items() if column not in drop_columns}, copy=False
+        )
+        if not rules.get("keep_rows", False):
+            is_dropped = result.isna().all(axis=1).to_numpy()
+            for column, predicate in rules.get("invalid_rows", {}).items():
+                values = columns[column]
+                is_invalid = values.isna() if predicate == "isna" else getattr(self, predicate)(values)
+                is_dropped |= is_invalid.to_numpy(dtype=bool)
+            if is_dropped.any():
+                result = result[~is_dropped]
+            result.index = pd.RangeIndex(len(result))
+        return self.compact_dtypes(result, dataset)
+
+    def __apply_rules_partitioned(self, df: DataFrame, dataset: str, partitions: int) -> DataFrame:
+        """
+        Clean row partitions of df with the execution backend and concatenate them.
+
+        Every partition is cleaned by 'apply_rules' on its own copy of this instance without backend.
+        The rules work row by row, so the partitions give the rows of a single call, in order,
+        with a new index unless the dataset keeps its rows. Categories are the sorted union of
+        the categories of the partitions, as 'compact_dtypes' would infer them. 'memory_report'
+        adds up the bytes before 'compact_dtypes' of the partitions and measures the concatenated
+        result; 'unmatched_weights' gathers those of the partitions.
+        """
+        workers = []
+        for _ in range(partitions):
+            # one instance per partition, as threads would share its reports
+            worker = copy.copy(self)
+            worker.backend = None
+            worker.memory_report = {}
+            worker.unmatched_weights = None
+            workers.append(worker)
+        bounds = np.linspace(0, len(df), partitions + 1).astype(int)
+        results = self.backend.map(
+            clean_partition,
+            workers,
+            [df.iloc[start:stop] for start, stop in zip(bounds, bounds[1:])],
+            [dataset] * partitions
+        )
+        frames = [frame for frame, _, _ in results]
+
+        keep_rows = self.CLEANING_RULES[dataset].get("keep_rows", False)
+        result = pd.concat(frames, ignore_index=not keep_rows)
+        for column, values in result.items():
+            parts = [frame[column] for frame in frames]
+            # partitions infer their own categories; concat falls back to object for those
+            if isinstance(parts[0].dtype, pd.CategoricalDtype) and not isinstance(values.dtype, pd.CategoricalDtype):
+                result[column] = Series(union_categoricals(parts, sort_categories=True), index=result.index)
+
+        if self.report_memory:
+            report = self.memory_report.setdefault(dataset, {"bytes_before": 0, "bytes_after": 0})
+            for _, memory_report, _ in results:
+                report["bytes_before"] += memory_report.get(dataset, {}).get("bytes_before", 0)
+            report["bytes_after"] += int(result.memory_usage(deep=True).sum())
+        unmatched_weights = [weights for _, _, weights in results]
+        if all(weights is not None for weights in unmatched_weights):
+            self.unmatched_weights = pd.concat(unmatched_weights)
+        return result
+
+    def __apply_rules_lean(self, df: DataFrame, dataset: str) -> DataFrame:
+        """
+        Lean version of 'apply_rules', cleaning and compacting one column at a time.
+        """
+        rules = self.CLEANING_RULES[dataset]
+        drop_columns = set(rules.get("drop_columns", ()))
+        transforms = rules.get("transforms", {})
+        derived = rules.get("derived", {})
+        invalid_rows = rules.get("invalid_rows", {})
+        keep_rows = rules.get("keep_rows", False)
+        dtypes = self.COMPACT_DTYPES[dataset]
+
+        # only text columns can hold a null token
+        null_tokens = list(rules.get("null_tokens", ()))
+        null_masks = {}
+        if null_tokens:
+            for column, values in df.items():
+                if pd.api.types.is_object_dtype(values) or pd.api.types.is_string_dtype(values):
+                    is_null = values.isin(null_tokens).to_numpy()
+                    if is_null.any():
+                        null_masks[column] = is_null
+        sources = {source for source, _ in derived.values()}
+
+        def clean(column: str) -> Series:
+            values = df[column]
+            if column in null_masks:
+                values = values.mask(null_masks[column])
+            if null_masks:
+                values = values.infer_objects(copy=False)
+            return self.__apply_steps(values, transforms.get(column, ()))
+
+        order = list(df.columns)
+        for column, (source, _) in derived.items():
+            if column not in order:
+                order.insert(order.index(source) + 1, column)
+
+        cleaned_sources = {}
+        columns = {}
+        # conversions finished on the kept rows: categories taken from the values are taken again,
+        # numbers are only cast to their final dtype (invalid rows may not fit it)
+        inferred_categories = set()
+        numeric_dtypes = {}
+        is_empty = np.ones(len(df), dtype=bool)
+        is_invalid = np.zeros(len(df), dtype=bool)
+        bytes_before = 0
+        for column in order:
+            if column in drop_columns:
+                continue
+            if column in derived:
+                source, steps = derived[column]
+                if source not in cleaned_sources:
+                    cleaned_sources[source] = clean(source)
+                values = self.__apply_steps(cleaned_sources[source], steps)
+            else:
+                values = clean(column)
+            if column in sources:
+                cleaned_sources[column] = values
+            if not keep_rows:
+                is_empty &= values.isna().to_numpy()
+                if column in invalid_rows:
+                    predicate = invalid_rows[column]
+                    is_invalid_value = values.isna() if predicate == "isna" else getattr(self, predicate)(values)
+                    is_invalid |= is_invalid_value.to_numpy(dtype=bool)
+            if self.report_memory:
+                bytes_before += int(values.memory_usage(deep=True, index=False))
+
+            dtype = dtypes.get(column)
+            if dtype is None:
+                columns[column] = values
+            elif pd.api.types.is_integer_dtype(dtype) or pd.api.types.is_float_dtype(dtype):
+                columns[column] = pd.to_numeric(values, errors="coerce")
+                numeric_dtypes[column] = dtype
+            else:
+                if dtype == "category" and not isinstance(values.dtype, pd.CategoricalDtype):
+                    inferred_categories.add(column)
+                columns[column] = self.__compact_column(values, dtype)
+            del values
+        cleaned_sources.clear()
+
+        index = df.index
+        positions = None
+        if not keep_rows:
+            is_dropped = is_empty | is_invalid
+            index = pd.RangeIndex(int(len(df) - is_dropped.sum()))
+            if is_dropped.any():
+                positions = np.flatnonzero(~is_dropped)
+        for column, values in columns.items():
+            if positions is not None:
+                values = values.take(positions)
+                if column in inferred_categories:
+                    values = values.cat.remove_unused_categories()
+            if column in numeric_dtypes:
+                values = values.astype(numeric_dtypes[column])
+            columns[column] = values.set_axis(index)
+        result = DataFrame(columns, index=index, copy=False)
+
+        if self.report_memory:
+            report = self.memory_report.setdefault(dataset, {"bytes_before": 0, "bytes_after": 0})
+            report["bytes_before"] += bytes_before + int(index.memory_usage())
+            report["bytes_after"] += int(result.memory_usage(deep=True).sum())
+        return result
+
+    def __apply_steps(self, values: Series, steps: tuple) -> Series:
+        """
+        Apply the transform steps of a CLEANING_RULES column to a Series.
+        """
+        for step in steps:
+            if isinstance(step, str):
+                values = getattr(self, step)(values)
+            elif step[0] == "replace":
+                values = values.str.replace(step[1], step[2], regex=False)
+            elif step[0] == "map":
+                values = values.map(step[1])
+            else:
+                raise ValueError(f"unknown cleaning step {step!r}")
+        return values
+
+    def compact_dtypes(self, df: DataFrame, dataset: str) -> DataFrame:
+        """
+        Convert the columns of a cleaned DataFrame to the compact dtypes declared in COMPACT_DTYPES.
+
+        Parameters:
+        - df (DataFrame): Cleaned DataFrame.
+        - dataset (str): Key of COMPACT_DTYPES, e.g. "users".
+
+        Returns:
+        - DataFrame: DataFrame with compact dtypes.
+
+        This method performs the following conversions:
+        1. "category" columns become pandas categoricals.
+        2. Integer and float columns (e.g. "Int16", "float64") are parsed with 'pd.to_numeric';
+           values that are not numbers (e.g. "N/A") become missing.
+        3. "datetime64[ns]" columns are parsed from "%Y-%m-%d" strings; invalid dates become NaT.
+        4. Any other dtype (e.g. "string[pyarrow]") is applied with 'astype'.
+
+        Columns missing from the DataFrame are skipped. With 'report_memory', the in-memory size
+        before and after is added to 'memory_report' under dataset, so chunked datasets report
+        their totals.
+
+        Note: The original DataFrame is not modified; a converted copy is returned.
+        """
+        bytes_before = int(df.memory_usage(deep=True).sum()) if self.report_memory else 0
+        df = df.copy(deep=False)
+        for column, dtype in self.COMPACT_DTYPES[dataset].items():
+            if column in df.columns:
+                df[column] = self.__compact_column(df[column], dtype)
+
+        if self.report_memory:
+            report = self.memory_report.setdefault(dataset, {"bytes_before": 0, "bytes_after": 0})
+            report["bytes_before"] += bytes_before
+            report["bytes_after"] += int(df.memory_usage(deep=True).sum())
         return df
 
+    def __compact_column(self, values: Series, dtype: str) -> Series:
+        """
+        Convert a Series to one of the COMPACT_DTYPES dtypes, as described in 'compact_dtypes'.
+        """
+        if dtype == "datetime64[ns]":
+            return pd.to_datetime(values, format="%Y-%m-%d", errors="coerce")
+        if pd.api.types.is_integer_dtype(dtype) or pd.api.types.is_float_dtype(dtype):
+            return pd.to_numeric(values, errors="coerce").astype(dtype)
+        return values.astype(dtype)
+
     def replace_null_with_nan(self, df: DataFrame) -> DataFrame:
         """
         Replace occurrences of "NULL" with NaN in the DataFrame.
@@ -284,6 +689,54 @@ class DataCleaning():
         except (ParserError, ValueError, TypeError):
             return np.nan
 
+    def fix_date_formats(self, dates: Series) -> Series:
+        """
+        Fix the date format of a whole Series of date strings.
+
+        Parameters:
+        - dates (Series): Input Series of date strings.
+
+        Returns:
+        - Series: Dates formatted as "%Y-%m-%d", or NaN where the value is not a valid date.
+
+        This method is the batch counterpart of 'fix_date_format' and returns the same
+        value for every row. Rows matching one of the known layouts in DATE_FORMATS are
+        converted per layout with a vectorized 'pd.to_datetime'; only the rows that match
+        none of them (or fail to convert) are passed to 'fix_date_format'.
+
+        Note: Numeric dates in "year first" order are read the way 'fix_date_format'
+        reads them with dayfirst=True, i.e. "2020-10-06" becomes "2020-06-10" while
+        "2020-10-16" stays as it is.
+        """
+        if not (pd.api.types.is_object_dtype(dates) or isinstance(dates.dtype, pd.StringDtype)):
+            return dates.apply(self.fix_date_format)
+
+        index = dates.index
+        dates = dates.reset_index(drop=True)
+        result = pd.Series(np.nan, index=dates.index, dtype=object)
+        pending = pd.Series(True, index=dates.index)
+        for pattern, date_format in self.DATE_FORMATS:
+            is_match = dates.str.fullmatch(pattern).fillna(False).astype(bool) & pending
+            if not is_match.any():
+                continue
+            matched = dates[is_match].str.replace("/", "-", regex=False)
+            if date_format == "%Y-%m-%d":
+                # fix_date_format reads "year-x-y" as year-day-month whenever y is a valid month
+                is_day_first = matched.str.rsplit("-", n=1).str[-1].astype(int) <= 12
+                parsed = pd.concat([
+                    pd.to_datetime(matched[is_day_first], format="%Y-%d-%m", errors="coerce"),
+                    pd.to_datetime(matched[~is_day_first], format="%Y-%m-%d", errors="coerce")
+                ])
+            else:
+                parsed = pd.to_datetime(matched, format=date_format, errors="coerce")
+            parsed = parsed.dropna()
+            result[parsed.index] = parsed.dt.strftime("%Y-%m-%d")
+            pending[parsed.index] = False
+
+        result[pending] = dates[pending].apply(self.fix_date_format)
+        result.index = index
+        return result
+
     def assign_valid_country_code(self, country: str) -> str:
         """
         Assign a valid country code based on the provided country name.
@@ -304,6 +757,21 @@ class DataCleaning():
         except KeyError:
             return np.nan
 
+    def assign_valid_country_codes(self, countries: Series) -> Series:
+        """
+        Assign valid country codes to a whole Series of country names.
+
+        Parameters:
+        - countries (Series): Input Series of country names.
+
+        Returns:
+        - Series: Country codes, or NaN where the country is not in COUNTRY_CODE_MAP.
+
+        This method is the batch counterpart of 'assign_valid_country_code' and looks
+        every name up in COUNTRY_CODE_MAP with a single 'map' call.
+        """
+        return countries.astype(object).map(self.COUNTRY_CODE_MAP)
+
     def clean_card_number(self, card_number: str) -> str:
         """
         Clean the card number string.
@@ -328,6 +796,87 @@ class DataCleaning():
         else:
             return np.nan
 
+    def clean_card_numbers(self, card_numbers: Series) -> Series:
+        """
+        Clean a whole Series of card number strings.
+
+        Parameters:
+        - card_numbers (Series): Input Series of card numbers.
+
+        Returns:
+        - Series: Cleaned card numbers as Arrow backed strings, or NA where the card number is invalid.
+
+        This method is the batch counterpart of 'clean_card_number' and returns the same
+        value, as a string, for every row:
+        1. Values made of digits only are kept as they are.
+        2. Other values containing a question mark ('?') have their question marks removed.
+        3. Everything else (including NaN) becomes NA.
+
+        The checks run on Arrow backed strings, the dtype card numbers are stored with.
+        """
+        values = card_numbers.astype("string[pyarrow]")
+        is_valid = values.str.isdigit() | values.str.contains("?", regex=False)
+        return values.str.replace("?", "", regex=False).where(is_valid)
+
+    def is_valid_card_number(self, card_number: str) -> bool:
+        """
+        Check a card number against the Luhn checksum.
+
+        Parameters:
+        - card_number (str): Input card number string.
+
+        Returns:
+        - bool: True if the card number is made of ASCII digits and passes the Luhn checksum.
+
+        Starting from the rightmost digit, every second digit is doubled (minus 9 when the
+        result is above 9); the card number is valid when the sum of all digits is a multiple of 10.
+        """
+        card_number_string = str(card_number)
+        if not card_number_string.isascii() or not card_number_string.isdigit():
+            return False
+        digits = [int(char) for char in reversed(card_number_string)]
+        total = sum(digits[0::2]) + sum(self.LUHN_DOUBLED_DIGITS[digit] for digit in digits[1::2])
+        return total % 10 == 0
+
+    def is_valid_card_numbers(self, card_numbers: Series) -> Series:
+        """
+        Check which card numbers in a Series pass the Luhn checksum.
+
+        Parameters:
+        - card_numbers (Series): Input Series of card numbers.
+
+        Returns:
+        - Series: Boolean mask, True where the card number is valid.
+
+        This method is the batch counterpart of 'is_valid_card_number' and returns the same
+        value for every row:
+        1. The card numbers made of ASCII digits are read into a NumPy matrix of their bytes,
+           one row per card number, padded with zero bytes on the right.
+        2. Whether a column is at a doubled position follows from the length of every row
+           (positions are counted from the rightmost digit).
+        3. The Luhn values of all digits are looked up at once in a table built from
+           LUHN_DOUBLED_DIGITS (zero for the padding) and summed per row.
+        """
+        values = card_numbers.astype("string[pyarrow]")
+        is_digit = values.str.fullmatch("[0-9]+").fillna(False).to_numpy(dtype=bool)
+        result = Series(False, index=card_numbers.index)
+        if not is_digit.any():
+            return result
+
+        chars = values[is_digit].to_numpy(dtype=object).astype("S")
+        codes = chars.view(np.uint8).reshape(len(chars), chars.dtype.itemsize)
+        lengths = np.count_nonzero(codes, axis=1).astype(np.uint8)
+        # doubled where the distance to the last digit, length - 1 - column, is odd
+        columns = np.arange(codes.shape[1], dtype=np.uint8)
+        is_doubled = ((lengths[:, None] ^ columns) & 1) == 0
+
+        luhn_values = np.zeros((2, 256), dtype=np.uint8)
+        luhn_values[0, ord("0"):ord("9") + 1] = np.arange(10)
+        luhn_values[1, ord("0"):ord("9") + 1] = self.LUHN_DOUBLED_DIGITS
+        total = luhn_values[is_doubled.view(np.uint8), codes].sum(axis=1, dtype=np.uint16)
+        result[is_digit] = total % 10 == 0
+        return result
+
     def remove_alpha_letters_from_staff_number(self, staff_number: str) -> str:
         """
         Remove alpha letters from the staff number string.
@@ -355,6 +904,25 @@ class DataCleaning():
             return fixed_staff_numbers
         return staff_number_string
 
+    def remove_alpha_letters_from_staff_numbers(self, staff_numbers: Series) -> Series:
+        """
+        Remove alpha letters from a whole Series of staff numbers.
+
+        Parameters:
+        - staff_numbers (Series): Input Series of staff numbers.
+
+        Returns:
+        - Series: Staff number strings with alpha letters removed, NaN where the input is missing.
+
+        This method is the batch counterpart of 'remove_alpha_letters_from_staff_number'.
+        Letters are removed with a single regex 'str.replace' evaluated once per distinct
+        value and broadcast back to the rows.
+        """
+        codes, uniques = pd.factorize(staff_numbers)
+        fixed = Series(uniques, dtype=object).astype(str).str.replace(r"[^\W\d_]", "", regex=True)
+        fixed = np.append(fixed.to_numpy(dtype=object), np.nan)
+        return Series(fixed[codes], index=staff_numbers.index, dtype=object)
+
     def convert_product_weights(self, products_df: DataFrame) -> DataFrame:
         """
         Convert product weights to kilograms in the DataFrame.
@@ -363,21 +931,80 @@ class DataCleaning():
         - products_df (DataFrame): Input DataFrame containing product data.
 
         Returns:
-        - DataFrame: DataFrame with product weights converted to kilograms.
+        - DataFrame: DataFrame with the 'weight' column replaced by a float64 'weight_kg' column.
 
-        This method performs the following steps:
-        1. Applies the 'convert_to_kg' method to the 'weight' column to convert weights to kilograms.
-        2. Masks values in the 'weight' column that do not have 'kg' units.
-        3. Returns the DataFrame with converted product weights.
+        This method converts the 'weight' column with the 'convert_weights_to_kg' method and
+        inserts the result as 'weight_kg' at the position of 'weight'.
 
-        Note: The original DataFrame is modified in place.
+        Note: The original DataFrame is not modified; a converted copy is returned.
         """
-        df = products_df.copy()
-        df["weight"] = df["weight"].apply(self.convert_to_kg)
-        mask = df["weight"].apply(lambda value: "kg" in str(value))
-        df["weight"].mask(~mask, inplace=True)
+        weight_kg = self.convert_weights_to_kg(products_df["weight"])
+        df = products_df.drop(columns="weight")
+        df.insert(products_df.columns.get_loc("weight"), "weight_kg", weight_kg.to_numpy())
         return df
 
+    def convert_weights_to_kg(self, weights: Series) -> Series:
+        """
+        Convert a whole Series of product weights to kilograms.
+
+        Parameters:
+        - weights (Series): Input Series of product weights.
+
+        Returns:
+        - Series: float64 weights in kilograms, NaN where the weight could not be converted.
+
+        This method performs the following steps:
+        1. Extracts the multiplier, magnitude and unit of every weight in one 'str.extract' pass
+           using the WEIGHT_PATTERN regex (e.g. "12 x 100g", "16oz", "77g .").
+        2. Computes the weight in kilograms with NumPy arithmetic using the WEIGHT_UNIT_DIVISORS map,
+           rounding converted units to 3 decimals the way 'convert_to_kg' does.
+        3. Sets NaN for weights that could not be converted and records them in 'unmatched_weights'.
+        """
+        parts = weights.astype(str).str.extract(self.WEIGHT_PATTERN)
+
+        multiplier = pd.to_numeric(parts["multiplier"]).fillna(1).to_numpy(dtype="float64")
+        magnitude = pd.to_numeric(parts["magnitude"]).to_numpy(dtype="float64")
+        divisor = parts["unit"].map(self.WEIGHT_UNIT_DIVISORS).to_numpy(dtype="float64")
+        weight_kg = (magnitude * multiplier) / divisor
+        weight_kg = np.where(parts["unit"] == "kg", weight_kg, np.round(weight_kg, 3))
+
+        is_unmatched = parts["unit"].isna() & weights.notna()
+        self.unmatched_weights = weights[is_unmatched].to_frame("weight")
+        return Series(weight_kg, index=weights.index)
+
+    def assign_weight_classes(self, weights: Series) -> Series:
+        """
+        Assign the weight class of a whole Series of weights in kilograms.
+
+        Parameters:
+        - weights (Series): Input Series of weights in kilograms.
+
+        Returns:
+        - Series: Categorical weight classes, NaN where the weight is NaN.
+
+        Every weight gets the class of WEIGHT_CLASSES with the highest lower bound not above it.
+        """
+        return pd.cut(
+            weights,
+            bins=list(self.WEIGHT_CLASSES.values()) + [np.inf],
+            labels=list(self.WEIGHT_CLASSES),
+            right=False
+        )
+
+    def parse_prices(self, prices: Series) -> Series:
+        """
+        Convert a whole Series of prices to numbers.
+
+        Parameters:
+        - prices (Series): Input Series of prices, e.g. "£1,099.00".
+
+        Returns:
+        - Series: float64 prices, NaN where the value is not a price.
+
+        The leading '£' and the thousands separators are removed before parsing with 'pd.to_numeric'.
+        """
+        return pd.to_numeric(prices.astype(str).str.lstrip("£").str.replace(",", ""), errors="coerce")
+
     def convert_to_kg(self, value: str) -> str:
         """
         Convert a product weight value to kilograms.
@@ -455,3 +1082,44 @@ class DataCleaning():
         elif is_single_word and is_upper_case:
             return True
         return False
+
+    def is_invalid_data_points(self, values: Series) -> Series:
+        """
+        Check which data points in a Series are considered invalid.
+
+        Parameters:
+        - values (Series): Input Series to be checked.
+
+        Returns:
+        - Series: Boolean mask, True where the data point is considered invalid.
+
+        This method is the batch counterpart of 'is_invalid_data_point' and applies the
+        same criteria to the whole Series at once:
+        1. If the value is a single word and contains at least one digit.
+        2. If the value is a single word and is entirely in uppercase.
+
+        The criteria are evaluated once per distinct value and broadcast back to the rows.
+        """
+        codes, uniques = pd.factorize(values.astype(str))
+        uniques = Series(uniques)
+        is_single_word = ~uniques.str.contains(" ", regex=False)
+        contain_digit = uniques.str.contains(r"\d")
+        is_upper_case = uniques.str.isupper()
+        is_invalid = (is_single_word & (contain_digit | is_upper_case)).to_numpy(dtype=bool)
+        return Series(is_invalid[codes], index=values.index)
+
+
+def clean_partition(cleaning_util: DataCleaning, df: DataFrame, dataset: str) -> tuple:
+    """
+    Clean a partition of a DataFrame in an execution backend worker.
+
+    Parameters:
+    - cleaning_util (DataCleaning): DataCleaning instance, without backend, run by the worker.
+    - df (DataFrame): Row partition of the DataFrame.
+    - dataset (str): Key of CLEANING_RULES and COMPACT_DTYPES, e.g. "users".
+
+    Returns:
+    - tuple: (cleaned DataFrame, memory_report, unmatched_weights) of cleaning_util.
+    """
+    result = cleaning_util.apply_rules(df, dataset)
+    return result, cleaning_util.memory_report, cleaning_util.unmatched_weights
@@ -1,12 +1,120 @@
 from decouple import config
-from sqlalchemy import inspect
-from requests import get
+from sqlalchemy import inspect, select, table, column, text
+from requests import get, head, Session
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from multiprocessing import get_context
 from urllib.parse import urlparse
+from email.utils import format_datetime
+from datetime import timezone
+from contextlib import contextmanager, closing
+from tempfile import NamedTemporaryFile
+from itertools import chain, repeat
+from hashlib import sha256
+from bisect import bisect
+from io import BytesIO, StringIO
+from fnmatch import fnmatchcase
+from math import ceil
 from pandas import DataFrame
+from pypdf import PdfReader
+from typing import Iterator
 import pandas as pd
 import tabula
+import pdfplumber
+import csv
 import boto3
 import botocore
+import os
+
+
+class TabulaBackend():
+    """
+    PDF table backend running tabula-java.
+
+    A block of pages is read by a single tabula call, run in a Java subprocess as the
+    original extraction did, so every block starts one JVM whatever its number of pages.
+    The tables are split by page with the page numbers of tabula's JSON output.
+
+    Methods:
+        read_pages(path: str, pages: list) -> list
+    """
+    def read_pages(self, path: str, pages: list) -> list:
+        """
+        Read the tables of a block of PDF pages.
+
+        Args:
+            path (str): Path of a local PDF file.
+            pages (list): Page numbers (1-based) to read.
+
+        Returns:
+            list: For every page, the list of DataFrames of the tables found on it.
+        """
+        pages = list(pages)
+        tables = {page: [] for page in pages}
+        for json_table in tabula.read_pdf(path, pages=pages, output_format="json", force_subprocess=True):
+            tables[json_table["page_number"]].append(json_table)
+        # the conversion read_pdf applies to the JSON tables of its default output
+        return [tabula.io._extract_from(page_tables) for page_tables in tables.values()]
+
+
+class PdfPlumberBackend():
+    """
+    Pure-Python PDF table backend laying out the words found by pdfplumber as a table.
+
+    The first line of a page is the header. Words whose tops are within LINE_TOLERANCE
+    points share a line, and every word is placed in the column of the closest header,
+    splitting at the midpoints between neighbouring headers, so left, right and centre
+    aligned cells are placed alike. Like tabula's CSV output, the rows are parsed by
+    pandas, which infers the column types.
+
+    Attributes:
+        LINE_TOLERANCE (float): Maximum difference between the tops of words on one line.
+
+    Methods:
+        read_pages(path: str, pages: list) -> list
+    """
+    LINE_TOLERANCE = 3
+
+    def read_pages(self, path: str, pages: list) -> list:
+        """
+        Read the table of a block of PDF pages.
+
+        Args:
+            path (str): Path of a local PDF file.
+            pages (list): Page numbers (1-based) to read.
+
+        Returns:
+            list: For every page, a list holding the DataFrame of its table, or an empty list.
+        """
+        with pdfplumber.open(path) as pdf:
+            return [self.__read_page(pdf.pages[page - 1]) for page in pages]
+
+    def __read_page(self, page) -> list:
+        """
+        Private method laying out the words of a page as a table.
+        """
+        lines = []
+        for word in sorted(page.extract_words(keep_blank_chars=True), key=lambda word: (word["top"], word["x0"])):
+            if lines and word["top"] - lines[-1][0]["top"] <= self.LINE_TOLERANCE:
+                lines[-1].append(word)
+            else:
+                lines.append([word])
+        if not lines:
+            return []
+
+        header = sorted(lines[0], key=lambda word: word["x0"])
+        boundaries = [(left["x1"] + right["x0"]) / 2 for left, right in zip(header, header[1:])]
+        buffer = StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(word["text"].strip() for word in header)
+        for line in lines[1:]:
+            cells = [[] for _ in header]
+            for word in sorted(line, key=lambda word: word["x0"]):
+                cells[bisect(boundaries, (word["x0"] + word["x1"]) / 2)].append(word["text"].strip())
+            writer.writerow(" ".join(cell) for cell in cells)
+        buffer.seek(0)
+        return [pd.read_csv(buffer)]
 
 
 class DataExtractor():
@@ -16,10 +124,29 @@ class DataExtractor():
     S3_ADDRESS = "s3://data-handling-public/products.csv"
     PDF_URL = "https://data-handling-public.s3.eu-west-1.amazonaws.com/card_details.pdf"
     DATE_EVENTS_DATA_LINK="https://data-handling-public.s3.eu-west-1.amazonaws.com/date_details.json"
+    MAX_STORE_WORKERS = 16
+    MAX_PDF_WORKERS = 4
+    MAX_S3_WORKERS = 8
+    S3_PART_SIZE = 8 * 1024 * 1024
+    PDF_BACKENDS = {"tabula": TabulaBackend, "pdfplumber": PdfPlumberBackend}
+    STORE_RETRIES = 5
+    STORE_BACKOFF_FACTOR = 0.5
+    RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
 
 
-    def __init__(self) -> None:
-        pass
+    def __init__(self, cache=None, pdf_backend=None) -> None:
+        """
+        Args:
+            cache (ExtractionCache): On-disk cache of the PDF, S3, JSON and stores API extracts
+            and of the tables of every PDF page. Data is always downloaded again when None.
+            pdf_backend: Object whose 'read_pages(path, pages)' method reads the tables of a
+            block of PDF pages, run in worker processes, so it must be picklable. Either an
+            instance or a key of PDF_BACKENDS, defaults to TabulaBackend.
+        """
+        self.cache = cache
+        if pdf_backend is None or isinstance(pdf_backend, str):
+            pdf_backend = self.PDF_BACKENDS[pdf_backend or "tabula"]()
+        self.pdf_backend = pdf_backend
 
     def list_db_tables(self, engine) -> list:
         """
@@ -39,6 +166,8 @@ class DataExtractor():
         """
         Read table from an AWS RDS database.
 
+        The rows are fetched in batches through a server-side cursor.
+
         Args:
             table_name (str): Name of the table.
             engine: SQLAlchemy database engine.
@@ -46,22 +175,175 @@ class DataExtractor():
         Returns:
             DataFrame: DataFrame containing the table data.
         """
-        df = pd.read_sql_table(table_name, engine)
+        with engine.connect() as connection:
+            connection = connection.execution_options(stream_results=True)
+            df = pd.read_sql_table(table_name, connection)
         return df
 
-    def retrieve_pdf_data(self, url: str) -> DataFrame:
+    def read_rds_table_in_chunks(self, table_name: str, engine, chunksize: int = 50_000) -> Iterator[DataFrame]:
+        """
+        Read table from an AWS RDS database in fixed-size chunks.
+
+        The rows are fetched through a server-side cursor, so only one chunk of the
+        table is held in memory at a time.
+
+        Args:
+            table_name (str): Name of the table.
+            engine: SQLAlchemy database engine.
+            chunksize (int): Number of rows per chunk.
+
+        Yields:
+            DataFrame: DataFrame containing the next chunk of the table data.
+        """
+        with engine.connect() as connection:
+            connection = connection.execution_options(stream_results=True, max_row_buffer=chunksize)
+            yield from pd.read_sql_table(table_name, connection, chunksize=chunksize)
+
+    def read_rds_table_since(self, table_name: str, engine, watermark_column: str, watermark,
+                             chunksize: int = 50_000) -> Iterator[DataFrame]:
+        """
+        Read the rows of an AWS RDS table past a high-water mark, in fixed-size chunks.
+
+        Args:
+            table_name (str): Name of the table.
+            engine: SQLAlchemy database engine.
+            watermark_column (str): Monotonically increasing column, e.g. "index".
+            watermark: Rows with watermark_column greater than this value are read.
+            chunksize (int): Number of rows per chunk.
+
+        Yields:
+            DataFrame: DataFrame containing the next chunk of new rows, ordered by watermark_column.
+        """
+        source = table(table_name, column(watermark_column))
+        query = (
+            select(text("*"))
+            .select_from(source)
+            .where(source.c[watermark_column] > watermark)
+            .order_by(source.c[watermark_column])
+        )
+        with engine.connect() as connection:
+            connection = connection.execution_options(stream_results=True, max_row_buffer=chunksize)
+            yield from pd.read_sql_query(query, connection, chunksize=chunksize)
+
+    def retrieve_pdf_data(self, url: str, max_workers: int = None, pages_per_shard: int = None) -> DataFrame:
         """
         Retrieve table data from all pages in a PDF file.
 
+        The PDF is downloaded once and its pages are split into blocks of consecutive pages,
+        parsed in parallel by a process pool. The tables of every page are cached under the
+        hash of the page content, so a rerun only parses the pages that changed.
+
         Args:
-            url (str): URL of the PDF file.
+            url (str): URL or local path of the PDF file.
+            max_workers (int): Maximum number of worker processes, defaults to MAX_PDF_WORKERS.
+            pages_per_shard (int): Number of pages per block, defaults to an even split over the workers.
 
         Returns:
-            DataFrame: DataFrame containing the PDF data.
+            DataFrame: DataFrame containing the PDF data, in page order.
         """
-        df = tabula.read_pdf(url, pages='all', force_subprocess=True)
-        df = pd.concat(df)
-        return df
+        def extract(validators):
+            with self.__local_pdf(url, validators) as path:
+                pages = self.__read_pdf_pages(path, max_workers or self.MAX_PDF_WORKERS, pages_per_shard)
+                tables = [table for page_tables in pages for table in page_tables]
+            return pd.concat(tables)
+
+        # extracts of different backends may differ, so they are cached apart
+        backend_name = type(self.pdf_backend).__name__
+        return self.__cached(url, extract, key=f"{url}#{backend_name}")
+
+    @contextmanager
+    def __local_pdf(self, url: str, validators: dict):
+        """
+        Private context manager providing a local path of a PDF, downloading it to a temporary file if needed.
+
+        The validators of a download are written to validators.
+        """
+        if urlparse(url).scheme not in ("http", "https"):
+            yield url
+            return
+        res = get(url)
+        res.raise_for_status()
+        validators.update(self.__response_validators(res.headers))
+        with NamedTemporaryFile(suffix=".pdf") as file:
+            file.write(res.content)
+            file.flush()
+            yield file.name
+
+    def __read_pdf_pages(self, path: str, max_workers: int, pages_per_shard: int) -> Iterator[list]:
+        """
+        Private method yielding the tables of every page of a local PDF, in page order.
+
+        Pages found in the cache are not parsed again. The other pages are split into blocks
+        of pages_per_shard pages and read by self.pdf_backend in a pool of max_workers processes,
+        or in this process when there is a single block.
+
+        Yields:
+            list: DataFrames of the tables found on the next page.
+        """
+        backend_name = type(self.pdf_backend).__name__
+        page_sources = [f"pdf-page:{backend_name}:{page_hash}" for page_hash in self.__hash_pdf_pages(path)]
+        cached_pages = {}
+        if self.cache is not None:
+            for page, source in enumerate(page_sources, start=1):
+                page_tables = self.__load_pdf_page(source)
+                if page_tables is not None:
+                    cached_pages[page] = page_tables
+        missing_pages = [page for page in range(1, len(page_sources) + 1) if page not in cached_pages]
+        if missing_pages:
+            print(f"...parsing {len(missing_pages)} of {len(page_sources)} PDF pages")
+
+        pages_per_shard = pages_per_shard or max(1, ceil(len(missing_pages) / max_workers))
+        shards = [missing_pages[i:i + pages_per_shard] for i in range(0, len(missing_pages), pages_per_shard)]
+        executor = None
+        if len(shards) > 1 and max_workers > 1:
+            # spawn, since forking a process that already runs a JVM is unsafe
+            executor = ProcessPoolExecutor(min(max_workers, len(shards)), mp_context=get_context("spawn"))
+            shard_results = executor.map(self.pdf_backend.read_pages, repeat(path), shards)
+        else:
+            shard_results = map(self.pdf_backend.read_pages, repeat(path), shards)
+        parsed_pages = chain.from_iterable(shard_results)
+
+        try:
+            for page, source in enumerate(page_sources, start=1):
+                if page in cached_pages:
+                    yield cached_pages.pop(page)
+                    continue
+                page_tables = next(parsed_pages)
+                if self.cache is not None:
+                    page_df = pd.concat(page_tables) if page_tables else DataFrame()
+                    self.cache.store(source, page_df, {}, evict=False)
+                yield page_tables
+            if self.cache is not None and missing_pages:
+                self.cache.evict()
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+
+    def __load_pdf_page(self, source: str) -> list:
+        """
+        Private method loading the cached tables of a PDF page, returning None if they are not cached.
+        """
+        entry = self.cache.lookup(source)
+        df = None if entry is None else self.cache.load(entry)
+        if df is None:
+            return None
+        self.cache.touch(entry)
+        return [df] if len(df.columns) else []
+
+    def __hash_pdf_pages(self, path: str) -> list:
+        """
+        Private method hashing the content stream, size and rotation of every page of a PDF.
+
+        Returns:
+            list: SHA-256 hex digest of every page, in page order.
+        """
+        page_hashes = []
+        for page in PdfReader(path).pages:
+            contents = page.get_contents()
+            digest = sha256(contents.get_data() if contents is not None else b"")
+            digest.update(f"{list(page.mediabox)}:{page.rotation}".encode())
+            page_hashes.append(digest.hexdigest())
+        return page_hashes
 
     def list_number_of_stores(self, url, headers):
         """
@@ -79,51 +361,179 @@ class DataExtractor():
         number_of_stores = data["number_stores"]
         return number_of_stores
 
-    def retrieve_store_data(self, url, headers, number_of_stores):
+    def retrieve_store_data(self, url, headers, number_of_stores, max_workers=None, retries=None, backoff_factor=None):
         """
         Retrieve store data from a given URL.
 
+        The stores are fetched concurrently over a shared keep-alive session. Requests
+        answered with 429 or 5xx are retried with exponential backoff.
+
         Args:
             url (str): URL pattern for individual store data.
             headers: Headers for the HTTP request.
             number_of_stores (int): Number of stores.
+            max_workers (int): Maximum number of concurrent requests, defaults to MAX_STORE_WORKERS.
+            retries (int): Maximum number of retries per store, defaults to STORE_RETRIES.
+            backoff_factor (float): Backoff factor between retries, defaults to STORE_BACKOFF_FACTOR.
 
         Returns:
-            DataFrame: DataFrame containing store data.
+            DataFrame: DataFrame containing store data, in store index order.
         """
-        stores_list = []
-        for store_index in range(number_of_stores):
-            store_url = url % (store_index)
-            res = get(store_url, headers=headers)
-            store_data = res.json()
-            stores_list.append(store_data)
-        stores_df = pd.DataFrame(stores_list)
-        return stores_df
+        max_workers = max_workers or self.MAX_STORE_WORKERS
+        retries = self.STORE_RETRIES if retries is None else retries
+        backoff_factor = self.STORE_BACKOFF_FACTOR if backoff_factor is None else backoff_factor
 
-    def extract_from_s3(self, s3_address):
+        def extract(validators):
+            def fetch_store(store_index):
+                store_url = url % (store_index)
+                res = session.get(store_url, headers=headers)
+                return res.json()
+
+            with self.__create_session(max_workers, retries, backoff_factor) as session:
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    stores_list = list(executor.map(fetch_store, range(number_of_stores)))
+            return pd.DataFrame(stores_list)
+
+        # the stores API has no validators, a cached extract is reused until it expires
+        source = f"{url}?number_of_stores={number_of_stores}"
+        return self.__cached(source, extract, validate=lambda entry: (entry is not None, {}))
+
+    def __create_session(self, pool_size, retries, backoff_factor) -> Session:
         """
-        Extract data from an S3 bucket.
+        Private method to create an HTTP session with connection pooling and retries.
 
         Args:
-            s3_address (str): S3 object address.
+            pool_size (int): Maximum number of pooled connections per host.
+            retries (int): Maximum number of retries per request.
+            backoff_factor (float): Backoff factor between retries.
+
+        Returns:
+            Session: requests session retrying GET requests answered with RETRY_STATUS_CODES.
+        """
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=self.RETRY_STATUS_CODES,
+            allowed_methods=["GET"]
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        session = Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def extract_from_s3(self, s3_address, max_workers=None, part_size=None):
+        """
+        Extract CSV data from an S3 bucket.
+
+        Object bodies are streamed straight into the CSV parser; objects larger than part_size
+        are fetched with concurrent byte-range GETs into a memory buffer. An address ending with
+        "/" loads every object under that prefix and a key holding glob characters (*, ?, [)
+        every matching object, concurrently, concatenated in key order.
+
+        Args:
+            s3_address (str): S3 object address, prefix or glob, e.g. "s3://bucket/products/*.csv".
+            max_workers (int): Maximum number of concurrent GETs, defaults to MAX_S3_WORKERS.
+            part_size (int): Size in bytes of the byte ranges, defaults to S3_PART_SIZE.
 
         Returns:
             DataFrame: DataFrame containing S3 data.
         """
+        max_workers = max_workers or self.MAX_S3_WORKERS
+        part_size = part_size or self.S3_PART_SIZE
         s3_address_data = self.parse_s3_address(s3_address)
         bucket_name = s3_address_data["BUCKET_NAME"]
         key = s3_address_data["KEY"]
-        s3 = boto3.resource('s3')
-        download_path = "./products.csv"
-        try:
-            s3.Bucket(bucket_name).download_file(key, download_path)
-        except botocore.exceptions.ClientError as e:
-            if e.response['Error']['Code'] == "404":
-                print("The s3 object does not exist.")
-            else:
-                raise
-        products_df = pd.read_csv(download_path, index_col=0)
-        return products_df
+        s3 = boto3.client('s3')
+
+        if not self.__is_s3_pattern(key):
+            def extract(validators):
+                try:
+                    response = s3.head_object(Bucket=bucket_name, Key=key)
+                except botocore.exceptions.ClientError as e:
+                    if e.response['Error']['Code'] == "404":
+                        print("The s3 object does not exist.")
+                    raise
+                validators.update(self.__s3_validators(response))
+                return self.__read_s3_csv(s3, bucket_name, key, response["ContentLength"], max_workers, part_size)
+
+            return self.__cached(s3_address, extract)
+
+        objects = self.__list_s3_objects(s3, bucket_name, key)
+        if not objects:
+            raise ValueError(f"no S3 objects match {s3_address}")
+
+        def read_object(s3_object):
+            # the objects are fetched concurrently, each one as a single stream
+            return self.__read_s3_csv(s3, bucket_name, s3_object["Key"], s3_object["Size"], 1, part_size)
+
+        def extract(validators):
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                frames = list(executor.map(read_object, objects))
+            return pd.concat(frames)
+
+        # the ETags of the listed objects validate the cached extract of a prefix or glob
+        listing = "".join(f"{s3_object['Key']}:{s3_object['ETag']}\n" for s3_object in objects)
+        validators = {"etag": sha256(listing.encode()).hexdigest(), "last_modified": None}
+        return self.__cached(
+            s3_address, extract,
+            validate=lambda entry: (entry is not None and entry["etag"] == validators["etag"], validators)
+        )
+
+    def __is_s3_pattern(self, key: str) -> bool:
+        """
+        Private method checking whether an S3 key is a prefix ("" or ending with "/") or a glob.
+        """
+        return key == "" or key.endswith("/") or any(character in key for character in "*?[")
+
+    def __list_s3_objects(self, s3, bucket_name: str, pattern: str) -> list:
+        """
+        Private method listing the objects under an S3 prefix or matching an S3 glob, in key order.
+
+        Returns:
+            list: Dicts with the "Key", "Size" and "ETag" of every object.
+        """
+        glob_start = min((pattern.find(character) for character in "*?[" if character in pattern), default=len(pattern))
+        prefix = pattern[:glob_start]
+        objects = []
+        for page in s3.get_paginator("list_objects_v2").paginate(Bucket=bucket_name, Prefix=prefix):
+            for s3_object in page.get("Contents", []):
+                if s3_object["Key"].endswith("/"):
+                    continue
+                if glob_start < len(pattern) and not fnmatchcase(s3_object["Key"], pattern):
+                    continue
+                objects.append(s3_object)
+        return sorted(objects, key=lambda s3_object: s3_object["Key"])
+
+    def __read_s3_csv(self, s3, bucket_name: str, key: str, size: int, max_workers: int,
+                      part_size: int) -> DataFrame:
+        """
+        Private method parsing an S3 CSV object without writing it to disk.
+
+        Objects up to part_size bytes (or any object when max_workers is 1) are streamed into the
+        parser. Larger ones are fetched with concurrent byte-range GETs into one memory buffer.
+        """
+        if size <= part_size or max_workers == 1:
+            body = s3.get_object(Bucket=bucket_name, Key=key)["Body"]
+            with closing(body):
+                return pd.read_csv(body, index_col=0)
+
+        buffer = BytesIO()
+        buffer.seek(size - 1)
+        buffer.write(b"\0")
+        view = buffer.getbuffer()
+
+        def fetch_part(start):
+            end = min(start + part_size, size) - 1
+            body = s3.get_object(Bucket=bucket_name, Key=key, Range=f"bytes={start}-{end}")["Body"]
+            with closing(body):
+                view[start:end + 1] = body.read()
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(fetch_part, range(0, size, part_size)))
+        view.release()
+        buffer.seek(0)
+        return pd.read_csv(buffer, index_col=0)
 
     def parse_s3_address(self, s3_address):
         """
@@ -154,5 +564,121 @@ class DataExtractor():
         Returns:
             DataFrame: DataFrame containing date events data.
         """
-        date_events_df = pd.read_json(file_address)
-        return date_events_df
+        def extract(validators):
+            if urlparse(file_address).scheme not in ("http", "https"):
+                return pd.read_json(file_address)
+            res = get(file_address)
+            res.raise_for_status()
+            validators.update(self.__response_validators(res.headers))
+            return pd.read_json(StringIO(res.text))
+
+        return self.__cached(file_address, extract)
+
+    def __cached(self, source: str, extract, validate=None, key: str = None) -> DataFrame:
+        """
+        Private method returning the cached extract of a source while it is unchanged, else extracting it.
+
+        Args:
+            source (str): Address of the source.
+            extract (callable): Extracts the DataFrame from the source. Called with the validators
+            stored with the extract, a dict it updates with the "etag" and "last_modified" of the
+            response it downloads.
+            validate (callable): Called with the cache entry (or None); returns a tuple
+            (unchanged: bool, validators: dict). Defaults to revalidating the source address,
+            which is skipped for remote sources without a cache entry: the download reports
+            their validators, so no request is sent ahead of it.
+            key (str): Cache key, defaults to source.
+
+        Returns:
+            DataFrame: The cached or freshly extracted data.
+        """
+        if self.cache is None:
+            return extract({"etag": None, "last_modified": None})
+        key = key or source
+        entry = self.cache.lookup(key)
+        if validate is not None:
+            unchanged, validators = validate(entry)
+        elif entry is None and urlparse(source).scheme in ("http", "https", "s3"):
+            unchanged, validators = False, {"etag": None, "last_modified": None}
+        else:
+            unchanged, validators = self.__validate_source(source, entry)
+        if entry is not None and unchanged:
+            df = self.cache.load(entry)
+            if df is not None:
+                print(f"...{source} unchanged, using cached extract")
+                self.cache.touch(entry)
+                return df
+        df = extract(validators)
+        self.cache.store(key, df, validators)
+        return df
+
+    def __validate_source(self, source: str, entry: dict) -> tuple:
+        """
+        Private method revalidating a cache entry against its source.
+
+        HTTP sources are asked with a conditional HEAD request (If-None-Match, If-Modified-Since),
+        S3 objects with a conditional head_object and local files by size and modification time.
+        Sources that provide no validators are considered unchanged while their entry is valid.
+
+        Args:
+            source (str): Address of the source.
+            entry (dict): Cache entry of the source, or None.
+
+        Returns:
+            tuple: (unchanged: bool, validators: dict of the current "etag" and "last_modified")
+        """
+        cached = {"etag": None, "last_modified": None} if entry is None else {
+            "etag": entry["etag"], "last_modified": entry["last_modified"]
+        }
+        scheme = urlparse(source).scheme
+        if scheme in ("http", "https"):
+            headers = {}
+            if cached["etag"]:
+                headers["If-None-Match"] = cached["etag"]
+            if cached["last_modified"]:
+                headers["If-Modified-Since"] = cached["last_modified"]
+            res = head(source, headers=headers, allow_redirects=True)
+            if res.status_code == 304:
+                return entry is not None, cached
+            if not res.ok:
+                return False, {"etag": None, "last_modified": None}
+            validators = self.__response_validators(res.headers)
+        elif scheme == "s3":
+            s3_address_data = self.parse_s3_address(source)
+            params = {"Bucket": s3_address_data["BUCKET_NAME"], "Key": s3_address_data["KEY"]}
+            if cached["etag"]:
+                params["IfNoneMatch"] = cached["etag"]
+            try:
+                response = boto3.client('s3').head_object(**params)
+            except botocore.exceptions.ClientError as e:
+                if e.response['Error']['Code'] == "304":
+                    return entry is not None, cached
+                return False, {"etag": None, "last_modified": None}
+            validators = self.__s3_validators(response)
+        else:
+            try:
+                stat = os.stat(source)
+            except OSError:
+                return False, {"etag": None, "last_modified": None}
+            validators = {"etag": f"{stat.st_size}-{stat.st_mtime_ns}", "last_modified": None}
+
+        if entry is None:
+            return False, validators
+        if validators["etag"] is None and validators["last_modified"] is None:
+            return True, validators
+        return validators == cached, validators
+
+    def __response_validators(self, headers) -> dict:
+        """
+        Private method returning the "etag" and "last_modified" validators of an HTTP response.
+        """
+        return {"etag": headers.get("ETag"), "last_modified": headers.get("Last-Modified")}
+
+    def __s3_validators(self, response: dict) -> dict:
+        """
+        Private method returning the "etag" and "last_modified" validators of an S3 head_object response.
+        """
+        return {
+            "etag": response["ETag"],
+            "last_modified": format_datetime(response["LastModified"].astimezone(timezone.utc), usegmt=True)
+        }
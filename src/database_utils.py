@@ -1,6 +1,14 @@
-from sqlalchemy import create_engine, URL
+from sqlalchemy import create_engine, text, URL, Engine
+from concurrent.futures import ThreadPoolExecutor, wait
 from pandas import DataFrame
 from decouple import config
+from psycopg2 import sql
+from time import perf_counter
+from io import StringIO
+from typing import Iterable
+from threading import Lock
+from datetime import datetime
+import pandas as pd
 import yaml
 
 
@@ -9,30 +17,144 @@ class DatabaseConnector():
     DatabaseConnector class for managing connections to PostgreSQL databases.
 
     Attributes:
+        COPY_CHUNK_SIZE (int): Number of rows serialised into the in-memory CSV buffer per COPY.
+        MIN_STREAM_ROWS (int): Fewest rows of a partition copied by an upload stream.
+        WATERMARK_TABLE (str): Table holding the high-water mark of incrementally loaded tables.
+        REPLACE_LOCK_ID (int): Advisory lock serialising the in-place replacement of tables with dependents.
+        TABLE_SCHEMAS (dict): Per table, the PostgreSQL type of each column; tables listed here are
+        created with these types by the uploads, other tables with the types pandas infers.
         creds_url (str): File path to the YAML file containing RDS credentials.
         upload_creds_url (str): File path to the YAML file containing local database credentials.
+        pool_size (int): Number of connections kept in each engine's pool.
+        max_overflow (int): Number of connections allowed above pool_size.
+        pool_pre_ping (bool): Whether pooled connections are tested before being handed out.
+        statement_timeout (int): Statement timeout in milliseconds, None for the server default.
+        upload_streams (int): Number of parallel COPY streams shared by the uploads, 1 for a single
+        transaction per upload.
 
     Methods:
         init_db_engine(): Initialize a SQLAlchemy database engine for RDS based on provided credentials.
         init_upload_db_engine(): Initialize a SQLAlchemy database engine for local database based on
         provided credentials.
+        dispose_engines(): Dispose every engine built by this connector.
+        run_sql_file(path: str, engine): Run a SQL script against the database.
+        upsert_chunks_to_db(chunks: Iterable[DataFrame], table_name: str, key_columns: tuple, engine): Insert or
+        update a stream of DataFrame chunks into an existing table.
+        read_watermark(table_name: str, engine) -> dict: Read the high-water mark of a table.
+        write_watermark(table_name: str, watermark: int, engine, full_refreshed_at: datetime): Store the
+        high-water mark of a table.
         upload_to_db(df: DataFrame, table_name: str, engine): Upload a DataFrame to the
         specified database table.
+        upload_chunks_to_db(chunks: Iterable[DataFrame], table_name: str, engine): Upload a stream
+        of DataFrame chunks to the specified database table.
+        upload_tables_to_db(tables: dict, engine): Upload several DataFrames to their tables at the same time.
+        refresh_materialized_view(view_name: str, engine, concurrently: bool) -> bool: Refresh a
+        materialized view if it exists.
     """
-    def __init__(self):
+    DATABASE_TYPE = "postgresql"
+    DBAPI = "psycopg2"
+    COPY_CHUNK_SIZE = 100_000
+    MIN_STREAM_ROWS = 10_000
+    WATERMARK_TABLE = "etl_watermarks"
+    REPLACE_LOCK_ID = 4_145_001
+    TABLE_SCHEMAS = {
+        "orders_table": {
+            "date_uuid": "UUID",
+            "user_uuid": "UUID",
+            "card_number": "VARCHAR(40)",
+            "store_code": "VARCHAR(40)",
+            "product_code": "VARCHAR(40)",
+            "product_quantity": "SMALLINT"
+        },
+        "dim_users": {
+            "first_name": "VARCHAR(255)",
+            "last_name": "VARCHAR(255)",
+            "date_of_birth": "DATE",
+            "company": "TEXT",
+            "email_address": "TEXT",
+            "address": "TEXT",
+            "country": "TEXT",
+            "country_code": "VARCHAR(4)",
+            "phone_number": "TEXT",
+            "join_date": "DATE",
+            "user_uuid": "UUID"
+        },
+        "dim_store_details": {
+            "address": "TEXT",
+            "longitude": "FLOAT8",
+            "locality": "VARCHAR(255)",
+            "store_code": "VARCHAR(40)",
+            "staff_numbers": "SMALLINT",
+            "opening_date": "DATE",
+            "store_type": "VARCHAR(255)",
+            "latitude": "FLOAT8",
+            "country_code": "VARCHAR(4)",
+            "continent": "VARCHAR(255)"
+        },
+        "dim_products": {
+            "product_name": "TEXT",
+            "product_price": "FLOAT8",
+            "weight_kg": "FLOAT8",
+            "weight_class": "VARCHAR(40)",
+            "category": "TEXT",
+            "EAN": "VARCHAR(40)",
+            "date_added": "DATE",
+            "uuid": "UUID",
+            "still_avaliable": "BOOL",
+            "product_code": "VARCHAR(40)"
+        },
+        "dim_date_times": {
+            "timestamp": "TEXT",
+            "month": "VARCHAR(2)",
+            "year": "VARCHAR(4)",
+            "day": "VARCHAR(2)",
+            "time_period": "VARCHAR(40)",
+            "date_uuid": "UUID"
+        },
+        "dim_card_details": {
+            "card_number": "VARCHAR(20)",
+            "expiry_date": "VARCHAR(5)",
+            "card_provider": "VARCHAR(255)",
+            "date_payment_confirmed": "DATE",
+            "card_number_valid": "BOOL"
+        }
+    }
+
+    def __init__(self, pool_size: int = 5, max_overflow: int = 10, pool_pre_ping: bool = True,
+                 statement_timeout: int = None, upload_streams: int = 1):
         self.creds_url = "./db_creds.yaml"
-        self.upload_creds_url =  "./local_db_creds.yaml"
+        self.upload_creds_url = "./local_db_creds.yaml"
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.pool_pre_ping = pool_pre_ping
+        self.statement_timeout = statement_timeout
+        self.upload_streams = upload_streams
+        self.__creds = {}
+        self.__engines = {}
+        self.__streams = None
+        self.__lock = Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.dispose_engines()
 
     def __read_db_creds(self):
         """
         Private method to read RDS credentials from the specified file.
 
+        The credentials are read once and cached for the lifetime of the connector.
+
         Returns:
             dict: Dictionary containing RDS credentials.
         """
+        if self.creds_url in self.__creds:
+            return self.__creds[self.creds_url]
         try:
             with open(self.creds_url, "r") as f:
                 creds = yaml.safe_load(f)
+            self.__creds[self.creds_url] = creds
             return creds
         except FileNotFoundError:
             raise FileNotFoundError("RDS credentials yaml file not found")
@@ -43,12 +165,17 @@ class DatabaseConnector():
         """
         Private method to read local database credentials from the specified file.
 
+        The credentials are read once and cached for the lifetime of the connector.
+
         Returns:
             dict: Dictionary containing local database credentials.
         """
+        if self.upload_creds_url in self.__creds:
+            return self.__creds[self.upload_creds_url]
         try:
             with open(self.upload_creds_url, "r") as f:
                 creds = yaml.safe_load(f)
+            self.__creds[self.upload_creds_url] = creds
             return creds
         except FileNotFoundError:
             raise FileNotFoundError("RDS credentials yaml file not found")
@@ -59,48 +186,101 @@ class DatabaseConnector():
         """
         Initialize a SQLAlchemy database engine for AWS RDS based on provided credentials.
 
+        The engine is built on first use and the same pooled engine is returned on later calls.
+
+        Note: server-side cursors are enabled per connection by the DataExtractor read methods
+        rather than engine-wide; with psycopg2 an engine-wide stream_results would also wrap
+        INSERT statements in a server-side cursor, which Postgres rejects.
+
         Returns:
             Engine: SQLAlchemy engine object.
         """
-        DATABASE_TYPE = "postgresql"
-        DBAPI = "psycopg2"
-        creds = self.__read_db_creds()
-        url_object = URL.create(
-            f"{DATABASE_TYPE}+{DBAPI}",
-            username=creds["RDS_USER"],
-            password=creds["RDS_PASSWORD"],
-            host=creds["RDS_HOST"],
-            database=creds["RDS_DATABASE"],
-            port=creds['RDS_PORT']
-        )
-        engine = create_engine(url_object)
-        return engine
+        def build_url():
+            creds = self.__read_db_creds()
+            return URL.create(
+                f"{self.DATABASE_TYPE}+{self.DBAPI}",
+                username=creds["RDS_USER"],
+                password=creds["RDS_PASSWORD"],
+                host=creds["RDS_HOST"],
+                database=creds["RDS_DATABASE"],
+                port=creds['RDS_PORT']
+            )
+        return self.__get_engine("rds", build_url)
 
     def init_upload_db_engine(self):
         """
         Initialize a SQLAlchemy database engine for the local database based on provided credentials.
 
+        The engine is built on first use and the same pooled engine is returned on later calls.
+
         Returns:
             Engine: SQLAlchemy engine object.
         """
-        DATABASE_TYPE = "postgresql"
-        DBAPI = "psycopg2"
-        creds = self.__read_upload_db_creds()
-        url_object = URL.create(
-            f"{DATABASE_TYPE}+{DBAPI}",
-            username=creds["USER"],
-            password=creds["PASSWORD"],
-            host=creds["HOST"],
-            database=creds["DATABASE"],
-            port=creds['PORT']
-        )
-        engine = create_engine(url_object)
-        return engine
+        def build_url():
+            creds = self.__read_upload_db_creds()
+            return URL.create(
+                f"{self.DATABASE_TYPE}+{self.DBAPI}",
+                username=creds["USER"],
+                password=creds["PASSWORD"],
+                host=creds["HOST"],
+                database=creds["DATABASE"],
+                port=creds['PORT']
+            )
+        return self.__get_engine("local", build_url)
+
+    def __get_engine(self, target: str, build_url) -> Engine:
+        """
+        Private method returning the memoized engine of a target, building it on first use.
+
+        Args:
+            target (str): Name of the target database ("rds" or "local").
+            build_url (callable): Returns the URL of the target database.
+
+        Returns:
+            Engine: SQLAlchemy engine object.
+        """
+        with self.__lock:
+            if target not in self.__engines:
+                connect_args = {}
+                if self.statement_timeout is not None:
+                    connect_args["options"] = f"-c statement_timeout={self.statement_timeout}"
+                # the connections of the upload streams come on top of those of the callers
+                streams = self.upload_streams if self.upload_streams > 1 else 0
+                self.__engines[target] = create_engine(
+                    build_url(),
+                    pool_size=self.pool_size,
+                    max_overflow=self.max_overflow + streams,
+                    pool_pre_ping=self.pool_pre_ping,
+                    connect_args=connect_args
+                )
+            return self.__engines[target]
+
+    def dispose_engines(self) -> None:
+        """
+        Dispose every engine built by this connector, close their pooled connections and stop the upload streams.
+
+        Engines are built again on the next call to 'init_db_engine' or 'init_upload_db_engine'.
+
+        Returns:
+            None
+        """
+        with self.__lock:
+            if self.__streams is not None:
+                self.__streams.shutdown()
+                self.__streams = None
+            for engine in self.__engines.values():
+                engine.dispose()
+            self.__engines.clear()
 
     def upload_to_db(self, df: DataFrame, table_name: str, engine) -> None:
         """
         Upload a DataFrame to the specified database table.
 
+        The rows are streamed into a staging table with COPY FROM STDIN, then the staging
+        table replaces the target table with a rename in the same transaction, so readers
+        keep seeing the previous table until the new one is complete. Tables with dependent
+        objects (foreign keys, views) keep their identity; their rows are replaced instead.
+
         Args:
             df (DataFrame): The DataFrame to be uploaded.
             table_name (str): The name of the database table.
@@ -109,9 +289,539 @@ class DatabaseConnector():
         Returns:
             None
         """
-        df.to_sql(
-            name=table_name,
-            con=engine,
-            if_exists="replace",
-            index=False
+        self.upload_chunks_to_db([df], table_name, engine)
+
+    def upload_chunks_to_db(self, chunks: Iterable[DataFrame], table_name: str, engine) -> None:
+        """
+        Upload a stream of DataFrame chunks to the specified database table.
+
+        The staging table is created from the first chunk, with the column types of
+        TABLE_SCHEMAS for the tables listed there, and every chunk is copied into it as soon
+        as it is produced, so only one chunk needs to be held in memory. The staging table
+        then replaces the target table in the same transaction, as in 'upload_to_db'.
+
+        If the target table references or is referenced by a foreign key, or a view depends on
+        it, dropping it would drop those objects too. Its rows are replaced in place instead,
+        under REPLACE_LOCK_ID so concurrent replacements do not deadlock on the foreign key
+        checks. Tables referenced by foreign keys are emptied with DELETE, and the checks are
+        deferred to the commit, so the foreign keys must be DEFERRABLE (see
+        db/create_db_schema.sql). Other tables are emptied with TRUNCATE.
+
+        With upload_streams above 1, every chunk is split into up to upload_streams row
+        partitions of at least MIN_STREAM_ROWS rows, copied in parallel into an UNLOGGED staging
+        table, each on its own connection (see '__upload_in_streams'). The streams are shared by
+        all the uploads of this connector, so concurrent uploads never run more than
+        upload_streams COPY at once.
+
+        Args:
+            chunks (Iterable[DataFrame]): DataFrames sharing the same columns.
+            table_name (str): The name of the database table.
+            engine (Engine): The SQLAlchemy engine for the database.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If chunks is empty, or a column is missing from the table's TABLE_SCHEMAS
+            entry; the target table is left untouched.
+        """
+        start = perf_counter()
+        if self.upload_streams > 1:
+            number_of_rows = self.__upload_in_streams(chunks, table_name, engine)
+        else:
+            number_of_rows = self.__upload_in_transaction(chunks, table_name, engine)
+
+        elapsed = perf_counter() - start
+        rows_per_second = number_of_rows / elapsed if elapsed else float("inf")
+        print(f"...uploaded {number_of_rows} rows to {table_name} in {elapsed:.2f}s ({rows_per_second:,.0f} rows/s)")
+
+    def upload_tables_to_db(self, tables: dict, engine) -> None:
+        """
+        Upload several DataFrames to their tables at the same time.
+
+        Every table is uploaded by 'upload_to_db' on its own thread and connection; with
+        upload_streams above 1 their partitions share the upload streams.
+
+        Args:
+            tables (dict): The DataFrame to upload to each table, by table name.
+            engine (Engine): The SQLAlchemy engine for the database.
+
+        Returns:
+            None
+
+        Raises:
+            Exception: The error of the first failed upload, once every upload has finished.
+        """
+        with ThreadPoolExecutor(max_workers=max(len(tables), 1), thread_name_prefix="upload") as executor:
+            futures = [executor.submit(self.upload_to_db, df, table_name, engine) for table_name, df in tables.items()]
+        for future in futures:
+            future.result()
+
+    def __upload_in_transaction(self, chunks: Iterable[DataFrame], table_name: str, engine) -> int:
+        """
+        Private method uploading chunks through a staging table created, filled and swapped in one transaction.
+
+        Returns:
+            int: The number of rows uploaded.
+        """
+        staging_table_name = f"{table_name}_staging"
+        number_of_rows = 0
+
+        connection = engine.raw_connection()
+        try:
+            with connection.cursor() as cursor:
+                dtypes = None
+                for chunk in chunks:
+                    if dtypes is None:
+                        dtypes = chunk.dtypes
+                        cursor.execute(sql.SQL("DROP TABLE IF EXISTS {}").format(sql.Identifier(staging_table_name)))
+                        cursor.execute(self.__create_table_statement(chunk, table_name, staging_table_name, engine))
+                    else:
+                        chunk = self.__align_dtypes(chunk, dtypes)
+                    self.__copy_to_table(cursor, chunk, staging_table_name)
+                    number_of_rows += len(chunk)
+                if dtypes is None:
+                    raise ValueError(f"no data to upload to {table_name}")
+                is_referenced, has_dependents = self.__table_dependencies(cursor, table_name)
+                if has_dependents:
+                    self.__replace_rows(cursor, table_name, staging_table_name, dtypes.index, is_referenced)
+                else:
+                    cursor.execute(sql.SQL("DROP TABLE IF EXISTS {}").format(sql.Identifier(table_name)))
+                    cursor.execute(sql.SQL("ALTER TABLE {} RENAME TO {}").format(
+                        sql.Identifier(staging_table_name),
+                        sql.Identifier(table_name)
+                    ))
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            connection.close()
+        return number_of_rows
+
+    def __upload_in_streams(self, chunks: Iterable[DataFrame], table_name: str, engine) -> int:
+        """
+        Private method uploading chunks through an UNLOGGED staging table filled by the upload streams.
+
+        The staging table is committed before the streams copy into it, as every stream commits on
+        its own connection. Once every chunk is copied, the staging table is made LOGGED and swapped
+        in, or its rows replace those of a table with dependents, in one transaction as in
+        '__upload_in_transaction'. On failure the staging table is dropped.
+
+        Returns:
+            int: The number of rows uploaded.
+        """
+        staging_table_name = f"{table_name}_staging"
+        drop_staging_table = sql.SQL("DROP TABLE IF EXISTS {}").format(sql.Identifier(staging_table_name))
+        number_of_rows = 0
+        dtypes = None
+        try:
+            for chunk in chunks:
+                if dtypes is None:
+                    self.__execute(engine, (
+                        drop_staging_table,
+                        self.__create_table_statement(chunk, table_name, staging_table_name, engine, unlogged=True)
+                    ))
+                    # from here on, failures drop the committed staging table
+                    dtypes = chunk.dtypes
+                else:
+                    chunk = self.__align_dtypes(chunk, dtypes)
+                partitions = max(1, min(self.upload_streams, len(chunk) // self.MIN_STREAM_ROWS))
+                partition_size = max(1, -(-len(chunk) // partitions))
+                streams = self.__stream_pool()
+                futures = [
+                    streams.submit(self.__copy_in_stream, chunk.iloc[start:start + partition_size],
+                                   staging_table_name, engine)
+                    for start in range(0, len(chunk), partition_size)
+                ]
+                wait(futures)
+                for future in futures:
+                    future.result()
+                number_of_rows += len(chunk)
+            if dtypes is None:
+                raise ValueError(f"no data to upload to {table_name}")
+
+            connection = engine.raw_connection()
+            try:
+                with connection.cursor() as cursor:
+                    is_referenced, has_dependents = self.__table_dependencies(cursor, table_name)
+                    if has_dependents:
+                        self.__replace_rows(cursor, table_name, staging_table_name, dtypes.index, is_referenced)
+                    else:
+                        cursor.execute(sql.SQL("ALTER TABLE {} SET LOGGED").format(sql.Identifier(staging_table_name)))
+                        cursor.execute(sql.SQL("DROP TABLE IF EXISTS {}").format(sql.Identifier(table_name)))
+                        cursor.execute(sql.SQL("ALTER TABLE {} RENAME TO {}").format(
+                            sql.Identifier(staging_table_name),
+                            sql.Identifier(table_name)
+                        ))
+                connection.commit()
+            except Exception:
+                connection.rollback()
+                raise
+            finally:
+                connection.close()
+        except Exception:
+            if dtypes is not None:
+                self.__execute(engine, (drop_staging_table,))
+            raise
+        return number_of_rows
+
+    def __stream_pool(self) -> ThreadPoolExecutor:
+        """
+        Private method returning the threads of the upload streams, starting them on first use.
+        """
+        with self.__lock:
+            if self.__streams is None:
+                self.__streams = ThreadPoolExecutor(max_workers=self.upload_streams, thread_name_prefix="upload-stream")
+            return self.__streams
+
+    def __copy_in_stream(self, df: DataFrame, table_name: str, engine) -> None:
+        """
+        Private method copying a partition into a table on a connection of its own, committing it.
+        """
+        connection = engine.raw_connection()
+        try:
+            with connection.cursor() as cursor:
+                self.__copy_to_table(cursor, df, table_name)
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            connection.close()
+
+    def __execute(self, engine, statements: tuple) -> None:
+        """
+        Private method running statements in a transaction of their own.
+        """
+        connection = engine.raw_connection()
+        try:
+            with connection.cursor() as cursor:
+                for statement in statements:
+                    cursor.execute(statement)
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            connection.close()
+
+    def refresh_materialized_view(self, view_name: str, engine, concurrently: bool = True) -> bool:
+        """
+        Refresh a materialized view, if it exists.
+
+        A concurrent refresh lets queries keep reading the view while it is rebuilt; it needs
+        a unique index on the view.
+
+        Args:
+            view_name (str): The name of the materialized view.
+            engine (Engine): The SQLAlchemy engine for the database.
+            concurrently (bool): Refresh with REFRESH MATERIALIZED VIEW CONCURRENTLY.
+
+        Returns:
+            bool: True if the view was refreshed, False if it does not exist.
+        """
+        start = perf_counter()
+        connection = engine.raw_connection()
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1 FROM pg_matviews WHERE matviewname = %s", (view_name,))
+                if cursor.fetchone() is None:
+                    print(f"...{view_name} does not exist, skipping its refresh")
+                    return False
+                refresh = "REFRESH MATERIALIZED VIEW {} {}"
+                cursor.execute(sql.SQL(refresh).format(
+                    sql.SQL("CONCURRENTLY" if concurrently else ""), sql.Identifier(view_name)
+                ))
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            connection.close()
+
+        print(f"...refreshed {view_name} in {perf_counter() - start:.2f}s")
+        return True
+
+    def upsert_chunks_to_db(self, chunks: Iterable[DataFrame], table_name: str, key_columns: tuple, engine) -> None:
+        """
+        Insert or update a stream of DataFrame chunks into an existing database table.
+
+        Every chunk is copied into a temporary table shaped like the target table and merged
+        with INSERT ... ON CONFLICT (key_columns) DO UPDATE, all in one transaction. A unique
+        index on key_columns is created if the target table does not have one yet.
+
+        Dimension tables may be reloaded in place meanwhile (see 'upload_chunks_to_db'). A foreign
+        key check on a row deleted by such a reload waits for it, then fails, as it does not see
+        the row inserted again. The checks are therefore deferred to the commit, which takes
+        REPLACE_LOCK_ID first, so they run once any reload has committed and before a new one starts.
+
+        Args:
+            chunks (Iterable[DataFrame]): DataFrames with a subset of the target table's columns.
+            table_name (str): The name of the existing database table.
+            key_columns (tuple): Columns identifying a row of the table.
+            engine (Engine): The SQLAlchemy engine for the database.
+
+        Returns:
+            None
+        """
+        start = perf_counter()
+        key_columns = list(key_columns)
+        upsert_table_name = f"{table_name}_upsert"
+        index_name = f"{table_name}_{'_'.join(key_columns)}_key"
+        keys = sql.SQL(", ").join(sql.Identifier(column) for column in key_columns)
+        number_of_rows = 0
+
+        connection = engine.raw_connection()
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SET CONSTRAINTS ALL DEFERRED")
+                cursor.execute(sql.SQL("CREATE UNIQUE INDEX IF NOT EXISTS {} ON {} ({})").format(
+                    sql.Identifier(index_name), sql.Identifier(table_name), keys
+                ))
+                cursor.execute(sql.SQL("CREATE TEMP TABLE {} (LIKE {} INCLUDING DEFAULTS) ON COMMIT DROP").format(
+                    sql.Identifier(upsert_table_name), sql.Identifier(table_name)
+                ))
+                for chunk in chunks:
+                    chunk = chunk.drop_duplicates(subset=key_columns, keep="last")
+                    cursor.execute(sql.SQL("TRUNCATE {}").format(sql.Identifier(upsert_table_name)))
+                    self.__copy_to_table(cursor, chunk, upsert_table_name)
+                    cursor.execute(self.__upsert_statement(table_name, upsert_table_name, chunk.columns, key_columns))
+                    number_of_rows += len(chunk)
+                cursor.execute("SELECT pg_advisory_xact_lock(%s)", (self.REPLACE_LOCK_ID,))
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            connection.close()
+
+        elapsed = perf_counter() - start
+        rows_per_second = number_of_rows / elapsed if elapsed else float("inf")
+        print(f"...upserted {number_of_rows} rows into {table_name} in {elapsed:.2f}s ({rows_per_second:,.0f} rows/s)")
+
+    def __upsert_statement(self, table_name: str, source_table_name: str, columns,
+                           key_columns: list) -> sql.Composed:
+        """
+        Private method building the INSERT ... ON CONFLICT statement of 'upsert_chunks_to_db'.
+
+        Returns:
+            Composed: Statement merging source_table_name into table_name.
+        """
+        column_list = sql.SQL(", ").join(sql.Identifier(str(column)) for column in columns)
+        keys = sql.SQL(", ").join(sql.Identifier(column) for column in key_columns)
+        updates = [
+            sql.SQL("{} = EXCLUDED.{}").format(sql.Identifier(str(column)), sql.Identifier(str(column)))
+            for column in columns if column not in key_columns
+        ]
+        if updates:
+            on_conflict = sql.SQL("DO UPDATE SET {}").format(sql.SQL(", ").join(updates))
+        else:
+            on_conflict = sql.SQL("DO NOTHING")
+        return sql.SQL("INSERT INTO {} ({}) SELECT {} FROM {} ON CONFLICT ({}) {}").format(
+            sql.Identifier(table_name), column_list, column_list, sql.Identifier(source_table_name), keys, on_conflict
+        )
+
+    def read_watermark(self, table_name: str, engine) -> dict:
+        """
+        Read the high-water mark stored for a table in WATERMARK_TABLE.
+
+        Args:
+            table_name (str): The name of the loaded table.
+            engine (Engine): The SQLAlchemy engine for the database.
+
+        Returns:
+            dict: {"watermark": int, "full_refreshed_at": datetime}, or None if the table has none yet.
+        """
+        with engine.begin() as connection:
+            self.__create_watermark_table(connection)
+            row = connection.execute(
+                text(
+                    f'SELECT watermark, full_refreshed_at FROM "{self.WATERMARK_TABLE}" '
+                    "WHERE table_name = :table_name"
+                ),
+                {"table_name": table_name}
+            ).first()
+        if row is None:
+            return None
+        return {"watermark": row.watermark, "full_refreshed_at": row.full_refreshed_at}
+
+    def write_watermark(self, table_name: str, watermark: int, engine, full_refreshed_at: datetime = None) -> None:
+        """
+        Store the high-water mark of a table in WATERMARK_TABLE.
+
+        Args:
+            table_name (str): The name of the loaded table.
+            watermark (int): Highest watermark column value loaded so far.
+            engine (Engine): The SQLAlchemy engine for the database.
+            full_refreshed_at (datetime): Time of a full refresh; None keeps the stored one.
+
+        Returns:
+            None
+        """
+        with engine.begin() as connection:
+            self.__create_watermark_table(connection)
+            connection.execute(
+                text(
+                    f'INSERT INTO "{self.WATERMARK_TABLE}" (table_name, watermark, full_refreshed_at, updated_at) '
+                    "VALUES (:table_name, :watermark, :full_refreshed_at, now()) "
+                    "ON CONFLICT (table_name) DO UPDATE SET "
+                    "watermark = EXCLUDED.watermark, "
+                    "full_refreshed_at = COALESCE("
+                    f'EXCLUDED.full_refreshed_at, "{self.WATERMARK_TABLE}".full_refreshed_at), '
+                    "updated_at = EXCLUDED.updated_at"
+                ),
+                {"table_name": table_name, "watermark": int(watermark), "full_refreshed_at": full_refreshed_at}
+            )
+
+    def __create_watermark_table(self, connection) -> None:
+        """
+        Private method creating WATERMARK_TABLE if it does not exist.
+        """
+        connection.execute(text(
+            f'CREATE TABLE IF NOT EXISTS "{self.WATERMARK_TABLE}" ('
+            "table_name VARCHAR(255) PRIMARY KEY, "
+            "watermark BIGINT NOT NULL, "
+            "full_refreshed_at TIMESTAMP WITH TIME ZONE, "
+            "updated_at TIMESTAMP WITH TIME ZONE NOT NULL)"
+        ))
+
+    def run_sql_file(self, path: str, engine) -> None:
+        """
+        Run a SQL script against the database in a single transaction.
+
+        psql meta-commands (lines starting with a backslash, e.g. "\\c sales_data") are
+        skipped; the engine already points at the target database.
+
+        Args:
+            path (str): File path to the SQL script.
+            engine (Engine): The SQLAlchemy engine for the database.
+
+        Returns:
+            None
+        """
+        with open(path, "r") as f:
+            lines = [line for line in f if not line.lstrip().startswith("\\")]
+        script = "".join(lines)
+
+        connection = engine.raw_connection()
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(script)
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            connection.close()
+
+    def __table_dependencies(self, cursor, table_name: str) -> tuple:
+        """
+        Private method finding the objects that would be dropped with a table.
+
+        Returns:
+            tuple: (is_referenced, has_dependents); is_referenced is True if a foreign key references
+            the table, has_dependents if a foreign key references it or is declared on it, or a
+            view depends on it.
+        """
+        cursor.execute(
+            "SELECT "
+            "EXISTS (SELECT 1 FROM pg_constraint WHERE contype = 'f' AND confrelid = to_regclass(%(table)s)), "
+            "EXISTS (SELECT 1 FROM pg_constraint WHERE contype = 'f' AND conrelid = to_regclass(%(table)s)), "
+            "EXISTS (SELECT 1 FROM pg_depend JOIN pg_rewrite ON pg_rewrite.oid = pg_depend.objid "
+            "WHERE pg_depend.classid = 'pg_rewrite'::regclass AND pg_depend.refobjid = to_regclass(%(table)s) "
+            "AND pg_rewrite.ev_class <> pg_depend.refobjid)",
+            {"table": sql.Identifier(table_name).as_string(cursor)}
+        )
+        is_referenced, has_foreign_keys, has_views = cursor.fetchone()
+        return is_referenced, is_referenced or has_foreign_keys or has_views
+
+    def __replace_rows(self, cursor, table_name: str, staging_table_name: str, columns, is_referenced: bool) -> None:
+        """
+        Private method replacing the rows of a table with those of its staging table, then dropping the staging table.
+        """
+        cursor.execute("SELECT pg_advisory_xact_lock(%s)", (self.REPLACE_LOCK_ID,))
+        if is_referenced:
+            cursor.execute("SET CONSTRAINTS ALL DEFERRED")
+            cursor.execute(sql.SQL("DELETE FROM {}").format(sql.Identifier(table_name)))
+        else:
+            cursor.execute(sql.SQL("TRUNCATE {}").format(sql.Identifier(table_name)))
+        column_list = sql.SQL(", ").join(sql.Identifier(str(column)) for column in columns)
+        cursor.execute(sql.SQL("INSERT INTO {} ({}) SELECT {} FROM {}").format(
+            sql.Identifier(table_name), column_list, column_list, sql.Identifier(staging_table_name)
+        ))
+        cursor.execute(sql.SQL("DROP TABLE {}").format(sql.Identifier(staging_table_name)))
+
+    def __create_table_statement(self, df: DataFrame, table_name: str, staging_table_name: str, engine,
+                                 unlogged: bool = False):
+        """
+        Private method building the CREATE TABLE statement of the staging table of an upload.
+
+        Args:
+            df (DataFrame): The first chunk of the upload.
+            table_name (str): The name of the target table, looked up in TABLE_SCHEMAS.
+            staging_table_name (str): The name of the table to create.
+            engine (Engine): The SQLAlchemy engine for the database.
+            unlogged (bool): Whether to create an UNLOGGED table, written without WAL.
+
+        Returns:
+            Composed | str: The statement; the types pandas infers if table_name has no schema.
+        """
+        create_table = "CREATE UNLOGGED TABLE" if unlogged else "CREATE TABLE"
+        schema = self.TABLE_SCHEMAS.get(table_name)
+        if schema is None:
+            statement = pd.io.sql.get_schema(df, staging_table_name, con=engine)
+            return statement.replace("CREATE TABLE", create_table, 1)
+        missing_columns = [str(column) for column in df.columns if column not in schema]
+        if missing_columns:
+            raise ValueError(f"columns {', '.join(missing_columns)} of {table_name} are not in TABLE_SCHEMAS")
+        columns = sql.SQL(", ").join(
+            sql.SQL("{} {}").format(sql.Identifier(str(column)), sql.SQL(schema[column])) for column in df.columns
+        )
+        return sql.SQL(create_table + " {} ({})").format(sql.Identifier(staging_table_name), columns)
+
+    def __align_dtypes(self, chunk: DataFrame, dtypes) -> DataFrame:
+        """
+        Private method to keep integer columns integer when a later chunk contains NULLs.
+
+        pandas reads an integer column holding NULLs as float64, which would be written as
+        "1.0" and rejected by the integer column created from the first chunk.
+
+        Args:
+            chunk (DataFrame): The chunk to be aligned.
+            dtypes (Series): The dtypes of the first chunk.
+
+        Returns:
+            DataFrame: The chunk with such columns converted to the nullable Int64 dtype.
+        """
+        columns = [
+            column for column in chunk.columns
+            if column in dtypes
+            and pd.api.types.is_integer_dtype(dtypes[column])
+            and pd.api.types.is_float_dtype(chunk[column])
+        ]
+        if not columns:
+            return chunk
+        return chunk.astype({column: "Int64" for column in columns})
+
+    def __copy_to_table(self, cursor, df: DataFrame, table_name: str) -> None:
+        """
+        Private method to stream a DataFrame into an existing table with COPY FROM STDIN.
+
+        The DataFrame is serialised to an in-memory CSV buffer COPY_CHUNK_SIZE rows at a
+        time, so no temporary file is written and the buffer stays small.
+
+        Args:
+            cursor: psycopg2 cursor of the open transaction.
+            df (DataFrame): The DataFrame to be copied.
+            table_name (str): The name of the database table.
+        """
+        copy_statement = sql.SQL("COPY {} ({}) FROM STDIN WITH (FORMAT csv)").format(
+            sql.Identifier(table_name),
+            sql.SQL(", ").join(sql.Identifier(str(column)) for column in df.columns)
         )
+        for chunk_start in range(0, len(df), self.COPY_CHUNK_SIZE):
+            buffer = StringIO()
+            df.iloc[chunk_start:chunk_start + self.COPY_CHUNK_SIZE].to_csv(buffer, index=False, header=False)
+            buffer.seek(0)
+            cursor.copy_expert(copy_statement, buffer)
@@ -0,0 +1,369 @@
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait
+from functools import partial
+from multiprocessing import get_context
+from tempfile import gettempdir, mkstemp
+from threading import Lock
+from pandas import DataFrame
+import os
+import numpy as np
+import pyarrow as pa
+
+
+class SharedFrame():
+    """
+    Handle of a DataFrame written to a memory-mapped Arrow IPC file, handing it to another process.
+
+    The handle is pickled instead of the DataFrame and 'load' builds the DataFrame on the mapped
+    buffers of the file. Columns with a NumPy dtype (numbers, booleans, dates) are stored as their
+    raw bytes and loaded as read-only zero-copy views. Extension columns (categories, nullable
+    integers, Arrow strings) are loaded from their Arrow arrays. Object columns of strings are
+    stored as Arrow strings and loaded as Python strings, their missing values being NaN or None
+    as before. Columns Arrow cannot represent, such as object columns mixing strings and numbers,
+    and the index travel pickled with the handle (a RangeIndex takes a few bytes).
+
+    Files are written to /dev/shm, which lives in memory, where it exists. Views stay valid after
+    'unlink' as long as the DataFrame references them.
+
+    Attributes:
+        HANDOFF_DIR (str): Default directory of the files.
+        path (str): Path of the Arrow IPC file.
+
+    Methods:
+        load() -> DataFrame
+        unlink() -> None
+    """
+    HANDOFF_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else gettempdir()
+
+    def __init__(self, df: DataFrame, handoff_dir: str = None) -> None:
+        self.__columns = df.columns
+        self.__index = df.index
+        self.__dtypes = list(df.dtypes)
+        self.__encodings = []
+        self.__pickled = {}
+        arrays, names = [], []
+        for position, (_, values) in enumerate(df.items()):
+            encoding, array = self.__encode(values)
+            self.__encodings.append(encoding)
+            if encoding == "pickle":
+                self.__pickled[position] = values.to_numpy() if isinstance(values.dtype, np.dtype) else values.array
+            else:
+                arrays.append(array)
+                names.append(str(position))
+        batch = pa.RecordBatch.from_arrays(arrays, names=names)
+        descriptor, self.path = mkstemp(prefix="frame-", suffix=".arrow", dir=handoff_dir or self.HANDOFF_DIR)
+        os.close(descriptor)
+        try:
+            with pa.OSFile(self.path, "wb") as sink, pa.ipc.new_file(sink, batch.schema) as writer:
+                writer.write_batch(batch)
+        except BaseException:
+            self.unlink()
+            raise
+
+    def load(self) -> DataFrame:
+        """
+        Build the DataFrame on the buffers of the file.
+
+        Returns:
+            DataFrame: The shared DataFrame; its NumPy columns are read-only.
+        """
+        with pa.memory_map(self.path) as source:
+            batch = pa.ipc.open_file(source).get_batch(0)
+        columns = {}
+        for position, (dtype, encoding) in enumerate(zip(self.__dtypes, self.__encodings)):
+            if encoding == "pickle":
+                columns[position] = builtin_object_view(self.__pickled[position])
+                continue
+            array = batch.column(str(position))
+            if encoding == "view":
+                values = array.to_numpy().view(dtype)
+            elif encoding in ("text", "text-nan"):
+                values = array.to_numpy(zero_copy_only=False)
+                if encoding == "text-nan" and array.null_count:
+                    values[array.is_null().to_numpy(zero_copy_only=False)] = np.nan
+            elif hasattr(dtype, "__from_arrow__"):
+                values = dtype.__from_arrow__(array)
+            else:
+                values = array.to_pandas().astype(dtype, copy=False).array
+            columns[position] = values
+        df = DataFrame(columns, index=self.__index, copy=False)
+        df.columns = self.__columns
+        return df
+
+    def unlink(self) -> None:
+        """
+        Remove the file; DataFrames already loaded keep their buffers.
+        """
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def __encode(values) -> tuple:
+        """
+        Choose how a column is stored: its encoding and its Arrow array, None when it is pickled.
+        """
+        dtype = values.dtype
+        if isinstance(dtype, np.dtype) and dtype.kind in "biufmM":
+            data = np.ascontiguousarray(values.to_numpy())
+            return "view", pa.array(data.view(f"u{data.itemsize}"))
+        try:
+            if dtype == object:
+                data = values.to_numpy()
+                array = pa.array(data, from_pandas=True)
+                if not pa.types.is_string(array.type):
+                    return "pickle", None
+                nulls = data[array.is_null().to_numpy(zero_copy_only=False)] if array.null_count else ()
+                null_types = {type(value) for value in nulls}
+                if all(issubclass(null_type, float) for null_type in null_types):
+                    return "text-nan", array
+                return ("text", array) if null_types == {type(None)} else ("pickle", None)
+            array = pa.array(values)
+        except (pa.ArrowException, TypeError, ValueError):
+            return "pickle", None
+        if isinstance(array, pa.ChunkedArray):
+            array = array.combine_chunks()
+        return "arrow", array
+
+
+def builtin_object_view(values):
+    """
+    View an unpickled object array with the builtin object dtype.
+
+    Unpickled object arrays carry their own copy of the object dtype, which makes pandas write
+    the result of astype(str) into them, so cleaning a partition handed to a worker turned its
+    missing values into the text "nan". Views with the builtin dtype do not.
+
+    Args:
+        values: NumPy array or extension array, returned as is unless it holds objects.
+
+    Returns:
+        The values, as a view with the builtin dtype if they are an object array.
+    """
+    if isinstance(values, np.ndarray) and values.dtype == object:
+        return values.view(object)
+    return values
+
+
+def builtin_object_frames(value):
+    """
+    Replace a DataFrame, or the DataFrames of a tuple, by one whose object columns are builtin_object_view views.
+    """
+    if isinstance(value, DataFrame):
+        df = DataFrame({
+            position: builtin_object_view(values.to_numpy()) if values.dtype == object else values
+            for position, (_, values) in enumerate(value.items())
+        }, index=value.index, copy=False)
+        df.columns = value.columns
+        return df
+    if type(value) is tuple:
+        return tuple(builtin_object_frames(item) for item in value)
+    return value
+
+
+def call_with_builtin_objects(func, *args):
+    """
+    Call func in a worker process on pickled arguments, viewing their object columns with the builtin dtype.
+    """
+    return func(*[builtin_object_frames(arg) for arg in args])
+
+
+def share_frames(value, shared: list):
+    """
+    Replace a DataFrame, or the DataFrames of a tuple, by SharedFrame handles.
+
+    Args:
+        value: DataFrame, tuple or any other value, returned as is.
+        shared (list): List the new handles are appended to, for the caller to unlink them.
+
+    Returns:
+        The value with SharedFrame handles in place of its DataFrames.
+    """
+    if isinstance(value, DataFrame):
+        shared.append(SharedFrame(value))
+        return shared[-1]
+    if type(value) is tuple:
+        return tuple(share_frames(item, shared) for item in value)
+    return value
+
+
+def load_frames(value):
+    """
+    Replace a SharedFrame handle, or the handles of a tuple, by their DataFrames.
+    """
+    if isinstance(value, SharedFrame):
+        return value.load()
+    if type(value) is tuple:
+        return tuple(load_frames(item) for item in value)
+    return value
+
+
+def call_with_shared_frames(func, *args) -> tuple:
+    """
+    Call func in a worker process on the DataFrames of SharedFrame arguments, sharing the DataFrames it returns.
+
+    Returns:
+        tuple: (result of func with SharedFrame handles, list of these handles)
+    """
+    shared = []
+    try:
+        return share_frames(func(*[load_frames(arg) for arg in args]), shared), shared
+    except BaseException:
+        for frame in shared:
+            frame.unlink()
+        raise
+
+
+class SerialBackend():
+    """
+    Execution backend running every call in this process, one after the other.
+
+    Methods:
+        map(func, *iterables) -> list
+        close()
+    """
+    def __init__(self, max_workers: int = 1) -> None:
+        self.max_workers = 1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def map(self, func, *iterables) -> list:
+        """
+        Call func with the items of iterables at the same position.
+
+        Args:
+            func (callable): Function to call.
+            *iterables: One iterable per argument of func.
+
+        Returns:
+            list: Results of func, in the order of iterables.
+        """
+        return list(map(func, *iterables))
+
+    def close(self) -> None:
+        """
+        Release the workers of the backend; the next map starts new ones.
+        """
+
+
+class ThreadBackend(SerialBackend):
+    """
+    Execution backend running calls on a pool of threads of this process.
+
+    Only the parts of the calls releasing the GIL (NumPy and Arrow kernels) run in parallel.
+    The pool is started by the first map and shared by concurrent callers.
+
+    Attributes:
+        max_workers (int): Number of threads.
+    """
+    def __init__(self, max_workers: int = None) -> None:
+        self.max_workers = max_workers or os.cpu_count()
+        self.__executor = None
+        self.__lock = Lock()
+
+    def map(self, func, *iterables) -> list:
+        return list(self.executor().map(func, *iterables))
+
+    def executor(self):
+        """
+        Return the executor of the backend, starting it on first use.
+        """
+        with self.__lock:
+            if self.__executor is None:
+                self.__executor = self.start()
+            return self.__executor
+
+    def start(self):
+        """
+        Start the executor of the backend.
+        """
+        return ThreadPoolExecutor(max_workers=self.max_workers)
+
+    def close(self) -> None:
+        with self.__lock:
+            if self.__executor is not None:
+                self.__executor.shutdown()
+                self.__executor = None
+
+
+class ProcessBackend(ThreadBackend):
+    """
+    Execution backend running calls on a pool of worker processes.
+
+    func and the arguments are pickled to the workers and the results pickled back, so they
+    must be picklable (module level functions, not lambdas). With shared_memory, DataFrame
+    arguments and returned DataFrames (alone or in a tuple) are handed over as SharedFrame
+    files instead, which workers and this process map without copying their NumPy columns.
+    Without it, the object columns of pickled DataFrame arguments are read through builtin_object_view.
+    Workers are spawned rather than forked, as the pipeline already runs threads.
+
+    Attributes:
+        max_workers (int): Number of worker processes.
+        shared_memory (bool): Whether DataFrames are handed over as SharedFrame files.
+    """
+    def __init__(self, max_workers: int = None, shared_memory: bool = True) -> None:
+        super().__init__(max_workers)
+        self.shared_memory = shared_memory
+
+    def map(self, func, *iterables) -> list:
+        if not self.shared_memory:
+            return super().map(partial(call_with_builtin_objects, func), *iterables)
+        shared = []
+        try:
+            arguments = [[share_frames(item, shared) for item in iterable] for iterable in iterables]
+            executor = self.executor()
+            futures = [executor.submit(call_with_shared_frames, func, *args) for args in zip(*arguments)]
+            wait(futures)
+        finally:
+            for frame in shared:
+                frame.unlink()
+        try:
+            return [load_frames(future.result()[0]) for future in futures]
+        finally:
+            # the files of every result, also those after a failed call
+            for future in futures:
+                if future.exception() is None:
+                    for frame in future.result()[1]:
+                        frame.unlink()
+
+    def start(self):
+        return ProcessPoolExecutor(max_workers=self.max_workers, mp_context=get_context("spawn"))
+
+
+class DaskBackend(ThreadBackend):
+    """
+    Execution backend running calls on a local Dask cluster (dask.distributed LocalCluster).
+
+    The cluster runs max_workers single-threaded worker processes on this machine, started by
+    the first map; no scheduler or worker has to run beforehand. Needs the optional
+    'dask[distributed]' package.
+
+    Attributes:
+        max_workers (int): Number of Dask worker processes.
+    """
+    def map(self, func, *iterables) -> list:
+        client = self.executor()
+        arguments = [list(iterable) for iterable in iterables]
+        return client.gather(client.map(partial(call_with_builtin_objects, func), *arguments, pure=False))
+
+    def start(self):
+        try:
+            from dask.distributed import Client, LocalCluster
+        except ImportError as error:
+            raise ImportError("the dask backend needs dask.distributed: pip install 'dask[distributed]'") from error
+        cluster = LocalCluster(n_workers=self.max_workers, threads_per_worker=1, processes=True)
+        # Client.shutdown, called by close, also stops the cluster
+        return Client(cluster)
+
+
+# backend name -> class, as configured by CLEANING_BACKEND
+BACKENDS = {
+    "serial": SerialBackend,
+    "threads": ThreadBackend,
+    "processes": ProcessBackend,
+    "dask": DaskBackend
+}
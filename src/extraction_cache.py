@@ -0,0 +1,245 @@
+from datetime import datetime, timedelta, timezone
+from hashlib import sha256
+from io import BytesIO
+from threading import Lock
+from tempfile import NamedTemporaryFile
+from pandas import DataFrame
+import json
+import os
+import pandas as pd
+import pyarrow as pa
+
+
+class ExtractionCache():
+    """
+    ExtractionCache class keeping extracted DataFrames on disk between runs.
+
+    Every source (URL, S3 address or file path) has a small JSON entry holding the validators
+    the data was extracted with (ETag, Last-Modified) and the name of its Parquet object.
+    Objects are named after the SHA-256 of their content, so sources holding identical data
+    share one file. Entries not validated within ttl are treated as missing; 'evict' removes
+    them and then drops the least recently used entries until the objects fit in max_bytes.
+
+    Attributes:
+        CACHE_DIR (str): Default cache directory.
+        TTL (timedelta): Default time an entry stays valid after its last validation.
+        MAX_BYTES (int): Default maximum total size of the cached objects.
+        cache_dir (str): Cache directory.
+        ttl (timedelta): Time an entry stays valid after its last validation.
+        max_bytes (int): Maximum total size of the cached objects.
+
+    Methods:
+        lookup(source: str, now: datetime) -> dict
+        load(entry: dict) -> DataFrame
+        store(source: str, df: DataFrame, validators: dict, now: datetime, evict: bool) -> dict
+        touch(entry: dict, now: datetime) -> None
+        evict(now: datetime) -> list
+    """
+    CACHE_DIR = "./.cache/extraction"
+    TTL = timedelta(days=1)
+    MAX_BYTES = 512 * 1024 * 1024
+
+    def __init__(self, cache_dir: str = None, ttl: timedelta = None, max_bytes: int = None) -> None:
+        self.cache_dir = cache_dir or self.CACHE_DIR
+        self.ttl = ttl or self.TTL
+        self.max_bytes = self.MAX_BYTES if max_bytes is None else max_bytes
+        self.__entries_dir = os.path.join(self.cache_dir, "entries")
+        self.__objects_dir = os.path.join(self.cache_dir, "objects")
+        os.makedirs(self.__entries_dir, exist_ok=True)
+        os.makedirs(self.__objects_dir, exist_ok=True)
+        self.__lock = Lock()
+
+    def lookup(self, source: str, now: datetime = None) -> dict:
+        """
+        Look up the cache entry of a source.
+
+        Args:
+            source (str): Address the data was extracted from.
+            now (datetime): Current time (timezone aware), defaults to the current UTC time.
+
+        Returns:
+            dict: The entry, or None if the source is not cached or its entry has expired.
+        """
+        now = now or datetime.now(timezone.utc)
+        entry = self.__read_entry(self.__entry_path(source))
+        if entry is None or self.__is_expired(entry, now):
+            return None
+        return entry
+
+    def load(self, entry: dict) -> DataFrame:
+        """
+        Load the DataFrame of a cache entry.
+
+        Args:
+            entry (dict): Entry as returned by 'lookup'.
+
+        Returns:
+            DataFrame: The cached DataFrame, or None if its object has been evicted meanwhile.
+        """
+        try:
+            return pd.read_parquet(self.__object_path(entry["object"]))
+        except FileNotFoundError:
+            return None
+
+    def store(self, source: str, df: DataFrame, validators: dict, now: datetime = None, evict: bool = True) -> dict:
+        """
+        Cache the DataFrame extracted from a source, then evict entries over the ttl or size limit.
+
+        Object columns holding values of mixed types are stored as strings.
+
+        Args:
+            source (str): Address the data was extracted from.
+            df (DataFrame): Extracted data.
+            validators (dict): "etag" and "last_modified" of the source, either may be None.
+            now (datetime): Current time (timezone aware), defaults to the current UTC time.
+            evict (bool): Run 'evict' after storing. Callers storing many entries at once
+            may pass False and evict once at the end.
+
+        Returns:
+            dict: The new entry.
+        """
+        now = now or datetime.now(timezone.utc)
+        content = self.__to_parquet(df)
+        object_name = sha256(content).hexdigest() + ".parquet"
+        entry = {
+            "source": source,
+            "object": object_name,
+            "size": len(content),
+            "rows": len(df),
+            "etag": validators.get("etag"),
+            "last_modified": validators.get("last_modified"),
+            "validated_at": now.isoformat(),
+            "accessed_at": now.isoformat()
+        }
+        with self.__lock:
+            if not os.path.exists(self.__object_path(object_name)):
+                self.__write_atomically(self.__object_path(object_name), content)
+            self.__write_entry(entry)
+        if evict:
+            self.evict(now)
+        return entry
+
+    def touch(self, entry: dict, now: datetime = None) -> None:
+        """
+        Mark a cache entry as validated and used, e.g. after a 304 Not Modified.
+
+        Args:
+            entry (dict): Entry as returned by 'lookup'.
+            now (datetime): Current time (timezone aware), defaults to the current UTC time.
+
+        Returns:
+            None
+        """
+        now = now or datetime.now(timezone.utc)
+        entry = dict(entry, validated_at=now.isoformat(), accessed_at=now.isoformat())
+        with self.__lock:
+            self.__write_entry(entry)
+
+    def evict(self, now: datetime = None) -> list:
+        """
+        Remove expired entries, then the least recently used ones until the objects fit in max_bytes.
+
+        Objects no longer referenced by any entry are deleted.
+
+        Args:
+            now (datetime): Current time (timezone aware), defaults to the current UTC time.
+
+        Returns:
+            list: Sources whose entries were removed.
+        """
+        now = now or datetime.now(timezone.utc)
+        evicted = []
+        with self.__lock:
+            entries = []
+            for file_name in os.listdir(self.__entries_dir):
+                entry = self.__read_entry(os.path.join(self.__entries_dir, file_name))
+                if entry is None:
+                    continue
+                if self.__is_expired(entry, now):
+                    self.__remove_entry(entry)
+                    evicted.append(entry["source"])
+                else:
+                    entries.append(entry)
+
+            entries.sort(key=lambda entry: entry["accessed_at"])
+            sizes = {entry["object"]: entry["size"] for entry in entries}
+            total_size = sum(sizes.values())
+            while entries and total_size > self.max_bytes:
+                entry = entries.pop(0)
+                self.__remove_entry(entry)
+                evicted.append(entry["source"])
+                if all(other["object"] != entry["object"] for other in entries):
+                    total_size -= sizes[entry["object"]]
+
+            referenced = {entry["object"] for entry in entries}
+            for object_name in os.listdir(self.__objects_dir):
+                if object_name.endswith(".parquet") and object_name not in referenced:
+                    os.remove(self.__object_path(object_name))
+        return evicted
+
+    def __to_parquet(self, df: DataFrame) -> bytes:
+        """
+        Private method serialising a DataFrame to Parquet, storing mixed-type object columns as strings.
+        """
+        df = df.copy(deep=False)
+        for column_name in df.columns[df.dtypes == object]:
+            try:
+                pa.array(df[column_name], from_pandas=True)
+            except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+                values = df[column_name]
+                df[column_name] = values.where(values.isna(), values.astype(str))
+        buffer = BytesIO()
+        df.to_parquet(buffer)
+        return buffer.getvalue()
+
+    def __is_expired(self, entry: dict, now: datetime) -> bool:
+        """
+        Private method checking whether an entry was last validated more than ttl ago.
+        """
+        return now - datetime.fromisoformat(entry["validated_at"]) >= self.ttl
+
+    def __entry_path(self, source: str) -> str:
+        """
+        Private method returning the path of the entry of a source.
+        """
+        return os.path.join(self.__entries_dir, sha256(source.encode()).hexdigest() + ".json")
+
+    def __object_path(self, object_name: str) -> str:
+        """
+        Private method returning the path of a cached object.
+        """
+        return os.path.join(self.__objects_dir, object_name)
+
+    def __read_entry(self, path: str) -> dict:
+        """
+        Private method reading an entry file, returning None if it is missing or unreadable.
+        """
+        try:
+            with open(path) as file:
+                return json.load(file)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def __write_entry(self, entry: dict) -> None:
+        """
+        Private method writing the entry file of a source.
+        """
+        content = json.dumps(entry, indent=2).encode()
+        self.__write_atomically(self.__entry_path(entry["source"]), content)
+
+    def __remove_entry(self, entry: dict) -> None:
+        """
+        Private method deleting the entry file of a source.
+        """
+        try:
+            os.remove(self.__entry_path(entry["source"]))
+        except FileNotFoundError:
+            pass
+
+    def __write_atomically(self, path: str, content: bytes) -> None:
+        """
+        Private method writing a file through a temporary file, so readers never see a partial file.
+        """
+        with NamedTemporaryFile(dir=os.path.dirname(path), suffix=".tmp", delete=False) as file:
+            file.write(content)
+        os.replace(file.name, path)
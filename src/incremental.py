@@ -0,0 +1,106 @@
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Iterator
+from pandas import DataFrame
+
+
+class IncrementalLoader():
+    """
+    IncrementalLoader class loading only the rows of a source table past a stored high-water mark.
+
+    The watermark is the highest value of a monotonically increasing source column that has
+    been loaded so far. New rows are upserted into the target table on its key columns, so
+    loading the same rows twice is harmless. A full refresh (replacing the target table and
+    resetting the watermark) runs when no watermark exists yet, when it is forced, or when the
+    last full refresh is older than full_refresh_interval.
+
+    Attributes:
+        FULL_REFRESH_INTERVAL (timedelta): Default maximum age of the last full refresh.
+        connection (DatabaseConnector): Used to read and write the target database.
+        extractor (DataExtractor): Used to read the source table.
+        full_refresh_interval (timedelta): Maximum age of the last full refresh.
+
+    Methods:
+        needs_full_refresh(state: dict, now: datetime) -> bool
+        load(source_table: str, target_table: str, clean, watermark_column: str, key_columns: tuple,
+        extract_engine, upload_engine, chunksize: int, full_refresh: bool) -> None
+    """
+    FULL_REFRESH_INTERVAL = timedelta(days=7)
+
+    def __init__(self, connection, extractor, full_refresh_interval: timedelta = None) -> None:
+        self.connection = connection
+        self.extractor = extractor
+        self.full_refresh_interval = full_refresh_interval or self.FULL_REFRESH_INTERVAL
+
+    def needs_full_refresh(self, state: dict, now: datetime) -> bool:
+        """
+        Check whether the target table has to be fully reloaded.
+
+        Args:
+            state (dict): Stored watermark as returned by 'read_watermark', or None.
+            now (datetime): Current time (timezone aware).
+
+        Returns:
+            bool: True if there is no watermark or no full refresh within full_refresh_interval.
+        """
+        if state is None or state["full_refreshed_at"] is None:
+            return True
+        return now - state["full_refreshed_at"] >= self.full_refresh_interval
+
+    def load(self, source_table: str, target_table: str, clean, watermark_column: str, key_columns: tuple,
+             extract_engine, upload_engine, chunksize: int = 50_000, full_refresh: bool = False) -> None:
+        """
+        Load the new rows of source_table into target_table and advance the watermark.
+
+        Args:
+            source_table (str): Name of the source table.
+            target_table (str): Name of the target table.
+            clean (callable): Cleans a chunk of source rows, e.g. DataCleaning.clean_orders_data.
+            watermark_column (str): Monotonically increasing integer column of the source table.
+            key_columns (tuple): Columns identifying a row of the cleaned data.
+            extract_engine (Engine): SQLAlchemy engine of the source database.
+            upload_engine (Engine): SQLAlchemy engine of the target database.
+            chunksize (int): Number of rows per chunk.
+            full_refresh (bool): Force a full refresh.
+
+        Returns:
+            None
+        """
+        now = datetime.now(timezone.utc)
+        state = self.connection.read_watermark(target_table, upload_engine)
+        full_refresh = full_refresh or self.needs_full_refresh(state, now)
+        high_water_mark = {"value": None}
+
+        if full_refresh:
+            print(f"...full refresh of {target_table}")
+            chunks = self.extractor.read_rds_table_in_chunks(source_table, extract_engine, chunksize)
+            clean_chunks = self.__track_watermark(chunks, clean, watermark_column, high_water_mark)
+            self.connection.upload_chunks_to_db(clean_chunks, target_table, upload_engine)
+        else:
+            print(f"...loading rows of {source_table} with {watermark_column} > {state['watermark']}")
+            chunks = self.extractor.read_rds_table_since(
+                source_table, extract_engine, watermark_column, state["watermark"], chunksize
+            )
+            clean_chunks = self.__track_watermark(chunks, clean, watermark_column, high_water_mark)
+            self.connection.upsert_chunks_to_db(clean_chunks, target_table, key_columns, upload_engine)
+
+        if high_water_mark["value"] is None:
+            print(f"...no new rows in {source_table}")
+            return
+        self.connection.write_watermark(
+            target_table, high_water_mark["value"], upload_engine, full_refreshed_at=now if full_refresh else None
+        )
+
+    def __track_watermark(self, chunks: Iterable[DataFrame], clean, watermark_column: str,
+                          high_water_mark: dict) -> Iterator[DataFrame]:
+        """
+        Private method cleaning chunks while recording the highest watermark column value seen.
+
+        The watermark is read before cleaning, since cleaning may drop the watermark column.
+        """
+        for chunk in chunks:
+            if chunk.empty:
+                continue
+            chunk_max = chunk[watermark_column].max()
+            if high_water_mark["value"] is None or chunk_max > high_water_mark["value"]:
+                high_water_mark["value"] = chunk_max
+            yield clean(chunk)
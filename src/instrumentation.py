@@ -0,0 +1,303 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from fnmatch import fnmatchcase
+from functools import wraps
+from threading import Lock
+from time import perf_counter, thread_time
+from pandas import DataFrame
+import json
+import os
+import platform
+import resource
+
+
+class Instrumentation():
+    """
+    Instrumentation class recording performance metrics of the ETL calls and writing a JSON run report.
+
+    Metrics are accumulated per stage, named after the instrumented method and its first
+    string argument (table name, URL or S3 address), e.g. "DatabaseConnector.upload_to_db[dim_users]":
+        calls (int): Number of calls.
+        wall_time (float): Wall time in seconds.
+        cpu_time (float): CPU time in seconds of the calling thread.
+        rows_in / rows_out (int): Rows of the DataFrames passed in / returned.
+        bytes_in / bytes_out (int): In-memory size of the DataFrames passed in / returned.
+        process_peak_rss_growth (int): Largest growth in bytes of the peak RSS of the whole process
+            during a call. The peak only rises and counts the allocations of every thread, so with
+            the pipeline running stages in parallel it is not the memory of the stage itself: it
+            includes the stages running at the same time and is 0 once an earlier stage set the peak.
+
+    Iterators of DataFrames passed in or returned (e.g. chunked reads and uploads) are
+    measured as they are consumed. Time spent waiting on an input iterator is attributed
+    to the stages producing it, not to the consuming call.
+
+    Attributes:
+        REGRESSION_THRESHOLD (float): Default relative increase reported as a regression.
+        MIN_REGRESSION_SECONDS (float): Time increases below this are ignored as noise.
+        METRICS (tuple): Names of the metrics recorded per stage.
+        started_at (datetime): Start of the run.
+        stages (dict): Metrics by stage name.
+
+    Methods:
+        instrument(target, *patterns: str) -> Instrumented
+        measure(stage: str, calls: int)
+        wrap(func, name: str)
+        report(**extra) -> dict
+        write_report(path: str, **extra) -> dict
+        load_report(path: str) -> dict
+        compare(baseline: dict, current: dict, threshold: float) -> DataFrame
+    """
+    REGRESSION_THRESHOLD = 0.2
+    MIN_REGRESSION_SECONDS = 0.05
+    METRICS = (
+        "calls", "wall_time", "cpu_time", "rows_in", "rows_out", "bytes_in", "bytes_out", "process_peak_rss_growth"
+    )
+
+    def __init__(self) -> None:
+        self.started_at = datetime.now(timezone.utc)
+        self.stages = {}
+        self.__lock = Lock()
+
+    def instrument(self, target, *patterns: str) -> "Instrumented":
+        """
+        Wrap an object so calls of its public methods matching any of patterns are recorded.
+
+        Args:
+            target: Object to instrument, e.g. a DataCleaning instance.
+            *patterns (str): Glob patterns of method names, e.g. "clean_*". All public methods when empty.
+
+        Returns:
+            Instrumented: Proxy forwarding every attribute to target.
+        """
+        return Instrumented(target, self, patterns or ("*",))
+
+    @contextmanager
+    def measure(self, stage: str, calls: int = 1):
+        """
+        Context manager recording the metrics of a block of code as a stage.
+
+        Yields:
+            dict: Metrics of the block; rows and bytes may be added to it.
+        """
+        span = dict.fromkeys(self.METRICS, 0)
+        span["calls"] = calls
+        span["wait_wall_time"] = span["wait_cpu_time"] = 0
+        start_wall, start_cpu, start_rss = perf_counter(), thread_time(), self.__max_rss()
+        try:
+            yield span
+        finally:
+            span["wall_time"] += perf_counter() - start_wall - span.pop("wait_wall_time")
+            span["cpu_time"] += thread_time() - start_cpu - span.pop("wait_cpu_time")
+            span["process_peak_rss_growth"] = max(span["process_peak_rss_growth"], self.__max_rss() - start_rss)
+            self.__record(stage, span)
+
+    def wrap(self, func, name: str):
+        """
+        Wrap a callable so its calls are recorded under name.
+
+        Args:
+            func (callable): Callable to wrap.
+            name (str): Stage name prefix, e.g. "DataExtractor.retrieve_pdf_data".
+
+        Returns:
+            callable: The wrapped callable.
+        """
+        @wraps(func)
+        def instrumented(*args, **kwargs):
+            label = next((arg for arg in list(args) + list(kwargs.values()) if isinstance(arg, str)), None)
+            stage = f"{name}[{label}]" if label else name
+            with self.measure(stage) as span:
+                for value in list(args) + list(kwargs.values()):
+                    if isinstance(value, DataFrame):
+                        span["rows_in"] += len(value)
+                        span["bytes_in"] += self.__frame_size(value)
+                args = [self.__wrap_input(arg, span) for arg in args]
+                kwargs = {key: self.__wrap_input(value, span) for key, value in kwargs.items()}
+                result = func(*args, **kwargs)
+                if isinstance(result, DataFrame):
+                    span["rows_out"] += len(result)
+                    span["bytes_out"] += self.__frame_size(result)
+            if isinstance(result, Iterator):
+                return self.__measure_output(stage, result)
+            return result
+
+        return instrumented
+
+    def report(self, **extra) -> dict:
+        """
+        Build the run report.
+
+        Args:
+            **extra: Additional top-level entries, e.g. the pipeline stage durations.
+
+        Returns:
+            dict: Run start and end, host and Python version, and the metrics of every stage.
+        """
+        finished_at = datetime.now(timezone.utc)
+        with self.__lock:
+            stages = {name: dict(metrics) for name, metrics in sorted(self.stages.items())}
+        return {
+            "started_at": self.started_at.isoformat(),
+            "finished_at": finished_at.isoformat(),
+            "wall_time": (finished_at - self.started_at).total_seconds(),
+            "host": platform.node(),
+            "python": platform.python_version(),
+            "stages": stages,
+            **extra
+        }
+
+    def write_report(self, path: str, **extra) -> dict:
+        """
+        Write the run report as JSON.
+
+        Args:
+            path (str): Path of the report file; missing directories are created.
+            **extra: Additional top-level entries of the report.
+
+        Returns:
+            dict: The report.
+        """
+        report = self.report(**extra)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w") as file:
+            json.dump(report, file, indent=2)
+        return report
+
+    def load_report(self, path: str) -> dict:
+        """
+        Load a run report written by 'write_report'.
+        """
+        with open(path) as file:
+            return json.load(file)
+
+    def compare(self, baseline: dict, current: dict, threshold: float = None) -> DataFrame:
+        """
+        Compare the stages of two run reports.
+
+        A stage regressed when its wall time or CPU time grew by more than threshold relative to
+        the baseline (increases under MIN_REGRESSION_SECONDS excepted). The process peak RSS growth
+        is listed too, but does not flag regressions, as it is not a measure of the stage alone.
+
+        Args:
+            baseline (dict): Report of the reference run.
+            current (dict): Report of the run to check.
+            threshold (float): Relative increase reported as a regression, defaults to REGRESSION_THRESHOLD.
+
+        Returns:
+            DataFrame: One row per stage of both reports, with the baseline and current metrics,
+            their ratios and a 'regression' flag.
+        """
+        threshold = self.REGRESSION_THRESHOLD if threshold is None else threshold
+        compared_metrics = ("wall_time", "cpu_time", "process_peak_rss_growth")
+        columns = ["stage"] + [
+            f"{metric}_{suffix}" for metric in compared_metrics for suffix in ("baseline", "current", "ratio")
+        ] + ["regression"]
+        rows = []
+        for stage in sorted(set(baseline["stages"]) & set(current["stages"])):
+            before, after = baseline["stages"][stage], current["stages"][stage]
+            row = {"stage": stage}
+            regression = False
+            for metric in compared_metrics:
+                # reports written before a metric was added or renamed lack it
+                row[f"{metric}_baseline"] = before.get(metric)
+                row[f"{metric}_current"] = after.get(metric)
+                if before.get(metric) is None or after.get(metric) is None:
+                    row[f"{metric}_ratio"] = None
+                    continue
+                row[f"{metric}_ratio"] = after[metric] / before[metric] if before[metric] else None
+                increase = after[metric] - before[metric]
+                if metric != "process_peak_rss_growth":
+                    if increase > self.MIN_REGRESSION_SECONDS and increase > threshold * before[metric]:
+                        regression = True
+            row["regression"] = regression
+            rows.append(row)
+        return DataFrame(rows, columns=columns)
+
+    def __wrap_input(self, value, span: dict):
+        """
+        Private method measuring an input iterator of DataFrames as it is consumed.
+        """
+        if not isinstance(value, Iterator):
+            return value
+
+        def measured_input():
+            while True:
+                start_wall, start_cpu = perf_counter(), thread_time()
+                try:
+                    item = next(value)
+                except StopIteration:
+                    return
+                finally:
+                    span["wait_wall_time"] += perf_counter() - start_wall
+                    span["wait_cpu_time"] += thread_time() - start_cpu
+                if isinstance(item, DataFrame):
+                    span["rows_in"] += len(item)
+                    span["bytes_in"] += self.__frame_size(item)
+                yield item
+
+        return measured_input()
+
+    def __measure_output(self, stage: str, iterator: Iterator) -> Iterator:
+        """
+        Private method measuring the production of every item of an output iterator under stage.
+        """
+        while True:
+            with self.measure(stage, calls=0) as span:
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+                if isinstance(item, DataFrame):
+                    span["rows_out"] += len(item)
+                    span["bytes_out"] += self.__frame_size(item)
+            yield item
+
+    def __record(self, stage: str, span: dict) -> None:
+        """
+        Private method adding the metrics of a span to its stage.
+        """
+        with self.__lock:
+            metrics = self.stages.setdefault(stage, dict.fromkeys(self.METRICS, 0))
+            for metric in self.METRICS:
+                if metric == "process_peak_rss_growth":
+                    metrics[metric] = max(metrics[metric], span[metric])
+                else:
+                    metrics[metric] += span[metric]
+
+    def __frame_size(self, df: DataFrame) -> int:
+        """
+        Private method returning the in-memory size of a DataFrame in bytes.
+        """
+        return int(df.memory_usage(deep=True).sum())
+
+    def __max_rss(self) -> int:
+        """
+        Private method returning the peak resident set size of the process in bytes.
+        """
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in kilobytes on Linux, in bytes on macOS
+        return max_rss if platform.system() == "Darwin" else max_rss * 1024
+
+
+class Instrumented():
+    """
+    Proxy forwarding every attribute to a target object, recording the calls of selected methods.
+
+    Attributes:
+        target: The instrumented object.
+    """
+    def __init__(self, target, instrumentation: Instrumentation, patterns: tuple) -> None:
+        self.target = target
+        self.__instrumentation = instrumentation
+        self.__patterns = patterns
+
+    def __getattr__(self, name: str):
+        attribute = getattr(self.target, name)
+        if name.startswith("_") or not callable(attribute):
+            return attribute
+        if not any(fnmatchcase(name, pattern) for pattern in self.__patterns):
+            return attribute
+        return self.__instrumentation.wrap(attribute, f"{type(self.target).__name__}.{name}")
@@ -1,161 +1,214 @@
 from database_utils import DatabaseConnector
 from data_extraction import DataExtractor
 from data_cleaning import DataCleaning
+from pipeline import Pipeline
+from incremental import IncrementalLoader
+from extraction_cache import ExtractionCache
+from instrumentation import Instrumentation
+from execution import BACKENDS
+from argparse import ArgumentParser
 from decouple import config
-
-# tools
-print("connecting...")
-connection = DatabaseConnector()
-extractor = DataExtractor()
-cleaning_util = DataCleaning()
-
-
-# *** users data
-print("*** processing users_data")
-
-# extract users data
-print("...extracting")
-extract_engine = connection.init_db_engine()
-table_name = "legacy_users"
-users_df = extractor.read_rds_table(table_name, extract_engine)
-
-# clean users data
-print("...cleaning")
-clean_users_df = cleaning_util.clean_user_data(users_df)
-
-# upload users data
-print("...uploading")
-table_name = "dim_users"
-upload_engine = connection.init_upload_db_engine()
-connection.upload_to_db(clean_users_df, table_name, upload_engine)
-
-# info
-print("...info")
-clean_users_df.info()
-del clean_users_df
-
-
-# *** cards data
-print("*** processing cards_data")
-
-# extract card data
-print("...extracting")
-url = extractor.PDF_URL
-cards_df = extractor.retrieve_pdf_data(url)
-
-# clean card data
-print("...cleaning")
-clean_card_df = cleaning_util.clean_card_data(cards_df)
-
-# upload card data
-print("...uploading")
-table_name = "dim_card_details"
-upload_engine = connection.init_upload_db_engine()
-connection.upload_to_db(clean_card_df, table_name, upload_engine)
-
-# info
-print("...info")
-clean_card_df.info()
-del clean_card_df
-
-# *** stores data
-print("*** processing stores_data")
-
-# extract stores data
-print("...extracting")
-url = extractor.NUMBER_OF_STORES_URL
-headers = extractor.HEADERS
-number_of_stores = extractor.list_number_of_stores(url, headers)
-url = extractor.STORE_DATA_URL
-stores_df = extractor.retrieve_store_data(url, headers, number_of_stores)
-
-# clean stores data
-print("...cleaning")
-clean_stores_df = cleaning_util.clean_store_data(stores_df)
-
-# upload store data
-print("...uploading")
-table_name = "dim_store_details"
-upload_engine = connection.init_upload_db_engine()
-connection.upload_to_db(clean_stores_df, table_name, upload_engine)
-
-# info
-print("...info")
-clean_stores_df.info()
-del clean_stores_df
-
-# *** products data
-print("*** processing cards_data")
-
-# extract product data
-print("...extracting")
-s3_address = extractor.S3_ADDRESS
-products_df = extractor.extract_from_s3(s3_address)
-
-# clean products data
-print("...cleaning")
-clean_products_df = cleaning_util.clean_products_data(products_df)
-
-# upload products data
-print("...uploading")
-table_name = "dim_products"
-upload_engine = connection.init_upload_db_engine()
-connection.upload_to_db(clean_products_df, table_name, upload_engine)
-
-# info
-print("...info")
-clean_products_df.info()
-del clean_products_df
-
-
-# *** orders data
-print("*** processing orders_data")
-
-# extract orders data
-print("...extracting")
-extract_engine = connection.init_db_engine()
-table_name = "orders_table"
-orders_df = extractor.read_rds_table(table_name, extract_engine)
-
-# clean orders data
-print("...cleaning")
-clean_orders_df = cleaning_util.clean_orders_data(orders_df)
-
-# upload orders data
-print("...uploading")
-table_name = "orders_table"
-upload_engine = connection.init_upload_db_engine()
-connection.upload_to_db(clean_orders_df, table_name, upload_engine)
-
-# info
-print("...info")
-clean_orders_df.info()
-del clean_orders_df
-
-
-# *** date date events
-print("*** processing orders_data")
-
-# extract date events
-print("...extracting")
-file_address = extractor.DATE_EVENTS_DATA_LINK
-date_events_df = extractor.extract_date_events_data(file_address)
-
-# clean date events
-print("...cleaning")
-clean_date_events_df = cleaning_util.clean_date_events(date_events_df)
-
-# upload date events
-print("...uploading")
-table_name = "dim_date_times"
-upload_engine = connection.init_upload_db_engine()
-connection.upload_to_db(clean_date_events_df, table_name, upload_engine)
-
-# info
-print("...info")
-clean_date_events_df.info()
-del clean_date_events_df
-
-
-# end
-print("end")
+import os
+
+# rows per chunk when streaming large RDS tables
+CHUNK_SIZE = 50_000
+# number of datasets processed at the same time
+MAX_WORKERS = 6
+SCHEMA_SCRIPT = "./db/create_db_schema.sql"
+# pre-joined sales view built by SCHEMA_SCRIPT
+FACT_SALES_VIEW = "fact_sales"
+# incremental loading of orders_table
+ORDERS_WATERMARK_COLUMN = "index"
+ORDERS_KEY_COLUMNS = ("date_uuid",)
+# JSON run reports
+REPORT_DIR = "./reports"
+# default execution backend cleaning row partitions of every dataset (CLEANING_BACKEND in .env)
+CLEANING_BACKEND = "serial"
+# default number of parallel COPY streams shared by the uploads (UPLOAD_STREAMS in .env)
+UPLOAD_STREAMS = 1
+
+
+def build_pipeline(connection, extractor, cleaning_util, max_workers, build_schema,
+                   incremental=False, full_refresh=False) -> Pipeline:
+    """
+    Declare the extract -> clean -> load stages of every dataset.
+
+    Datasets do not depend on each other and run concurrently; the optional schema
+    stage runs once every load has finished, otherwise the fact_sales view is refreshed
+    then. In incremental mode only the orders past the stored watermark are extracted
+    and upserted, with a periodic full refresh.
+    """
+    extract_engine = connection.init_db_engine()
+    upload_engine = connection.init_upload_db_engine()
+    pipeline = Pipeline(max_workers=max_workers)
+
+    # *** users data
+    # extract, clean and upload users data in chunks
+    def load_users():
+        users_chunks = extractor.read_rds_table_in_chunks("legacy_users", extract_engine, CHUNK_SIZE)
+        clean_users_chunks = (cleaning_util.clean_user_data(chunk) for chunk in users_chunks)
+        connection.upload_chunks_to_db(clean_users_chunks, "dim_users", upload_engine)
+
+    pipeline.add_stage("load_users", load_users)
+
+    # *** cards data
+    pipeline.add_stage("extract_cards", lambda: extractor.retrieve_pdf_data(extractor.PDF_URL))
+    pipeline.add_stage("clean_cards", cleaning_util.clean_card_data, depends_on=("extract_cards",))
+    pipeline.add_stage(
+        "load_cards",
+        lambda df: connection.upload_to_db(df, "dim_card_details", upload_engine),
+        depends_on=("clean_cards",)
+    )
+
+    # *** stores data
+    def extract_stores():
+        headers = extractor.HEADERS
+        number_of_stores = extractor.list_number_of_stores(extractor.NUMBER_OF_STORES_URL, headers)
+        return extractor.retrieve_store_data(extractor.STORE_DATA_URL, headers, number_of_stores)
+
+    pipeline.add_stage("extract_stores", extract_stores)
+    pipeline.add_stage("clean_stores", cleaning_util.clean_store_data, depends_on=("extract_stores",))
+    pipeline.add_stage(
+        "load_stores",
+        lambda df: connection.upload_to_db(df, "dim_store_details", upload_engine),
+        depends_on=("clean_stores",)
+    )
+
+    # *** products data
+    def clean_products(products_df):
+        clean_products_df = cleaning_util.clean_products_data(products_df)
+        unmatched_weights = cleaning_util.unmatched_weights
+        if not unmatched_weights.empty:
+            print(f"...{len(unmatched_weights)} product weights could not be converted")
+            print(unmatched_weights["weight"].value_counts().to_string())
+        return clean_products_df
+
+    pipeline.add_stage("extract_products", lambda: extractor.extract_from_s3(extractor.S3_ADDRESS))
+    pipeline.add_stage("clean_products", clean_products, depends_on=("extract_products",))
+    pipeline.add_stage(
+        "load_products",
+        lambda df: connection.upload_to_db(df, "dim_products", upload_engine),
+        depends_on=("clean_products",)
+    )
+
+    # *** orders data
+    # extract, clean and upload orders data in chunks
+    def load_orders():
+        if incremental:
+            loader = IncrementalLoader(connection, extractor)
+            loader.load(
+                "orders_table", "orders_table", cleaning_util.clean_orders_data,
+                ORDERS_WATERMARK_COLUMN, ORDERS_KEY_COLUMNS, extract_engine, upload_engine,
+                chunksize=CHUNK_SIZE, full_refresh=full_refresh
+            )
+            return
+        orders_chunks = extractor.read_rds_table_in_chunks("orders_table", extract_engine, CHUNK_SIZE)
+        clean_orders_chunks = (cleaning_util.clean_orders_data(chunk) for chunk in orders_chunks)
+        connection.upload_chunks_to_db(clean_orders_chunks, "orders_table", upload_engine)
+
+    pipeline.add_stage("load_orders", load_orders)
+
+    # *** date events data
+    pipeline.add_stage(
+        "extract_date_events",
+        lambda: extractor.extract_date_events_data(extractor.DATE_EVENTS_DATA_LINK)
+    )
+    pipeline.add_stage("clean_date_events", cleaning_util.clean_date_events, depends_on=("extract_date_events",))
+    pipeline.add_stage(
+        "load_date_events",
+        lambda df: connection.upload_to_db(df, "dim_date_times", upload_engine),
+        depends_on=("clean_date_events",)
+    )
+
+    # *** star schema, once every table is loaded
+    loads = tuple(name for name in pipeline.stages if name.startswith("load_"))
+    if build_schema:
+        # also rebuilds the fact_sales view
+        pipeline.add_stage(
+            "build_schema",
+            lambda *_: connection.run_sql_file(SCHEMA_SCRIPT, upload_engine),
+            depends_on=loads
+        )
+    else:
+        pipeline.add_stage(
+            "refresh_fact_sales",
+            lambda *_: connection.refresh_materialized_view(FACT_SALES_VIEW, upload_engine),
+            depends_on=loads
+        )
+    return pipeline
+
+
+def main():
+    parser = ArgumentParser(description="Extract, clean and load the retail data into the local database.")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS, help="datasets processed at the same time")
+    parser.add_argument("--build-schema", action="store_true", help=f"run {SCHEMA_SCRIPT} after all loads")
+    parser.add_argument("--incremental", action="store_true", help="only load orders past the stored watermark")
+    parser.add_argument("--full-refresh", action="store_true", help="force a full refresh in incremental mode")
+    parser.add_argument("--no-cache", action="store_true", help="download every source again, ignoring the cache")
+    parser.add_argument(
+        "--pdf-backend", choices=DataExtractor.PDF_BACKENDS, default="tabula",
+        help="library reading the card details PDF"
+    )
+    parser.add_argument(
+        "--lean", action="store_true", help="clean column by column to bound the peak memory of each dataset"
+    )
+    parser.add_argument(
+        "--memory-report", action="store_true",
+        help="report the bytes of every dataset before and after compacting its dtypes (slows down cleaning)"
+    )
+    parser.add_argument("--report", help=f"path of the JSON run report, defaults to a new file in {REPORT_DIR}")
+    parser.add_argument("--baseline", help="JSON run report to compare this run with")
+    args = parser.parse_args()
+
+    instrumentation = Instrumentation()
+    report_path = args.report or f"{REPORT_DIR}/etl_run_{instrumentation.started_at:%Y%m%dT%H%M%SZ}.json"
+    durations = {}
+    status = "failed"
+
+    # tools
+    backend_name = config("CLEANING_BACKEND", default=CLEANING_BACKEND)
+    partitions = config(
+        "CLEANING_PARTITIONS", default=1 if backend_name == "serial" else os.cpu_count(), cast=int
+    )
+    backend = BACKENDS[backend_name](max_workers=partitions)
+    upload_streams = config("UPLOAD_STREAMS", default=UPLOAD_STREAMS, cast=int)
+    cleaning_util = instrumentation.instrument(
+        DataCleaning(
+            lean=args.lean, backend=backend, partitions=partitions, report_memory=args.memory_report
+        ), "clean_*"
+    )
+    print("connecting...")
+    try:
+        with DatabaseConnector(upload_streams=upload_streams) as connector, backend:
+            connection = instrumentation.instrument(connector, "upload_*", "upsert_*", "refresh_*")
+            extractor = instrumentation.instrument(
+                DataExtractor(cache=None if args.no_cache else ExtractionCache(), pdf_backend=args.pdf_backend)
+            )
+            pipeline = build_pipeline(
+                connection, extractor, cleaning_util, args.workers, args.build_schema,
+                incremental=args.incremental, full_refresh=args.full_refresh
+            )
+            durations = pipeline.run()
+        status = "succeeded"
+    finally:
+        report = instrumentation.write_report(
+            report_path, status=status, pipeline_stages=durations, memory=cleaning_util.memory_report
+        )
+        print(f"run report written to {report_path}")
+
+    # end
+    for name, elapsed in durations.items():
+        print(f"{name:<20} {elapsed:8.2f}s")
+    for dataset, usage in cleaning_util.memory_report.items():
+        megabytes_before, megabytes_after = usage["bytes_before"] / 2**20, usage["bytes_after"] / 2**20
+        print(f"{dataset:<20} {megabytes_before:8.1f} MiB -> {megabytes_after:8.1f} MiB after compacting dtypes")
+    if args.baseline:
+        comparison = instrumentation.compare(instrumentation.load_report(args.baseline), report)
+        columns = ["stage", "wall_time_ratio", "cpu_time_ratio", "process_peak_rss_growth_ratio", "regression"]
+        print(comparison[columns].to_string(index=False))
+        print(f"{comparison['regression'].sum()} stages regressed against {args.baseline}")
+    print("end")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from time import perf_counter
+
+
+class Stage():
+    """
+    A named unit of work in a Pipeline.
+
+    Attributes:
+        name (str): Unique name of the stage.
+        func (callable): Called with the results of the stages it depends on, in order.
+        depends_on (tuple): Names of the stages that must finish before this one starts.
+    """
+    def __init__(self, name: str, func, depends_on: tuple = ()) -> None:
+        self.name = name
+        self.func = func
+        self.depends_on = tuple(depends_on)
+
+
+class Pipeline():
+    """
+    Pipeline class running stages concurrently in dependency order.
+
+    Every stage starts as soon as all of its dependencies have finished, so independent
+    chains of stages (e.g. extract -> clean -> load of different datasets) run side by
+    side on a thread pool. A stage's result is passed to the stages depending on it and
+    released once all of them have finished.
+
+    Attributes:
+        max_workers (int): Maximum number of stages running at the same time.
+        stages (dict): Registered stages by name, in insertion order.
+
+    Methods:
+        add_stage(name: str, func, depends_on: tuple): Register a stage.
+        run() -> dict: Run all stages and return the wall time of each stage.
+    """
+    def __init__(self, max_workers: int = 4) -> None:
+        self.max_workers = max_workers
+        self.stages = {}
+
+    def add_stage(self, name: str, func, depends_on: tuple = ()) -> None:
+        """
+        Register a stage.
+
+        Args:
+            name (str): Unique name of the stage.
+            func (callable): Called with the results of the stages listed in depends_on.
+            depends_on (tuple): Names of already registered stages this stage depends on.
+
+        Raises:
+            ValueError: If the name is already registered or a dependency is unknown.
+        """
+        if name in self.stages:
+            raise ValueError(f"stage {name} is already registered")
+        for dependency in depends_on:
+            if dependency not in self.stages:
+                raise ValueError(f"stage {name} depends on unknown stage {dependency}")
+        self.stages[name] = Stage(name, func, depends_on)
+
+    def run(self) -> dict:
+        """
+        Run all stages, each as soon as its dependencies have finished.
+
+        Returns:
+            dict: Wall time in seconds of every stage, by stage name.
+
+        Raises:
+            Exception: The first exception raised by a stage. Stages that have not
+            started yet are skipped; running stages are allowed to finish.
+        """
+        results = {}
+        durations = {}
+        remaining_dependents = {name: 0 for name in self.stages}
+        for stage in self.stages.values():
+            for dependency in stage.depends_on:
+                remaining_dependents[dependency] += 1
+
+        pending = dict(self.stages)
+        running = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while pending or running:
+                for name, stage in list(pending.items()):
+                    if all(dependency in durations for dependency in stage.depends_on):
+                        arguments = [results[dependency] for dependency in stage.depends_on]
+                        running[executor.submit(self.__run_stage, stage, arguments)] = stage
+                        del pending[name]
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage = running.pop(future)
+                    try:
+                        results[stage.name], durations[stage.name] = future.result()
+                    except Exception:
+                        pending.clear()
+                        wait(running)
+                        raise
+                    for dependency in stage.depends_on:
+                        remaining_dependents[dependency] -= 1
+                        if remaining_dependents[dependency] == 0:
+                            results.pop(dependency, None)
+        return durations
+
+    def __run_stage(self, stage: Stage, arguments: list) -> tuple:
+        """
+        Private method running a single stage and timing it.
+
+        Returns:
+            tuple: (result of the stage, wall time in seconds)
+        """
+        print(f"*** {stage.name} started")
+        start = perf_counter()
+        result = stage.func(*arguments)
+        elapsed = perf_counter() - start
+        print(f"*** {stage.name} finished in {elapsed:.2f}s")
+        return result, elapsed
@@ -0,0 +1,57 @@
+import pandas as pd
+import pytest
+from src.analytics import SalesAnalytics
+
+TABLES = {
+    "orders_table": pd.DataFrame({
+        "date_uuid": pd.array(["d1", "d2", "d3", "d4"], dtype="string[pyarrow]"),
+        "user_uuid": pd.array(["u1", "u1", "u2", "u2"], dtype="string[pyarrow]"),
+        "card_number": pd.array(["c1", "c2", "c3", "c4"], dtype="string[pyarrow]"),
+        "store_code": pd.Series(["s1", "s2", "s1", None], dtype="category"),
+        "product_code": pd.Series(["p1", "p2", "missing", "p1"], dtype="category"),
+        "product_quantity": pd.array([2, 1, 3, 4], dtype="Int16")
+    }),
+    "dim_products": pd.DataFrame({"product_code": ["p1", "p2"], "product_price": [1.5, 10.0]}),
+    "dim_date_times": pd.DataFrame({
+        "date_uuid": pd.array(["d1", "d2", "d3", "d4"], dtype="string[pyarrow]"),
+        "year": pd.Series(["2020", "2021", "2021", "2022"], dtype="category"),
+        "month": pd.Series(["1", "2", "3", "4"], dtype="category")
+    }),
+    "dim_store_details": pd.DataFrame({
+        "store_code": ["s1", "s2"],
+        "store_type": pd.Series(["Local", "Web Portal"], dtype="category"),
+        "country_code": pd.Series(["GB", "DE"], dtype="category")
+    })
+}
+
+
+def test_fact_sales_joins_orders_with_products_date_times_and_stores():
+    df = SalesAnalytics(TABLES).fact_sales()
+    assert df["date_uuid"].tolist() == ["d1", "d2"]
+    assert df["product_price"].tolist() == [1.5, 10.0]
+    assert df["total_payment"].tolist() == [3.0, 10.0]
+    assert df["year"].tolist() == ["2020", "2021"]
+    assert df["store_type"].tolist() == ["Local", "Web Portal"]
+    assert df["country_code"].tolist() == ["GB", "DE"]
+
+
+def test_fact_sales_drops_orders_with_unknown_or_null_keys():
+    df = SalesAnalytics(TABLES).fact_sales()
+    assert "d3" not in df["date_uuid"].tolist()
+    assert "d4" not in df["date_uuid"].tolist()
+
+
+def test_fact_sales_does_not_modify_tables():
+    SalesAnalytics(TABLES).fact_sales()
+    assert TABLES["orders_table"]["product_code"].tolist() == ["p1", "p2", "missing", "p1"]
+    assert list(TABLES["orders_table"].columns) == [
+        "date_uuid", "user_uuid", "card_number", "store_code", "product_code", "product_quantity"
+    ]
+
+
+def test_fact_sales_raises_on_duplicate_dimension_keys():
+    tables = dict(TABLES, dim_products=pd.DataFrame({
+        "product_code": ["p1", "p2", "p1"], "product_price": [1.5, 10.0, 2.0]
+    }))
+    with pytest.raises(ValueError, match=r"dim_products has duplicate product_code values, e.g. \['p1'\]"):
+        SalesAnalytics(tables).fact_sales()
@@ -0,0 +1,16 @@
+import pandas as pd
+from src.analytics import SalesAnalytics
+
+STORES = pd.DataFrame({
+    "store_code": ["s1", "s2"],
+    "staff_numbers": pd.array([3, None], dtype="Int16"),
+    "country_code": pd.Series(["GB", "DE"], dtype="category")
+})
+
+
+def test_read_parquet_reads_tables_written_by_write_parquet(tmp_path):
+    SalesAnalytics({"dim_store_details": STORES}).write_parquet(str(tmp_path))
+    analytics = SalesAnalytics()
+    analytics.read_parquet(str(tmp_path))
+    assert list(analytics.tables) == ["dim_store_details"]
+    pd.testing.assert_frame_equal(analytics.tables["dim_store_details"], STORES)
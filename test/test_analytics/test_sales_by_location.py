@@ -0,0 +1,23 @@
+import pandas as pd
+from src.analytics import SalesAnalytics
+
+TABLES = {
+    "orders_table": pd.DataFrame({
+        "date_uuid": pd.array(["d1", "d2", "d3", "d4"], dtype="string[pyarrow]"),
+        "store_code": pd.Series(["web", "s1", "s2", "s1"], dtype="category"),
+        "product_quantity": pd.array([1, 2, 3, 4], dtype="Int16")
+    }),
+    "dim_store_details": pd.DataFrame({
+        "store_code": ["web", "s1", "s2"],
+        "store_type": pd.Series(["Web Portal", "Local", None], dtype="category")
+    })
+}
+
+
+def test_sales_by_location_splits_web_portal_from_other_store_types():
+    df = SalesAnalytics(TABLES).sales_by_location()
+    assert list(df.columns) == ["numbers_of_sales", "product_quantity_count", "location"]
+    assert df.to_dict("records") == [
+        {"numbers_of_sales": 1, "product_quantity_count": 1, "location": "Web"},
+        {"numbers_of_sales": 3, "product_quantity_count": 9, "location": "Offline"}
+    ]
@@ -0,0 +1,31 @@
+import pandas as pd
+from src.analytics import SalesAnalytics
+
+TABLES = {
+    "orders_table": pd.DataFrame({
+        "date_uuid": ["d1", "d2", "d3"],
+        "user_uuid": ["u1", "u2", "u3"],
+        "card_number": ["c1", "c2", "c3"],
+        "store_code": ["s1", "s2", "s2"],
+        "product_code": ["p1", "p1", "p2"],
+        "product_quantity": pd.array([1, 2, 1], dtype="Int16")
+    }),
+    "dim_products": pd.DataFrame({"product_code": ["p1", "p2"], "product_price": [10.004, 0.6]}),
+    "dim_date_times": pd.DataFrame({"date_uuid": ["d1", "d2", "d3"], "year": "2020", "month": "1"}),
+    "dim_store_details": pd.DataFrame({
+        "store_code": ["s1", "s2"], "store_type": ["Local", "Mall Kiosk"], "country_code": "GB"
+    })
+}
+
+
+def test_sales_by_store_type_returns_totals_and_shares_in_descending_order():
+    df = SalesAnalytics(TABLES).sales_by_store_type()
+    assert list(df.columns) == ["store_type", "total_sales", "percentage_total_(%)"]
+    assert df["store_type"].tolist() == ["Mall Kiosk", "Local"]
+    assert df["total_sales"].tolist() == [20.61, 10.0]
+
+
+def test_sales_by_store_type_shares_use_rounded_group_totals():
+    df = SalesAnalytics(TABLES).sales_by_store_type()
+    total = 10.004 * 3 + 0.6
+    assert df["percentage_total_(%)"].tolist() == [21 / total * 100, 10 / total * 100]
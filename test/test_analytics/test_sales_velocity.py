@@ -0,0 +1,26 @@
+import pandas as pd
+from src.analytics import SalesAnalytics
+
+DATE_TIMES = pd.DataFrame({
+    "timestamp": ["10:00:00", "09:00:00", "12:00:00", "00:00:00", "08:00:00", "23:00:00", "bad"],
+    "month": pd.Series(["1", "1", "1", "2", "6", "6", "6"], dtype="category"),
+    "year": pd.Series(["2020", "2020", "2020", "2021", "2022", "2022", "2022"], dtype="category"),
+    "day": pd.Series(["1", "1", "1", "1", "1", "1", "1"], dtype="category"),
+    "date_uuid": ["d1", "d2", "d3", "d4", "d5", "d6", "d7"]
+})
+analytics = SalesAnalytics({"dim_date_times": DATE_TIMES})
+
+
+def test_sales_velocity_averages_time_between_consecutive_sales_of_each_year():
+    df = analytics.sales_velocity()
+    assert list(df.columns) == ["year", "actual_time_taken"]
+    assert df["year"].tolist() == ["2022", "2020"]
+    assert df["actual_time_taken"].tolist() == [pd.Timedelta(hours=15), pd.Timedelta(hours=1.5)]
+
+
+def test_sales_velocity_skips_years_with_a_single_sale():
+    assert "2021" not in analytics.sales_velocity()["year"].tolist()
+
+
+def test_sales_velocity_limits_the_number_of_years():
+    assert analytics.sales_velocity(limit=1)["year"].tolist() == ["2022"]
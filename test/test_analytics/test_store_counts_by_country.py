@@ -0,0 +1,22 @@
+import numpy as np
+import pandas as pd
+from src.analytics import SalesAnalytics
+
+STORES = pd.DataFrame({
+    "store_code": ["s1", "s2", "s3", "s4", "s5"],
+    "country_code": pd.Series(["GB", "DE", "GB", np.nan, "GB"], dtype="category").cat.add_categories("US")
+})
+analytics = SalesAnalytics({"dim_store_details": STORES})
+
+
+def test_store_counts_by_country_counts_stores_in_descending_order():
+    df = analytics.store_counts_by_country()
+    assert list(df.columns) == ["country", "total_no_stores"]
+    assert df.iloc[0].tolist() == ["GB", 3]
+
+
+def test_store_counts_by_country_keeps_null_country_and_skips_unused_categories():
+    df = analytics.store_counts_by_country()
+    assert len(df) == 3
+    assert df["country"].isna().sum() == 1
+    assert "US" not in df["country"].tolist()
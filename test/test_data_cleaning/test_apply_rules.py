@@ -0,0 +1,143 @@
+import pandas as pd
+import numpy as np
+import pytest
+from src.data_cleaning import DataCleaning
+from src.execution import SerialBackend, ThreadBackend
+
+cleaning_util = DataCleaning()
+cleaning_util.CLEANING_RULES = {
+    "sample": {
+        "drop_columns": ("index", "code"),
+        "null_tokens": ("NULL", "N/A"),
+        "transforms": {
+            "name": (("replace", "@@", "@"),),
+            "joined": ("fix_date_formats",)
+        },
+        "derived": {
+            "country_code": ("country", ("assign_valid_country_codes",)),
+            "code_kg": ("code", ("convert_weights_to_kg",))
+        },
+        "invalid_rows": {"name": "is_invalid_data_points"}
+    },
+    "kept": {"drop_columns": ("index",), "keep_rows": True},
+    "nulls": {"null_tokens": ("NULL",), "keep_rows": True},
+    "unknown_step": {"transforms": {"name": (("reverse",),)}},
+    "counts": {"invalid_rows": {"count": "isna"}}
+}
+cleaning_util.COMPACT_DTYPES = {
+    "sample": {"country_code": "category"}, "kept": {}, "nulls": {}, "unknown_step": {},
+    "counts": {"name": "category", "size": "Int16"}
+}
+lean_util = DataCleaning(lean=True)
+lean_util.CLEANING_RULES = cleaning_util.CLEANING_RULES
+lean_util.COMPACT_DTYPES = cleaning_util.COMPACT_DTYPES
+
+
+def make_sample():
+    return pd.DataFrame({
+        "index": [0, 1, 2, 3, 4],
+        "name": ["a@@b", "NULL", "FIEOPTNBWZ", "c", np.nan],
+        "joined": ["2020-01-31", "N/A", "2020-01-31", "bad", np.nan],
+        "country": ["Germany", "NULL", "Germany", "N/A", np.nan],
+        "country_code": ["DE", "DE", "DE", "ES", np.nan],
+        "code": ["1kg", "NULL", "1kg", "500g", np.nan]
+    }, index=[10, 11, 12, 13, 14])
+
+
+def test_it_applies_transforms_and_derived_columns():
+    result = cleaning_util.apply_rules(make_sample(), "sample")
+    assert list(result.columns) == ["name", "joined", "country", "country_code", "code_kg"]
+    assert result["name"].tolist() == ["a@b", "c"]
+    assert result["joined"].isna().tolist() == [False, True]
+    assert result["country_code"].isna().tolist() == [False, True]
+    assert result["country_code"].dtype == "category"
+    assert result["code_kg"].tolist() == [1.0, 0.5]
+
+
+def test_it_drops_invalid_and_empty_rows_and_resets_the_index():
+    result = cleaning_util.apply_rules(make_sample(), "sample")
+    assert result["name"].tolist() == ["a@b", "c"]
+    assert result.index.equals(pd.RangeIndex(2))
+
+
+def test_it_reads_null_tokens_as_nan():
+    result = cleaning_util.apply_rules(make_sample(), "sample")
+    assert pd.isna(result.loc[1, "country"])
+
+
+def test_it_infers_dtypes_of_object_columns_after_replacing_null_tokens():
+    df = pd.DataFrame({"name": pd.Series(["1", "NULL"]), "value": pd.Series([1, 2], dtype=object)})
+    expected = cleaning_util.replace_null_with_nan(df)
+    result = cleaning_util.apply_rules(df, "nulls")
+    assert result.dtypes.equals(expected.dtypes)
+
+
+def test_it_keeps_rows_and_index():
+    df = pd.DataFrame({"index": [1, 2], "name": [np.nan, np.nan]}, index=[5, 6])
+    result = cleaning_util.apply_rules(df, "kept")
+    assert list(result.columns) == ["name"]
+    assert result.index.tolist() == [5, 6]
+
+
+def test_it_does_not_modify_the_input():
+    df = make_sample()
+    cleaning_util.apply_rules(df, "sample")
+    pd.testing.assert_frame_equal(df, make_sample())
+
+
+def test_it_rejects_unknown_steps():
+    with pytest.raises(ValueError):
+        cleaning_util.apply_rules(pd.DataFrame({"name": ["a"]}), "unknown_step")
+
+
+@pytest.mark.parametrize("dataset", ["sample", "kept", "nulls"])
+def test_lean_mode_returns_the_same_result(dataset):
+    df = make_sample()
+    df["value"] = pd.Series([1, 2, 3, 4, 5], index=df.index, dtype=object)
+    expected = cleaning_util.apply_rules(df, dataset)
+    result = lean_util.apply_rules(df, dataset)
+    pd.testing.assert_frame_equal(result, expected)
+    pd.testing.assert_frame_equal(df.drop(columns="value"), make_sample())
+
+
+def test_lean_mode_compacts_columns_on_the_kept_rows_only():
+    df = pd.DataFrame({"name": ["a", "b", "c"], "size": ["1", "1.5", "3"], "count": [1, np.nan, 2]})
+    result = lean_util.apply_rules(df, "counts")
+    assert result["name"].cat.categories.tolist() == ["a", "c"]
+    assert result["size"].tolist() == [1, 3]
+    assert result["size"].dtype == "Int16"
+    pd.testing.assert_frame_equal(result, cleaning_util.apply_rules(df, "counts"))
+
+
+@pytest.mark.parametrize("lean", [False, True])
+def test_partitioned_cleaning_returns_the_rows_of_a_single_call(lean):
+    df = pd.concat([make_sample()] * 3)
+    partitioned = DataCleaning(lean=lean, backend=ThreadBackend(max_workers=2), partitions=3)
+    partitioned.MIN_PARTITION_ROWS = 2
+    partitioned.CLEANING_RULES = cleaning_util.CLEANING_RULES
+    partitioned.COMPACT_DTYPES = cleaning_util.COMPACT_DTYPES
+    result = partitioned.apply_rules(df, "sample")
+    pd.testing.assert_frame_equal(result, cleaning_util.apply_rules(df, "sample"))
+    partitioned.backend.close()
+
+
+def test_partitioned_cleaning_merges_the_categories_of_the_partitions():
+    df = pd.DataFrame({"name": ["b", "a", "c", "a"], "size": ["1", "2", "3", "4"], "count": [1, 2, 3, 4]})
+    partitioned = DataCleaning(backend=SerialBackend(), partitions=2)
+    partitioned.MIN_PARTITION_ROWS = 2
+    partitioned.CLEANING_RULES = cleaning_util.CLEANING_RULES
+    partitioned.COMPACT_DTYPES = cleaning_util.COMPACT_DTYPES
+    result = partitioned.apply_rules(df, "counts")
+    assert result["name"].cat.categories.tolist() == ["a", "b", "c"]
+    pd.testing.assert_frame_equal(result, cleaning_util.apply_rules(df, "counts"))
+
+
+def test_partitioned_cleaning_keeps_rows_and_index():
+    df = pd.DataFrame({"index": [1, 2, 3, 4], "name": [np.nan, "a", np.nan, "b"]}, index=[7, 5, 6, 4])
+    partitioned = DataCleaning(backend=SerialBackend(), partitions=2)
+    partitioned.MIN_PARTITION_ROWS = 2
+    partitioned.CLEANING_RULES = cleaning_util.CLEANING_RULES
+    partitioned.COMPACT_DTYPES = cleaning_util.COMPACT_DTYPES
+    result = partitioned.apply_rules(df, "kept")
+    assert result.index.tolist() == [7, 5, 6, 4]
+    assert result["name"].tolist()[1::2] == ["a", "b"]
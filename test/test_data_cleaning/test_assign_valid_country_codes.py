@@ -0,0 +1,24 @@
+import pandas as pd
+import numpy as np
+from src.data_cleaning import DataCleaning
+
+cleaning_util = DataCleaning()
+
+
+def test_it_assigns_valid_country_codes():
+    sample = pd.Series(["United Kingdom", "United States", "Germany"])
+    result = cleaning_util.assign_valid_country_codes(sample)
+    assert result.tolist() == ["GB", "US", "DE"]
+
+
+def test_it_returns_nan_for_unknown_countries_and_nan():
+    sample = pd.Series(["ACDE45ASDD", np.nan])
+    result = cleaning_util.assign_valid_country_codes(sample)
+    assert result.isna().all()
+
+
+def test_it_matches_assign_valid_country_code():
+    sample = pd.Series(["Germany", "ACDE45ASDD", np.nan, "United Kingdom", "GB"], index=[4, 2, 2, 0, 1])
+    expected = sample.apply(cleaning_util.assign_valid_country_code)
+    result = cleaning_util.assign_valid_country_codes(sample)
+    assert result.equals(expected)
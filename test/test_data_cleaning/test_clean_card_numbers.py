@@ -0,0 +1,34 @@
+import pandas as pd
+import numpy as np
+from src.data_cleaning import DataCleaning
+
+cleaning_util = DataCleaning()
+
+
+def test_it_returns_arrow_backed_strings():
+    sample = pd.Series([30060773296197, "?123"])
+    result = cleaning_util.clean_card_numbers(sample)
+    assert result.dtype == "string[pyarrow]"
+    assert result.tolist() == ["30060773296197", "123"]
+
+
+def test_it_skips_valid_values_and_removes_question_marks():
+    sample = pd.Series(["4252720361802860591", "?4252720361802860591", "????344132437598598"])
+    result = cleaning_util.clean_card_numbers(sample)
+    assert result.tolist() == ["4252720361802860591", "4252720361802860591", "344132437598598"]
+
+
+def test_it_removes_invalid_values_and_ignores_nan():
+    sample = pd.Series(["ABCD34EF5YU", np.nan])
+    result = cleaning_util.clean_card_numbers(sample)
+    assert result.isna().all()
+
+
+def test_it_matches_clean_card_number():
+    sample = pd.Series(
+        ["4252720361802860591", "?4252720361802860591", "ABCD34EF5YU", np.nan, 30060773296197, "?A1", ""],
+        index=[6, 6, 4, 3, 2, 1, 0]
+    )
+    expected = sample.apply(cleaning_util.clean_card_number).astype("string[pyarrow]")
+    result = cleaning_util.clean_card_numbers(sample)
+    assert result.equals(expected)
@@ -0,0 +1,24 @@
+import pandas as pd
+import numpy as np
+from src.data_cleaning import DataCleaning, clean_partition
+
+
+def make_products():
+    return pd.DataFrame({
+        "product_name": ["a", "b", "c"],
+        "product_price": ["£1.00", "£2.00", "£3.00"],
+        "weight": ["1kg", np.nan, "bad"],
+        "category": ["x", "y", "x"],
+        "date_added": ["2020-01-02", "2020-01-03", "2020-01-04"],
+        "removed": ["Still_avaliable", "Removed", "Still_avaliable"]
+    })
+
+
+def test_it_returns_the_cleaned_partition_and_reports():
+    cleaning_util = DataCleaning()
+    result, memory_report, unmatched_weights = clean_partition(
+        DataCleaning(report_memory=True), make_products(), "products"
+    )
+    pd.testing.assert_frame_equal(result, cleaning_util.clean_products_data(make_products()))
+    assert set(memory_report) == {"products"}
+    assert unmatched_weights["weight"].tolist() == ["bad"]
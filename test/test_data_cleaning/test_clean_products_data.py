@@ -0,0 +1,46 @@
+import pandas as pd
+import numpy as np
+from src.data_cleaning import DataCleaning
+
+cleaning_util = DataCleaning()
+
+
+def make_products():
+    return pd.DataFrame({
+        "product_name": ["FURGLE set", "Oak table", "Tractor", "VLPCU81M30"],
+        "product_price": ["£39.99", "£1,099.00", "£12000.50", "VLPCU81M30"],
+        "weight": ["1.6kg", "38kg", "12 x 12kg", "VLPCU81M30"],
+        "category": ["toys-and-games", "homeware", "diy", "VLPCU81M30"],
+        "EAN": ["6014", "7024", "8034", "VLPCU81M30"],
+        "date_added": ["2005-12-02", "2018 October 22", "2012-10-06", "VLPCU81M30"],
+        "uuid": ["83dc0a69-f96f-4c34-bcb7-928acae19a94"] * 3 + ["VLPCU81M30"],
+        "removed": ["Still_avaliable", "Removed", np.nan, "VLPCU81M30"],
+        "product_code": ["R7-3126933h", "C2-7287916l", "S7-1175877v", "VLPCU81M30"]
+    })
+
+
+def test_it_drops_rows_with_invalid_weights():
+    result = cleaning_util.clean_products_data(make_products())
+    assert result["product_code"].tolist() == ["R7-3126933h", "C2-7287916l", "S7-1175877v"]
+
+
+def test_it_converts_prices_to_numbers():
+    result = cleaning_util.clean_products_data(make_products())
+    assert result["product_price"].dtype == "float64"
+    assert result["product_price"][0] == 39.99
+    assert result["product_price"][1] == 1099
+    assert result["product_price"][2] == 12000.5
+
+
+def test_it_adds_weight_classes_after_weight_kg():
+    result = cleaning_util.clean_products_data(make_products())
+    assert result.columns.get_loc("weight_class") == result.columns.get_loc("weight_kg") + 1
+    assert result["weight_class"].tolist() == ["Light", "Mid_Sized", "Truck_Required"]
+
+
+def test_it_replaces_removed_with_still_avaliable():
+    result = cleaning_util.clean_products_data(make_products())
+    assert "removed" not in result.columns
+    assert result["still_avaliable"].dtype == "boolean"
+    assert result["still_avaliable"][:2].tolist() == [True, False]
+    assert pd.isna(result["still_avaliable"][2])
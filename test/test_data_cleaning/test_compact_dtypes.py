@@ -0,0 +1,78 @@
+import pandas as pd
+import numpy as np
+from src.data_cleaning import DataCleaning
+
+cleaning_util = DataCleaning()
+
+
+def make_stores():
+    return pd.DataFrame({
+        "store_code": ["WEB-1388012W", "HI-9B97EE4E", "LA-0772C7B9"],
+        "longitude": ["-0.12", "N/A", np.nan],
+        "staff_numbers": ["34", "J78", np.nan],
+        "opening_date": ["2012-10-06", np.nan, "2005-02-30"],
+        "store_type": ["Local", "Local", "Super Store"],
+        "continent": ["Europe", "Europe", np.nan]
+    })
+
+
+def test_it_converts_low_cardinality_columns_to_category():
+    result = cleaning_util.compact_dtypes(make_stores(), "stores")
+    assert isinstance(result["store_type"].dtype, pd.CategoricalDtype)
+    assert result["continent"].tolist()[:2] == ["Europe", "Europe"]
+    assert pd.isna(result["continent"][2])
+
+
+def test_it_converts_integer_columns_to_nullable_small_ints():
+    result = cleaning_util.compact_dtypes(make_stores(), "stores")
+    assert result["staff_numbers"].dtype == "Int16"
+    assert result["staff_numbers"][0] == 34
+    assert result["staff_numbers"][1:].isna().all()
+
+
+def test_it_converts_numeric_columns_to_floats():
+    result = cleaning_util.compact_dtypes(make_stores(), "stores")
+    assert result["longitude"].dtype == "float64"
+    assert result["longitude"][0] == -0.12
+    assert result["longitude"][1:].isna().all()
+
+
+def test_it_parses_dates_to_datetime64():
+    result = cleaning_util.compact_dtypes(make_stores(), "stores")
+    assert pd.api.types.is_datetime64_dtype(result["opening_date"])
+    assert result["opening_date"][0] == pd.Timestamp("2012-10-06")
+    assert result["opening_date"][1:].isna().all()
+
+
+def test_it_skips_missing_columns_and_keeps_other_columns():
+    sample = make_stores().drop(columns="continent")
+    result = cleaning_util.compact_dtypes(sample, "stores")
+    assert result.columns.tolist() == sample.columns.tolist()
+    assert result["store_code"].tolist() == sample["store_code"].tolist()
+
+
+def test_it_does_not_modify_the_original_dataframe():
+    sample = make_stores()
+    cleaning_util.compact_dtypes(sample, "stores")
+    assert sample.equals(make_stores())
+
+
+def test_it_adds_memory_before_and_after_to_memory_report():
+    util = DataCleaning(report_memory=True)
+    orders = pd.DataFrame({
+        "store_code": ["HI-9B97EE4E"] * 1000,
+        "product_code": ["A8-4686892S"] * 1000,
+        "product_quantity": [3] * 1000
+    })
+    result = util.compact_dtypes(orders, "orders")
+    util.compact_dtypes(orders, "orders")
+    report = util.memory_report["orders"]
+    assert report["bytes_before"] == 2 * orders.memory_usage(deep=True).sum()
+    assert report["bytes_after"] == 2 * result.memory_usage(deep=True).sum()
+    assert report["bytes_after"] < report["bytes_before"]
+
+
+def test_it_only_reports_memory_when_asked():
+    util = DataCleaning()
+    util.compact_dtypes(pd.DataFrame({"store_code": ["HI-9B97EE4E"], "product_quantity": [3]}), "orders")
+    assert util.memory_report == {}
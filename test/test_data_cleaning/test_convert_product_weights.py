@@ -20,11 +20,11 @@ def test_it_skips_weights_in_kg():
     sample_df = pd.DataFrame(sample_data)
     sample_df.set_index("index", inplace=True)
     result_df = cleaning_util.convert_product_weights(sample_df)
-    result = result_df.loc[0, "weight"]
-    expected = "1.6kg"
+    result = result_df.loc[0, "weight_kg"]
+    expected = 1.6
     assert result == expected
-    result = result_df.loc[1, "weight"]
-    expected = "0.46kg"
+    result = result_df.loc[1, "weight_kg"]
+    expected = 0.46
     assert result == expected
 
 
@@ -36,11 +36,11 @@ def test_it_converts_g_to_kg():
     sample_df = pd.DataFrame(sample_data)
     sample_df.set_index("index", inplace=True)
     result_df = cleaning_util.convert_product_weights(sample_df)
-    result = result_df.loc[1, "weight"]
-    expected = "0.125kg"
+    result = result_df.loc[1, "weight_kg"]
+    expected = 0.125
     assert result == expected
-    result = result_df.loc[3, "weight"]
-    expected = "0.59kg"
+    result = result_df.loc[3, "weight_kg"]
+    expected = 0.59
     assert result == expected
 
 
@@ -52,11 +52,11 @@ def test_it_converts_ml_to_kg():
     sample_df = pd.DataFrame(sample_data)
     sample_df.set_index("index", inplace=True)
     result_df = cleaning_util.convert_product_weights(sample_df)
-    result = result_df.loc[0, "weight"]
-    expected = "0.1kg"
+    result = result_df.loc[0, "weight_kg"]
+    expected = 0.1
     assert result == expected
-    result = result_df.loc[3, "weight"]
-    expected = "0.8kg"
+    result = result_df.loc[3, "weight_kg"]
+    expected = 0.8
     assert result == expected
 
 
@@ -68,11 +68,11 @@ def test_it_converts_oz_to_kg():
     sample_df = pd.DataFrame(sample_data)
     sample_df.set_index("index", inplace=True)
     result_df = cleaning_util.convert_product_weights(sample_df)
-    result = result_df.loc[1, "weight"]
-    expected = "0.454kg"
+    result = result_df.loc[1, "weight_kg"]
+    expected = 0.454
     assert result == expected
-    result = result_df.loc[3, "weight"]
-    expected = "0.34kg"
+    result = result_df.loc[3, "weight_kg"]
+    expected = 0.34
     assert result == expected
 
 
@@ -84,9 +84,32 @@ def test_it_replaces_invalid_values_with_nan():
     sample_df = pd.DataFrame(sample_data)
     sample_df.set_index("index", inplace=True)
     result_df = cleaning_util.convert_product_weights(sample_df)
-    result = result_df.loc[0, "weight"]
-    expected = np.nan
-    assert result is expected
-    result = result_df.loc[0, "weight"]
-    expected = np.nan
-    assert result is expected
+    result = result_df.loc[0, "weight_kg"]
+    assert np.isnan(result)
+    result = result_df.loc[3, "weight_kg"]
+    assert np.isnan(result)
+
+
+def test_it_returns_float64_weight_kg_column():
+    sample_data = {"weight": ["1.6kg", "12 x 100g", "C3NCA2CL35"]}
+    sample_df = pd.DataFrame(sample_data)
+    result_df = cleaning_util.convert_product_weights(sample_df)
+    assert "weight" not in result_df.columns
+    assert result_df["weight_kg"].dtype == np.float64
+    assert result_df.loc[1, "weight_kg"] == 1.2
+
+
+def test_it_converts_misstyped_and_multiple_weights():
+    sample_data = {"weight": ["77g .", "412g   .", "6 x 412g"]}
+    sample_df = pd.DataFrame(sample_data)
+    result_df = cleaning_util.convert_product_weights(sample_df)
+    assert result_df["weight_kg"].tolist() == [0.077, 0.412, 2.472]
+
+
+def test_it_reports_unmatched_weights():
+    sample_data = {"weight": ["C3NCA2CL35", "16oz", np.nan, "BSDTR67VD90"]}
+    sample_df = pd.DataFrame(sample_data)
+    cleaning_util.convert_product_weights(sample_df)
+    result = cleaning_util.unmatched_weights
+    assert result.index.tolist() == [0, 3]
+    assert result["weight"].tolist() == ["C3NCA2CL35", "BSDTR67VD90"]
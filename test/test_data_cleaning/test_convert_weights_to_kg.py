@@ -0,0 +1,19 @@
+import pandas as pd
+import numpy as np
+from src.data_cleaning import DataCleaning
+
+cleaning_util = DataCleaning()
+
+
+def test_it_converts_weights_to_kg():
+    sample = pd.Series(["1.6kg", "125g", "12 x 100g", "16oz", "77g .", "500ml"], index=[5, 4, 3, 2, 1, 0])
+    result = cleaning_util.convert_weights_to_kg(sample)
+    assert result.index.equals(sample.index)
+    assert result.tolist() == [1.6, 0.125, 1.2, 0.454, 0.077, 0.5]
+
+
+def test_it_records_unmatched_weights():
+    sample = pd.Series(["1kg", "VLPCU81M30", np.nan])
+    result = cleaning_util.convert_weights_to_kg(sample)
+    assert result.isna().tolist() == [False, True, True]
+    assert cleaning_util.unmatched_weights["weight"].tolist() == ["VLPCU81M30"]
@@ -0,0 +1,48 @@
+import pandas as pd
+import numpy as np
+from src.data_cleaning import DataCleaning
+
+cleaning_util = DataCleaning()
+
+
+def test_it_returns_pd_series():
+    sample = pd.Series(["2020-10-16", "16 Oct 2020"])
+    result = cleaning_util.fix_date_formats(sample)
+    assert isinstance(result, pd.Series)
+
+
+def test_it_reshapes_dates_with_incorrect_format():
+    sample = pd.Series([
+        "16 Oct 2020", "10 October 2019", "11-12-2014", "1968-10-16",
+        "2005/11/25", "October 2019 10", "1999 March 08"
+    ])
+    expected = [
+        "2020-10-16", "2019-10-10", "2014-12-11", "1968-10-16",
+        "2005-11-25", "2019-10-10", "1999-03-08"
+    ]
+    result = cleaning_util.fix_date_formats(sample)
+    assert result.tolist() == expected
+
+
+def test_it_returns_nan_for_invalid_dates():
+    sample = pd.Series(["ABCDER", np.nan, "NULL", "2005-02-30"])
+    result = cleaning_util.fix_date_formats(sample)
+    assert result.isna().all()
+
+
+def test_it_keeps_the_original_index():
+    sample = pd.Series(["2020-10-16", "ABCDER", "2019 October 10"], index=[5, 5, 2])
+    result = cleaning_util.fix_date_formats(sample)
+    assert result.index.tolist() == [5, 5, 2]
+    assert result.iloc[0] == "2020-10-16"
+    assert result.iloc[2] == "2019-10-10"
+
+
+def test_it_matches_fix_date_format():
+    sample = pd.Series([
+        "2020-10-06", "2020/10/16", "2020-1-5", "2020-13-01", "July 1961 14",
+        "1961 July 4", "5 July 1961", "Sept 2001 11", "16 Oct 2020", 20201016, None
+    ])
+    expected = sample.apply(cleaning_util.fix_date_format)
+    result = cleaning_util.fix_date_formats(sample)
+    assert result.equals(expected)
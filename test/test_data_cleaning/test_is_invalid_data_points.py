@@ -0,0 +1,40 @@
+import pandas as pd
+import numpy as np
+from src.data_cleaning import DataCleaning
+
+cleaning_util = DataCleaning()
+
+
+def test_it_returns_boolean_series():
+    sample = pd.Series(["evening", "Allen"])
+    result = cleaning_util.is_invalid_data_points(sample)
+    assert isinstance(result, pd.Series)
+    assert result.dtype == bool
+
+
+def test_it_returns_false_for_nan():
+    sample = pd.Series([np.nan, None])
+    result = cleaning_util.is_invalid_data_points(sample)
+    assert not result.any()
+
+
+def test_it_returns_true_for_invalid_data_points():
+    sample = pd.Series(["FIEOPTNBWZ", "LUVV7GL3QQ", "13KJZ890JH"])
+    result = cleaning_util.is_invalid_data_points(sample)
+    assert result.all()
+
+
+def test_it_returns_false_for_everything_else():
+    sample = pd.Series(["Allen", "Late_Hours", "Web Portal", "Super Store", "MY NAME 1"])
+    result = cleaning_util.is_invalid_data_points(sample)
+    assert not result.any()
+
+
+def test_it_matches_is_invalid_data_point():
+    sample = pd.Series(
+        ["evening", np.nan, "FIEOPTNBWZ", "LUVV7GL3QQ", "Allen", "Late_Hours", "GB", "1", 7, "", "A B"],
+        index=[3, 3, 1, 0, 9, 8, 7, 6, 5, 4, 2]
+    )
+    expected = sample.apply(cleaning_util.is_invalid_data_point)
+    result = cleaning_util.is_invalid_data_points(sample)
+    assert result.equals(expected)
@@ -0,0 +1,21 @@
+import numpy as np
+from src.data_cleaning import DataCleaning
+
+cleaning_util = DataCleaning()
+
+
+def test_it_accepts_card_numbers_passing_the_luhn_checksum():
+    assert cleaning_util.is_valid_card_number("4111111111111111")
+    assert cleaning_util.is_valid_card_number("79927398713")
+    assert cleaning_util.is_valid_card_number(30569309025904)
+
+
+def test_it_rejects_card_numbers_failing_the_luhn_checksum():
+    assert not cleaning_util.is_valid_card_number("4111111111111112")
+    assert not cleaning_util.is_valid_card_number("79927398710")
+
+
+def test_it_rejects_non_digit_values():
+    assert not cleaning_util.is_valid_card_number("?4111111111111111")
+    assert not cleaning_util.is_valid_card_number("")
+    assert not cleaning_util.is_valid_card_number(np.nan)
@@ -0,0 +1,35 @@
+import pandas as pd
+import numpy as np
+from src.data_cleaning import DataCleaning
+
+cleaning_util = DataCleaning()
+
+
+def test_it_returns_boolean_series():
+    sample = pd.Series(["4111111111111111", "4111111111111112"])
+    result = cleaning_util.is_valid_card_numbers(sample)
+    assert isinstance(result, pd.Series)
+    assert result.dtype == bool
+    assert result.tolist() == [True, False]
+
+
+def test_it_checks_card_numbers_of_different_lengths():
+    sample = pd.Series(["79927398713", "4111111111111111", "6011000990139424", "4222222222222"])
+    result = cleaning_util.is_valid_card_numbers(sample)
+    assert result.all()
+
+
+def test_it_returns_false_without_digit_card_numbers():
+    sample = pd.Series([np.nan, "?123", "", "४५"])
+    result = cleaning_util.is_valid_card_numbers(sample)
+    assert not result.any()
+
+
+def test_it_matches_is_valid_card_number():
+    sample = pd.Series(
+        ["4111111111111111", "79927398710", np.nan, "ABCD", 30569309025904, "0", "00", "18"],
+        index=[7, 7, 5, 4, 3, 2, 1, 0]
+    )
+    expected = sample.apply(cleaning_util.is_valid_card_number)
+    result = cleaning_util.is_valid_card_numbers(sample)
+    assert result.equals(expected)
@@ -0,0 +1,24 @@
+import pandas as pd
+import numpy as np
+from src.data_cleaning import DataCleaning
+
+cleaning_util = DataCleaning()
+
+
+def test_it_removes_alpha_letters():
+    sample = pd.Series(["J78", "80R", "3e0", "320", 46])
+    result = cleaning_util.remove_alpha_letters_from_staff_numbers(sample)
+    assert result.tolist() == ["78", "80", "30", "320", "46"]
+
+
+def test_it_skips_nans():
+    sample = pd.Series([np.nan, "J78", np.nan])
+    result = cleaning_util.remove_alpha_letters_from_staff_numbers(sample)
+    assert result.isna().tolist() == [True, False, True]
+
+
+def test_it_matches_remove_alpha_letters_from_staff_number():
+    sample = pd.Series(["J78", "80R", np.nan, "J78", 46, "1_2", "ABC"], index=[6, 6, 4, 3, 2, 1, 0])
+    expected = sample.apply(cleaning_util.remove_alpha_letters_from_staff_number)
+    result = cleaning_util.remove_alpha_letters_from_staff_numbers(sample)
+    assert result.equals(expected)
@@ -0,0 +1,64 @@
+"""
+Card details PDF shared by the PDF extraction tests and benchmark/benchmark_pdf_extraction.py.
+
+The PDF is written by hand, with one table of ROWS_PER_PAGE rows of random card details per
+page, drawn as text at the x positions of COLUMNS, so both PDF backends can read it.
+"""
+import pandas as pd
+
+CARD_PROVIDERS = ["VISA 16 digit", "Mastercard", "American Express", "JCB 16 digit", "Diners Club / Carte Blanche"]
+COLUMNS = {"card_number": 40, "expiry_date": 180, "card_provider": 260, "date_payment_confirmed": 440}
+ROWS_PER_PAGE = 50
+
+
+def make_card_rows(rows: int, rng) -> list:
+    """
+    Build card details rows as lists of strings, in COLUMNS order.
+    """
+    card_numbers = rng.integers(10**15, 10**16, size=rows)
+    months = rng.integers(1, 13, size=rows)
+    years = rng.integers(22, 32, size=rows)
+    providers = rng.choice(CARD_PROVIDERS, size=rows)
+    confirmed = pd.Timestamp("2000-01-01") + pd.to_timedelta(rng.integers(0, 8000, size=rows), unit="D")
+    return [
+        [str(card_numbers[i]), f"{months[i]:02d}/{years[i]}", providers[i], confirmed[i].strftime("%Y-%m-%d")]
+        for i in range(rows)
+    ]
+
+
+def write_card_details_pdf(path: str, pages: int, rng) -> None:
+    """
+    Write a PDF with one card details table of ROWS_PER_PAGE rows on every page.
+    """
+    page_ids = [4 + 2 * page for page in range(pages)]
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{' '.join(f'{i} 0 R' for i in page_ids)}] /Count {pages} >>".encode(),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"
+    ]
+    for page, page_id in enumerate(page_ids):
+        rows = [list(COLUMNS)] + make_card_rows(ROWS_PER_PAGE, rng)
+        content = "BT /F1 9 Tf\n"
+        for row_number, row in enumerate(rows):
+            y = 750 - 14 * row_number
+            for x, text in zip(COLUMNS.values(), row):
+                content += f"1 0 0 1 {x} {y} Tm ({text}) Tj\n"
+        content = (content + "ET").encode()
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {page_id + 1} 0 R >>".encode()
+        )
+        objects.append(f"<< /Length {len(content)} >>\nstream\n".encode() + content + b"\nendstream")
+
+    pdf = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for object_id, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += f"{object_id} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref_offset = len(pdf)
+    pdf += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        pdf += f"{offset:010d} 00000 n \n".encode()
+    pdf += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n".encode()
+    with open(path, "wb") as file:
+        file.write(pdf)
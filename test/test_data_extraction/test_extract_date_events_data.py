@@ -0,0 +1,88 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+import json
+import pytest
+import pandas as pd
+from src.data_extraction import DataExtractor
+from src.extraction_cache import ExtractionCache
+
+DATE_EVENTS = {
+    "timestamp": {"0": "22:00:06", "1": "22:44:06"},
+    "month": {"0": "9", "1": "2"},
+    "year": {"0": "2012", "1": "1997"},
+    "day": {"0": "19", "1": "10"},
+    "time_period": {"0": "Evening", "1": "Evening"},
+    "date_uuid": {"0": "3b7ca996-37f9-433f-b6d0-ce8391b615ad", "1": "adc86836-6c35-49ca-bb0d-65b6507a00fa"}
+}
+
+
+class StubFileHandler(BaseHTTPRequestHandler):
+    """
+    Serves date_details.json with an ETag, answering conditional requests with 304.
+    """
+    def do_HEAD(self):
+        self.respond(send_body=False)
+
+    def do_GET(self):
+        self.respond(send_body=True)
+
+    def respond(self, send_body):
+        self.server.requests.append(self.command)
+        etag = f'"v{self.server.version}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        payload = json.dumps(DATE_EVENTS).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        if send_body:
+            self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubFileHandler)
+    server.requests = []
+    server.version = 1
+    thread = Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def file_url(server):
+    host, port = server.server_address
+    return f"http://{host}:{port}/date_details.json"
+
+
+def test_it_returns_date_events_dataframe(stub_server):
+    extractor = DataExtractor()
+    result = extractor.extract_date_events_data(file_url(stub_server))
+    assert isinstance(result, pd.DataFrame)
+    assert result["time_period"].tolist() == ["Evening", "Evening"]
+    assert stub_server.requests == ["GET"]
+
+
+def test_it_returns_the_cached_data_when_not_modified(stub_server, tmp_path):
+    extractor = DataExtractor(cache=ExtractionCache(str(tmp_path)))
+    first = extractor.extract_date_events_data(file_url(stub_server))
+    second = extractor.extract_date_events_data(file_url(stub_server))
+    assert second.equals(first)
+    # nothing to revalidate before the first download, which gives the ETag
+    assert stub_server.requests == ["GET", "HEAD"]
+
+
+def test_it_downloads_the_data_again_when_modified(stub_server, tmp_path):
+    extractor = DataExtractor(cache=ExtractionCache(str(tmp_path)))
+    extractor.extract_date_events_data(file_url(stub_server))
+    stub_server.version = 2
+    extractor.extract_date_events_data(file_url(stub_server))
+    assert stub_server.requests == ["GET", "HEAD", "GET"]
@@ -0,0 +1,114 @@
+from moto import mock_s3
+import os
+import boto3
+import pytest
+import pandas as pd
+from src.data_extraction import DataExtractor
+from src.extraction_cache import ExtractionCache
+
+BUCKET_NAME = "data-handling-public"
+
+
+def make_products(rows, start=0):
+    return pd.DataFrame({
+        "product_name": [f"product {i}" for i in range(start, start + rows)],
+        "product_price": [f"£{i % 100}.99" for i in range(start, start + rows)],
+        "weight": [f"{i % 7 + 1}kg" for i in range(start, start + rows)]
+    }, index=range(start, start + rows))
+
+
+@pytest.fixture
+def s3(monkeypatch, tmp_path):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "eu-west-1")
+    monkeypatch.chdir(tmp_path)
+    with mock_s3():
+        client = boto3.client("s3")
+        client.create_bucket(Bucket=BUCKET_NAME, CreateBucketConfiguration={"LocationConstraint": "eu-west-1"})
+        yield client
+
+
+def put_csv(s3, key, df):
+    s3.put_object(Bucket=BUCKET_NAME, Key=key, Body=df.to_csv().encode())
+
+
+def test_it_streams_an_object_without_writing_to_disk(s3, tmp_path):
+    products = make_products(100)
+    put_csv(s3, "products.csv", products)
+    result = DataExtractor().extract_from_s3(f"s3://{BUCKET_NAME}/products.csv")
+    assert result.equals(products)
+    assert os.listdir(tmp_path) == []
+
+
+def test_it_fetches_large_objects_in_byte_ranges(s3):
+    products = make_products(2_000)
+    put_csv(s3, "products.csv", products)
+    result = DataExtractor().extract_from_s3(f"s3://{BUCKET_NAME}/products.csv", max_workers=4, part_size=1_000)
+    assert result.equals(products)
+
+
+def test_it_loads_objects_matching_a_glob_in_key_order(s3):
+    put_csv(s3, "products/part-0002.csv", make_products(10, start=10))
+    put_csv(s3, "products/part-0001.csv", make_products(10))
+    s3.put_object(Bucket=BUCKET_NAME, Key="products/_SUCCESS", Body=b"")
+    result = DataExtractor().extract_from_s3(f"s3://{BUCKET_NAME}/products/part-*.csv")
+    assert result.equals(make_products(20))
+
+
+def test_it_loads_every_object_under_a_prefix(s3):
+    put_csv(s3, "products/part-0001.csv", make_products(10))
+    put_csv(s3, "products/part-0002.csv", make_products(10, start=10))
+    put_csv(s3, "other/part-0003.csv", make_products(10, start=20))
+    result = DataExtractor().extract_from_s3(f"s3://{BUCKET_NAME}/products/")
+    assert result.equals(make_products(20))
+
+
+def test_it_raises_when_no_object_matches(s3):
+    with pytest.raises(ValueError):
+        DataExtractor().extract_from_s3(f"s3://{BUCKET_NAME}/products/*.csv")
+
+
+def test_it_reuses_the_cached_extract_while_the_etag_matches(s3, tmp_path, capsys):
+    put_csv(s3, "products.csv", make_products(10))
+    extractor = DataExtractor(cache=ExtractionCache(str(tmp_path / "cache")))
+    extractor.extract_from_s3(f"s3://{BUCKET_NAME}/products.csv")
+    capsys.readouterr()
+    cached = extractor.extract_from_s3(f"s3://{BUCKET_NAME}/products.csv")
+    assert "using cached extract" in capsys.readouterr().out
+    put_csv(s3, "products.csv", make_products(5))
+    changed = extractor.extract_from_s3(f"s3://{BUCKET_NAME}/products.csv")
+    assert "using cached extract" not in capsys.readouterr().out
+    assert cached.equals(make_products(10))
+    assert changed.equals(make_products(5))
+
+
+def test_it_reuses_the_cached_extract_of_an_unchanged_glob(s3, tmp_path, capsys):
+    put_csv(s3, "products/part-0001.csv", make_products(10))
+    extractor = DataExtractor(cache=ExtractionCache(str(tmp_path / "cache")))
+    extractor.extract_from_s3(f"s3://{BUCKET_NAME}/products/*.csv")
+    capsys.readouterr()
+    extractor.extract_from_s3(f"s3://{BUCKET_NAME}/products/*.csv")
+    assert "using cached extract" in capsys.readouterr().out
+    put_csv(s3, "products/part-0002.csv", make_products(10, start=10))
+    result = extractor.extract_from_s3(f"s3://{BUCKET_NAME}/products/*.csv")
+    assert result.equals(make_products(20))
+
+
+def test_it_only_revalidates_objects_it_has_cached(s3, tmp_path, monkeypatch):
+    put_csv(s3, "products.csv", make_products(10))
+    validated = []
+    validate_source = DataExtractor._DataExtractor__validate_source
+
+    def record_validation(self, source, entry):
+        validated.append(entry)
+        return validate_source(self, source, entry)
+
+    monkeypatch.setattr(DataExtractor, "_DataExtractor__validate_source", record_validation)
+    extractor = DataExtractor(cache=ExtractionCache(str(tmp_path / "cache")))
+    extractor.extract_from_s3(f"s3://{BUCKET_NAME}/products.csv")
+    assert validated == []
+    # the head_object of the download gave the ETag the next call revalidates
+    extractor.extract_from_s3(f"s3://{BUCKET_NAME}/products.csv")
+    assert len(validated) == 1
+    assert validated[0]["etag"] == s3.head_object(Bucket=BUCKET_NAME, Key="products.csv")["ETag"]
@@ -0,0 +1,79 @@
+from pypdf import PdfWriter
+import shutil
+import numpy as np
+import pandas as pd
+import pytest
+import tabula
+from card_details_pdf import write_card_details_pdf, make_card_rows, ROWS_PER_PAGE, COLUMNS
+from src.data_extraction import TabulaBackend, PdfPlumberBackend
+
+NUMBER_OF_PAGES = 3
+
+
+@pytest.fixture(scope="module")
+def card_details_pdf(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("pdf") / "card_details.pdf")
+    write_card_details_pdf(path, NUMBER_OF_PAGES, np.random.default_rng(0))
+    return path
+
+
+def read_all_pages(backend, path):
+    pages = backend.read_pages(path, list(range(1, NUMBER_OF_PAGES + 1)))
+    return pd.concat([table for tables in pages for table in tables])
+
+
+def test_pdfplumber_reads_one_table_per_page(card_details_pdf):
+    pages = PdfPlumberBackend().read_pages(card_details_pdf, [2, 3])
+    assert [len(tables) for tables in pages] == [1, 1]
+    assert pages[0][0].columns.tolist() == list(COLUMNS)
+    assert len(pages[0][0]) == ROWS_PER_PAGE
+
+
+def test_pdfplumber_reads_the_card_details(card_details_pdf):
+    rng = np.random.default_rng(0)
+    expected = [row for _ in range(NUMBER_OF_PAGES) for row in make_card_rows(ROWS_PER_PAGE, rng)]
+    result = read_all_pages(PdfPlumberBackend(), card_details_pdf)
+    assert result["card_number"].dtype == np.int64
+    assert result.astype(str).values.tolist() == expected
+
+
+def test_pdfplumber_returns_no_table_for_empty_pages(tmp_path):
+    writer = PdfWriter()
+    writer.add_blank_page(width=100, height=100)
+    path = str(tmp_path / "blank.pdf")
+    with open(path, "wb") as file:
+        writer.write(file)
+    assert PdfPlumberBackend().read_pages(path, [1]) == [[]]
+
+
+@pytest.mark.skipif(shutil.which("java") is None, reason="tabula needs a Java runtime")
+def test_pdfplumber_matches_tabula(card_details_pdf):
+    expected = read_all_pages(TabulaBackend(), card_details_pdf)
+    result = read_all_pages(PdfPlumberBackend(), card_details_pdf)
+    assert result.columns.tolist() == expected.columns.tolist()
+    assert len(result) == len(expected)
+    assert result.astype(str).values.tolist() == expected.astype(str).values.tolist()
+
+
+def test_tabula_reads_a_block_of_pages_with_one_call(monkeypatch):
+    def json_table(page, *rows):
+        return {"page_number": page, "data": [[{"text": text} for text in row] for row in rows]}
+
+    calls = []
+
+    def read_pdf(path, **options):
+        calls.append((path, options))
+        return [
+            json_table(2, ["card_number", "card_provider"], ["4111", "VISA 16 digit"]),
+            json_table(4, ["card_number", "card_provider"], ["5500", "Mastercard"]),
+            json_table(4, ["expiry_date"], ["09/26"])
+        ]
+
+    monkeypatch.setattr(tabula, "read_pdf", read_pdf)
+    pages = TabulaBackend().read_pages("card_details.pdf", range(2, 5))
+    assert calls == [("card_details.pdf", {"pages": [2, 3, 4], "output_format": "json", "force_subprocess": True})]
+    assert [len(tables) for tables in pages] == [1, 0, 2]
+    pd.testing.assert_frame_equal(
+        pages[0][0], pd.DataFrame({"card_number": [4111], "card_provider": ["VISA 16 digit"]})
+    )
+    assert pages[2][1].columns.tolist() == ["expiry_date"]
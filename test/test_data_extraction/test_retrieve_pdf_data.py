@@ -0,0 +1,64 @@
+from pypdf import PdfReader, PdfWriter
+import numpy as np
+import pandas as pd
+from card_details_pdf import write_card_details_pdf, COLUMNS
+from src.data_extraction import DataExtractor
+from src.extraction_cache import ExtractionCache
+
+NUMBER_OF_PAGES = 7
+parsed_pages = []
+
+
+class PageWidthBackend():
+    """
+    Stand-in PDF backend: one table per page holding the page number and width.
+    """
+    def read_pages(self, path, pages):
+        reader = PdfReader(path)
+        parsed_pages.extend(pages)
+        return [
+            [pd.DataFrame({"page": [page], "width": [float(reader.pages[page - 1].mediabox.width)]})]
+            for page in pages
+        ]
+
+
+def write_pdf(path, widths):
+    writer = PdfWriter()
+    for width in widths:
+        writer.add_blank_page(width=width, height=100)
+    with open(path, "wb") as file:
+        writer.write(file)
+
+
+def test_it_returns_tables_in_page_order_from_worker_processes(tmp_path):
+    pdf_path = str(tmp_path / "cards.pdf")
+    write_pdf(pdf_path, [100 + page for page in range(NUMBER_OF_PAGES)])
+    extractor = DataExtractor(pdf_backend=PageWidthBackend())
+    result = extractor.retrieve_pdf_data(pdf_path, max_workers=2, pages_per_shard=2)
+    assert result["page"].tolist() == list(range(1, NUMBER_OF_PAGES + 1))
+    assert result["width"].tolist() == [100.0 + page for page in range(NUMBER_OF_PAGES)]
+    assert result.index.tolist() == [0] * NUMBER_OF_PAGES
+
+
+def test_it_only_parses_changed_pages_again(tmp_path):
+    pdf_path = str(tmp_path / "cards.pdf")
+    widths = [100 + page for page in range(NUMBER_OF_PAGES)]
+    write_pdf(pdf_path, widths)
+    extractor = DataExtractor(cache=ExtractionCache(str(tmp_path / "cache")), pdf_backend=PageWidthBackend())
+    extractor.retrieve_pdf_data(pdf_path, max_workers=1)
+    parsed_pages.clear()
+
+    widths[3] = 500
+    write_pdf(pdf_path, widths)
+    result = extractor.retrieve_pdf_data(pdf_path, max_workers=1)
+    assert parsed_pages == [4]
+    assert result["width"].tolist() == widths
+
+
+def test_it_caches_pages_per_backend(tmp_path):
+    pdf_path = str(tmp_path / "cards.pdf")
+    write_card_details_pdf(pdf_path, 2, np.random.default_rng(0))
+    cache = ExtractionCache(str(tmp_path / "cache"))
+    DataExtractor(cache=cache, pdf_backend=PageWidthBackend()).retrieve_pdf_data(pdf_path, max_workers=1)
+    result = DataExtractor(cache=cache, pdf_backend="pdfplumber").retrieve_pdf_data(pdf_path, max_workers=1)
+    assert result.columns.tolist() == list(COLUMNS)
@@ -0,0 +1,96 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+import json
+import pytest
+import pandas as pd
+from src.data_extraction import DataExtractor
+from src.extraction_cache import ExtractionCache
+
+NUMBER_OF_STORES = 25
+
+
+class StubStoresHandler(BaseHTTPRequestHandler):
+    """
+    Serves the number_stores and store_details/%i endpoints of the stores API.
+
+    Stores listed in the server's 'failures' dict answer with the given status
+    code on their first request(s) before succeeding.
+    """
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        if self.headers.get("x-api-key") != "test-key":
+            return self.send_json(403, {"message": "Forbidden"})
+        if self.path == "/prod/number_stores":
+            return self.send_json(200, {"statusCode": 200, "number_stores": NUMBER_OF_STORES})
+        store_index = int(self.path.rsplit("/", 1)[-1])
+        failures = self.server.failures.get(store_index)
+        if failures:
+            status_code = failures.pop(0)
+            return self.send_json(status_code, {"message": "try again"})
+        return self.send_json(200, {"index": store_index, "store_code": f"STORE-{store_index}"})
+
+    def send_json(self, status_code, body):
+        payload = json.dumps(body).encode()
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubStoresHandler)
+    server.requests = []
+    server.failures = {}
+    thread = Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def base_url(server):
+    host, port = server.server_address
+    return f"http://{host}:{port}/prod"
+
+
+def test_it_lists_number_of_stores(stub_server):
+    extractor = DataExtractor()
+    url = base_url(stub_server) + "/number_stores"
+    result = extractor.list_number_of_stores(url, {"x-api-key": "test-key"})
+    assert result == NUMBER_OF_STORES
+
+
+def test_it_returns_stores_in_store_order(stub_server):
+    extractor = DataExtractor()
+    url = base_url(stub_server) + "/store_details/%i"
+    result = extractor.retrieve_store_data(url, {"x-api-key": "test-key"}, NUMBER_OF_STORES, max_workers=8)
+    assert isinstance(result, pd.DataFrame)
+    assert result["index"].tolist() == list(range(NUMBER_OF_STORES))
+    assert result.loc[7, "store_code"] == "STORE-7"
+
+
+def test_it_retries_throttled_and_failed_requests(stub_server):
+    extractor = DataExtractor()
+    stub_server.failures = {3: [429], 5: [503, 500]}
+    url = base_url(stub_server) + "/store_details/%i"
+    result = extractor.retrieve_store_data(
+        url, {"x-api-key": "test-key"}, NUMBER_OF_STORES, max_workers=4, retries=3, backoff_factor=0
+    )
+    assert result["index"].tolist() == list(range(NUMBER_OF_STORES))
+    assert stub_server.requests.count("/prod/store_details/3") == 2
+    assert stub_server.requests.count("/prod/store_details/5") == 3
+    assert len(stub_server.requests) == NUMBER_OF_STORES + 3
+
+
+def test_it_reuses_cached_stores_until_they_expire(stub_server, tmp_path):
+    extractor = DataExtractor(cache=ExtractionCache(str(tmp_path)))
+    url = base_url(stub_server) + "/store_details/%i"
+    first = extractor.retrieve_store_data(url, {"x-api-key": "test-key"}, NUMBER_OF_STORES)
+    second = extractor.retrieve_store_data(url, {"x-api-key": "test-key"}, NUMBER_OF_STORES)
+    assert second.equals(first)
+    assert len(stub_server.requests) == NUMBER_OF_STORES
@@ -0,0 +1,107 @@
+from threading import Lock
+from psycopg2 import sql
+import pytest
+
+
+def render(statement) -> str:
+    """
+    Render a statement built with psycopg2.sql without a database connection.
+    """
+    if isinstance(statement, str):
+        return statement
+    if isinstance(statement, sql.Composed):
+        return "".join(render(part) for part in statement.seq)
+    if isinstance(statement, sql.Identifier):
+        return ".".join('"' + string.replace('"', '""') + '"' for string in statement.strings)
+    if isinstance(statement, sql.SQL):
+        return statement.string
+    if isinstance(statement, sql.Literal):
+        return repr(statement.wrapped)
+    raise TypeError(f"cannot render {statement!r}")
+
+
+class FakeCursor():
+    def __init__(self, connection):
+        self.connection = connection
+        self.result = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+    def execute(self, statement, params=None):
+        statement = render(statement)
+        self.connection.record(statement, params)
+        results = self.connection.engine.results
+        self.result = next((row for key, row in results.items() if key in statement), None)
+
+    def fetchone(self):
+        return self.result
+
+    def copy_expert(self, statement, buffer):
+        statement = render(statement)
+        self.connection.record(statement, buffer.read())
+
+
+class FakeConnection():
+    def __init__(self, engine, number):
+        self.engine = engine
+        self.number = number
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def record(self, statement, payload):
+        self.engine.record(self.number, statement, payload)
+
+    def commit(self):
+        self.engine.record(self.number, "COMMIT", None)
+
+    def rollback(self):
+        self.engine.record(self.number, "ROLLBACK", None)
+
+    def close(self):
+        self.engine.record(self.number, "CLOSE", None)
+
+
+class FakeEngine():
+    """
+    Engine handing out fake raw connections that record their statements instead of running them.
+
+    Attributes:
+        log (list): (connection number, statement, parameters or COPY payload) of every call.
+        results (dict): Row fetched after the statements containing each key.
+        fail_on (callable): Called with every statement and payload; the call raises if it returns True.
+    """
+    def __init__(self, fail_on=None):
+        self.log = []
+        self.results = {"pg_constraint": (False, False, False)}
+        self.fail_on = fail_on
+        self.__connections = 0
+        self.__lock = Lock()
+
+    def raw_connection(self):
+        with self.__lock:
+            self.__connections += 1
+            return FakeConnection(self, self.__connections)
+
+    def record(self, number, statement, payload):
+        with self.__lock:
+            self.log.append((number, statement, payload))
+        if self.fail_on is not None and self.fail_on(statement, payload):
+            raise RuntimeError(f"failed: {statement}")
+
+    def statements(self) -> list:
+        return [statement for _, statement, _ in self.log]
+
+    def copies(self) -> list:
+        return [payload for _, statement, payload in self.log if statement.startswith("COPY")]
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    # Identifier.as_string needs a real connection to quote
+    monkeypatch.setattr(sql.Identifier, "as_string", lambda self, context: render(self))
+    return FakeEngine()
@@ -0,0 +1,25 @@
+import pandas as pd
+from src.database_utils import DatabaseConnector
+
+connection = DatabaseConnector()
+align_dtypes = connection._DatabaseConnector__align_dtypes
+DTYPES = pd.DataFrame({"quantity": [1], "price": [1.5], "code": ["a"]}).dtypes
+
+
+def test_it_converts_integer_columns_read_as_floats_to_nullable_integers():
+    chunk = pd.DataFrame({"quantity": [3.0, float("nan")], "price": [2.5, float("nan")], "code": ["b", None]})
+    result = align_dtypes(chunk, DTYPES)
+    assert result["quantity"].dtype == "Int64"
+    assert result["quantity"].tolist() == [3, pd.NA]
+    assert result["price"].dtype == "float64"
+    assert result["code"].dtype == object
+
+
+def test_it_returns_chunks_with_the_first_dtypes_unchanged():
+    chunk = pd.DataFrame({"quantity": [3], "price": [2.5], "code": ["b"]})
+    assert align_dtypes(chunk, DTYPES) is chunk
+
+
+def test_it_ignores_columns_missing_from_the_first_chunk():
+    chunk = pd.DataFrame({"extra": [1.0, float("nan")]})
+    assert align_dtypes(chunk, DTYPES) is chunk
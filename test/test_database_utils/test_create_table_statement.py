@@ -0,0 +1,45 @@
+import pandas as pd
+import pytest
+from src.database_utils import DatabaseConnector
+from conftest import render
+
+connection = DatabaseConnector()
+create_table_statement = connection._DatabaseConnector__create_table_statement
+STORES = pd.DataFrame({"store_code": ["WEB-1"], "staff_numbers": [12], "latitude": [1.5]})
+
+
+def test_it_creates_tables_of_table_schemas_with_their_types():
+    statement = create_table_statement(STORES, "dim_store_details", "dim_store_details_staging", None)
+    assert render(statement) == (
+        'CREATE TABLE "dim_store_details_staging" '
+        '("store_code" VARCHAR(40), "staff_numbers" SMALLINT, "latitude" FLOAT8)'
+    )
+
+
+def test_it_creates_unlogged_tables():
+    statement = create_table_statement(STORES, "dim_store_details", "staging", None, unlogged=True)
+    assert render(statement).startswith('CREATE UNLOGGED TABLE "staging" (')
+    statement = create_table_statement(STORES, "other_table", "staging", None, unlogged=True)
+    assert statement.strip().startswith('CREATE UNLOGGED TABLE "staging"')
+
+
+def test_it_creates_other_tables_with_the_types_pandas_infers():
+    statement = create_table_statement(STORES, "other_table", "other_table_staging", None)
+    assert statement.strip().startswith('CREATE TABLE "other_table_staging"')
+    assert '"staff_numbers" INTEGER' in statement
+    assert '"latitude" REAL' in statement
+
+
+def test_it_rejects_columns_missing_from_the_table_schema():
+    with pytest.raises(ValueError, match="columns extra of dim_store_details are not in TABLE_SCHEMAS"):
+        create_table_statement(STORES.assign(extra=1), "dim_store_details", "staging", None)
+
+
+@pytest.mark.parametrize("streams", [1, 3])
+def test_uploads_with_unknown_columns_fail_before_creating_or_copying_anything(engine, streams):
+    with DatabaseConnector(upload_streams=streams) as uploader:
+        with pytest.raises(ValueError):
+            uploader.upload_to_db(STORES.assign(extra=1), "dim_store_details", engine)
+    statements = engine.statements()
+    assert not any(statement.startswith(("CREATE", "COPY", "ALTER", "COMMIT")) for statement in statements)
+    assert not any('"dim_store_details"' in statement for statement in statements)
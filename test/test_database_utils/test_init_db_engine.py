@@ -0,0 +1,78 @@
+import yaml
+import pytest
+from src.database_utils import DatabaseConnector
+
+RDS_CREDS = {
+    "RDS_HOST": "rds.example.com",
+    "RDS_PASSWORD": "secret",
+    "RDS_USER": "reader",
+    "RDS_DATABASE": "postgres",
+    "RDS_PORT": 5432
+}
+LOCAL_CREDS = {
+    "HOST": "localhost",
+    "PASSWORD": "secret",
+    "USER": "writer",
+    "DATABASE": "sales_data",
+    "PORT": 5432
+}
+
+
+@pytest.fixture
+def connection(tmp_path):
+    creds_path = tmp_path / "db_creds.yaml"
+    creds_path.write_text(yaml.safe_dump(RDS_CREDS))
+    upload_creds_path = tmp_path / "local_db_creds.yaml"
+    upload_creds_path.write_text(yaml.safe_dump(LOCAL_CREDS))
+    connection = DatabaseConnector(pool_size=3, max_overflow=2, statement_timeout=60000)
+    connection.creds_url = str(creds_path)
+    connection.upload_creds_url = str(upload_creds_path)
+    yield connection
+    connection.dispose_engines()
+
+
+def test_it_builds_engine_from_creds(connection):
+    engine = connection.init_db_engine()
+    assert engine.url.host == "rds.example.com"
+    assert engine.url.username == "reader"
+    engine = connection.init_upload_db_engine()
+    assert engine.url.host == "localhost"
+    assert engine.url.database == "sales_data"
+
+
+def test_it_returns_the_same_engine_per_target(connection):
+    assert connection.init_db_engine() is connection.init_db_engine()
+    assert connection.init_upload_db_engine() is connection.init_upload_db_engine()
+    assert connection.init_db_engine() is not connection.init_upload_db_engine()
+
+
+def test_it_reads_creds_only_once(connection, tmp_path):
+    connection.init_db_engine()
+    connection.dispose_engines()
+    (tmp_path / "db_creds.yaml").write_text(yaml.safe_dump({**RDS_CREDS, "RDS_HOST": "changed"}))
+    engine = connection.init_db_engine()
+    assert engine.url.host == "rds.example.com"
+
+
+def test_it_applies_pool_settings(connection):
+    engine = connection.init_db_engine()
+    assert engine.pool.size() == 3
+    assert engine.pool._max_overflow == 2
+    assert engine.pool._pre_ping is True
+    assert "stream_results" not in engine.get_execution_options()
+
+
+def test_it_rebuilds_engines_after_dispose(connection):
+    engine = connection.init_upload_db_engine()
+    connection.dispose_engines()
+    assert connection.init_upload_db_engine() is not engine
+
+
+def test_it_disposes_engines_on_exit(tmp_path):
+    upload_creds_path = tmp_path / "local_db_creds.yaml"
+    upload_creds_path.write_text(yaml.safe_dump(LOCAL_CREDS))
+    with DatabaseConnector() as connection:
+        connection.upload_creds_url = str(upload_creds_path)
+        engine = connection.init_upload_db_engine()
+    assert connection.init_upload_db_engine() is not engine
+    connection.dispose_engines()
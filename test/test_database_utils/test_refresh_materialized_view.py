@@ -0,0 +1,28 @@
+import pytest
+from src.database_utils import DatabaseConnector
+
+
+def test_it_skips_a_view_that_does_not_exist(engine):
+    assert DatabaseConnector().refresh_materialized_view("sales_summary", engine) is False
+    assert engine.statements() == ["SELECT 1 FROM pg_matviews WHERE matviewname = %s", "CLOSE"]
+    assert engine.log[0][2] == ("sales_summary",)
+
+
+@pytest.mark.parametrize("concurrently, refresh", [
+    (True, 'REFRESH MATERIALIZED VIEW CONCURRENTLY "sales_summary"'),
+    (False, 'REFRESH MATERIALIZED VIEW  "sales_summary"')
+])
+def test_it_refreshes_an_existing_view(engine, concurrently, refresh):
+    engine.results["pg_matviews"] = (1,)
+    assert DatabaseConnector().refresh_materialized_view("sales_summary", engine, concurrently) is True
+    assert engine.statements() == [
+        "SELECT 1 FROM pg_matviews WHERE matviewname = %s", refresh, "COMMIT", "CLOSE"
+    ]
+
+
+def test_it_rolls_back_a_failed_refresh(engine):
+    engine.results["pg_matviews"] = (1,)
+    engine.fail_on = lambda statement, payload: statement.startswith("REFRESH")
+    with pytest.raises(RuntimeError):
+        DatabaseConnector().refresh_materialized_view("sales_summary", engine)
+    assert engine.statements()[-2:] == ["ROLLBACK", "CLOSE"]
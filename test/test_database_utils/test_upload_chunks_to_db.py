@@ -0,0 +1,122 @@
+from datetime import date, timedelta
+import pandas as pd
+import pytest
+from src.data_cleaning import DataCleaning
+from src.database_utils import DatabaseConnector
+
+ROWS = 60
+CHUNKSIZE = 25
+DATE_FORMATS = ["%Y-%m-%d", "%Y/%m/%d", "%B %Y %d", "%Y %B %d", "%d %B %Y"]
+NAMES = ["Sigfried", "Guy", "Harry", "Sophie", "Jürgen", "Ann-Marie", "Mary Ann"]
+COUNTRIES = [("Germany", "DE"), ("United Kingdom", "GB"), ("United Kingdom", "GGB"), ("United States", "US")]
+
+
+def make_users(rows):
+    """
+    Dirty legacy_users records: mixed date formats, "GGB" codes, "@@" emails, NULL and garbage rows.
+    """
+    records = []
+    for i in range(rows):
+        country, country_code = COUNTRIES[i % len(COUNTRIES)]
+        records.append({
+            "index": i,
+            "first_name": NAMES[i % 7],
+            "last_name": NAMES[(i + 3) % 7],
+            "date_of_birth": (date(1960, 1, 1) + timedelta(days=97 * i)).strftime(DATE_FORMATS[i % 5]),
+            "company": f"company {i % 3}",
+            "email_address": f"{NAMES[i % 7]}{i}@{'@' if i % 9 == 0 else ''}example.com",
+            "address": f"{i} High Street",
+            "country": country,
+            "country_code": country_code,
+            "phone_number": f"+44(0){7000000 + i}",
+            "join_date": (date(2000, 1, 1) + timedelta(days=31 * i)).strftime(DATE_FORMATS[(i + 2) % 5]),
+            "user_uuid": f"00000000-0000-4000-8000-{i:012d}"
+        })
+        if i % 20 == 7:
+            records[-1].update(dict.fromkeys(list(records[-1])[1:], "NULL"))
+        elif i % 20 == 13:
+            records[-1].update(dict.fromkeys(list(records[-1])[1:], f"X{i}QZ7"))
+    return records
+
+
+def make_orders(rows):
+    """
+    orders_table records, with the empty columns the cleaning drops.
+    """
+    return [{
+        "level_0": i,
+        "index": i,
+        "date_uuid": f"00000000-0000-4000-8000-{i:012d}",
+        "first_name": None,
+        "last_name": None,
+        "user_uuid": f"10000000-0000-4000-8000-{i % 11:012d}",
+        "card_number": str(4000000000000000 + 37 * i),
+        "store_code": ["HI-9B97EE4E", "LA-1A2B3C4D", "WEB-1388012W"][i % 3],
+        "product_code": f"a{i % 4}-{1000000 + i % 6}g",
+        "1": None,
+        "product_quantity": i % 13 + 1
+    } for i in range(rows)]
+
+
+# records by source, with the column set to NULL in the last row, so that only the last chunk holds it
+SOURCES = {"users": (make_users, "join_date"), "orders": (make_orders, "product_quantity")}
+
+
+class StubExtractor():
+    """
+    Reads records the way pandas reads a table: every chunk infers the dtypes of its own rows.
+    """
+    def __init__(self, records):
+        self.records = records
+
+    def read_rds_table(self, table_name, engine):
+        return pd.DataFrame.from_records(self.records)
+
+    def read_rds_table_in_chunks(self, table_name, engine, chunksize):
+        for start in range(0, len(self.records), chunksize):
+            yield pd.DataFrame.from_records(self.records[start:start + chunksize])
+
+
+def make_extractor(source):
+    make_records, null_column = SOURCES[source]
+    records = make_records(ROWS)
+    records[-1][null_column] = None
+    return StubExtractor(records)
+
+
+@pytest.mark.parametrize("source, method, table_name", [
+    ("users", "clean_user_data", "dim_users"),
+    ("orders", "clean_orders_data", "orders_table")
+])
+def test_chunked_cleaning_and_upload_match_the_full_frame(engine, source, method, table_name):
+    extractor = make_extractor(source)
+    clean = getattr(DataCleaning(), method)
+    chunks = [clean(chunk) for chunk in extractor.read_rds_table_in_chunks(table_name, None, CHUNKSIZE)]
+    full = clean(extractor.read_rds_table(table_name, None))
+
+    # every chunk infers the categories of its own values
+    categories = {column: dtype for column, dtype in full.dtypes.items() if isinstance(dtype, pd.CategoricalDtype)}
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True).astype(categories), full)
+
+    connection = DatabaseConnector()
+    connection.upload_chunks_to_db(iter(chunks), table_name, engine)
+    chunked_copies = engine.copies()
+    engine.log.clear()
+    connection.upload_to_db(full, table_name, engine)
+    assert len(chunked_copies) == len(chunks)
+    assert "".join(chunked_copies) == "".join(engine.copies())
+
+
+def test_the_last_chunk_reads_its_null_integers_as_floats():
+    chunks = list(make_extractor("orders").read_rds_table_in_chunks("orders_table", None, CHUNKSIZE))
+    assert chunks[0]["product_quantity"].dtype == "int64"
+    assert chunks[-1]["product_quantity"].dtype == "float64"
+
+
+def test_it_writes_integers_of_later_chunks_with_nulls_as_integers(engine):
+    chunks = [
+        pd.DataFrame({"date_uuid": ["a", "b"], "product_quantity": [1, 2]}),
+        pd.DataFrame({"date_uuid": ["c", "d"], "product_quantity": [3.0, float("nan")]})
+    ]
+    DatabaseConnector().upload_chunks_to_db(iter(chunks), "orders_table", engine)
+    assert engine.copies() == ["a,1\nb,2\n", "c,3\nd,\n"]
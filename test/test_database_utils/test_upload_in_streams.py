@@ -0,0 +1,81 @@
+import pandas as pd
+import pytest
+from src.database_utils import DatabaseConnector
+
+STAGING = '"orders_table_staging"'
+
+
+def make_orders(rows, start=0):
+    return pd.DataFrame({
+        "date_uuid": [f"uuid-{row}" for row in range(start, start + rows)],
+        "product_quantity": [row % 7 for row in range(start, start + rows)]
+    })
+
+
+def upload(engine, chunks, streams=3):
+    with DatabaseConnector(upload_streams=streams) as connection:
+        connection.MIN_STREAM_ROWS = 10
+        connection.upload_chunks_to_db(iter(chunks), "orders_table", engine)
+
+
+def statements_by_connection(engine):
+    connections = {}
+    for number, statement, _ in engine.log:
+        connections.setdefault(number, []).append(statement)
+    return connections
+
+
+def test_it_splits_chunks_into_partitions_of_at_least_min_stream_rows(engine):
+    upload(engine, [make_orders(100), make_orders(25, 100), make_orders(5, 125)])
+    sizes = [payload.count("\n") for payload in engine.copies()]
+    assert sorted(sizes[:3]) == [32, 34, 34]
+    assert sorted(sizes[3:5]) == [12, 13]
+    assert sizes[5:] == [5]
+    copied = "".join(engine.copies())
+    assert sorted(copied.splitlines()) == sorted(make_orders(130).to_csv(index=False, header=False).splitlines())
+
+
+def test_every_partition_is_copied_and_committed_on_its_own_connection(engine):
+    upload(engine, [make_orders(30)])
+    streams = [statements for statements in statements_by_connection(engine).values()
+               if statements[0].startswith("COPY")]
+    assert len(streams) == 3
+    for statements in streams:
+        assert statements == [f"COPY {STAGING} (\"date_uuid\", \"product_quantity\") FROM STDIN WITH (FORMAT csv)",
+                              "COMMIT", "CLOSE"]
+
+
+def test_it_commits_an_unlogged_staging_table_then_swaps_it_in(engine):
+    upload(engine, [make_orders(30)])
+    connections = list(statements_by_connection(engine).values())
+    assert connections[0] == [
+        f"DROP TABLE IF EXISTS {STAGING}",
+        f'CREATE UNLOGGED TABLE {STAGING} ("date_uuid" UUID, "product_quantity" SMALLINT)',
+        "COMMIT",
+        "CLOSE"
+    ]
+    assert [statement for statement in connections[-1] if "pg_constraint" not in statement] == [
+        f"ALTER TABLE {STAGING} SET LOGGED",
+        'DROP TABLE IF EXISTS "orders_table"',
+        f'ALTER TABLE {STAGING} RENAME TO "orders_table"',
+        "COMMIT",
+        "CLOSE"
+    ]
+
+
+def test_it_replaces_the_rows_of_tables_with_dependents(engine):
+    engine.results["pg_constraint"] = (True, True, False)
+    upload(engine, [make_orders(30)])
+    statements = list(statements_by_connection(engine).values())[-1]
+    assert 'DELETE FROM "orders_table"' in statements
+    assert not any("SET LOGGED" in statement or "RENAME" in statement for statement in statements)
+
+
+def test_a_failing_partition_drops_the_staging_table_and_leaves_the_target_untouched(engine):
+    engine.fail_on = lambda statement, payload: statement.startswith("COPY") and "uuid-40," in payload
+    with pytest.raises(RuntimeError):
+        upload(engine, [make_orders(30), make_orders(30, 30)])
+    statements = engine.statements()
+    assert not any('"orders_table"' in statement for statement in statements)
+    assert statements[-3:] == [f"DROP TABLE IF EXISTS {STAGING}", "COMMIT", "CLOSE"]
+    assert "ROLLBACK" in statements
@@ -0,0 +1,36 @@
+from threading import Barrier
+import pandas as pd
+import pytest
+from src.database_utils import DatabaseConnector
+
+TABLES = {"dim_users": pd.DataFrame({"id": [1]}), "dim_products": pd.DataFrame({"id": [2]})}
+
+
+def test_it_uploads_every_table_at_the_same_time():
+    connection = DatabaseConnector()
+    barrier = Barrier(len(TABLES), timeout=5)
+    uploaded = {}
+
+    def upload_to_db(df, table_name, engine):
+        # only returns once every upload has started
+        barrier.wait()
+        uploaded[table_name] = df
+
+    connection.upload_to_db = upload_to_db
+    connection.upload_tables_to_db(TABLES, engine=None)
+    assert uploaded == TABLES
+
+
+def test_it_raises_the_first_error_once_every_upload_has_finished():
+    connection = DatabaseConnector()
+    uploaded = []
+
+    def upload_to_db(df, table_name, engine):
+        if table_name == "dim_users":
+            raise ValueError(f"no data to upload to {table_name}")
+        uploaded.append(table_name)
+
+    connection.upload_to_db = upload_to_db
+    with pytest.raises(ValueError):
+        connection.upload_tables_to_db(TABLES, engine=None)
+    assert uploaded == ["dim_products"]
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.database_utils import DatabaseConnector
+
+STAGING = '"dim_card_details_staging"'
+CARDS = pd.DataFrame({
+    "card_number": ["4111", "4222", None, "4333", "4444"],
+    "card_provider": ["VISA, 16 digit", 'say "hi"', "Maestro", np.nan, "JCB"]
+})
+
+
+def test_it_copies_into_a_staging_table_swapped_in_one_transaction(engine):
+    DatabaseConnector().upload_to_db(CARDS, "dim_card_details", engine)
+    statements = [statement for statement in engine.statements() if "pg_constraint" not in statement]
+    assert statements == [
+        f"DROP TABLE IF EXISTS {STAGING}",
+        f'CREATE TABLE {STAGING} ("card_number" VARCHAR(20), "card_provider" VARCHAR(255))',
+        f'COPY {STAGING} ("card_number", "card_provider") FROM STDIN WITH (FORMAT csv)',
+        'DROP TABLE IF EXISTS "dim_card_details"',
+        f'ALTER TABLE {STAGING} RENAME TO "dim_card_details"',
+        "COMMIT",
+        "CLOSE"
+    ]
+    assert len({number for number, _, _ in engine.log}) == 1
+
+
+def test_it_writes_missing_values_as_empty_fields_and_quotes_commas_and_quotes(engine):
+    DatabaseConnector().upload_to_db(CARDS, "dim_card_details", engine)
+    assert engine.copies() == ['4111,"VISA, 16 digit"\n4222,"say ""hi"""\n,Maestro\n4333,\n4444,JCB\n']
+
+
+def test_it_creates_the_staging_table_once_for_every_copy_slice(engine):
+    connection = DatabaseConnector()
+    connection.COPY_CHUNK_SIZE = 2
+    connection.upload_chunks_to_db(iter([CARDS, CARDS.head(1)]), "dim_card_details", engine)
+    statements = engine.statements()
+    assert sum(statement.startswith("CREATE TABLE") for statement in statements) == 1
+    assert [payload.count("\n") for payload in engine.copies()] == [2, 2, 1, 1]
+
+
+def test_it_rolls_back_on_error_leaving_the_target_untouched(engine):
+    engine.fail_on = lambda statement, payload: statement.startswith("COPY")
+    with pytest.raises(RuntimeError):
+        DatabaseConnector().upload_to_db(CARDS, "dim_card_details", engine)
+    statements = engine.statements()
+    assert statements[-2:] == ["ROLLBACK", "CLOSE"]
+    assert "COMMIT" not in statements
+    assert not any('"dim_card_details"' in statement for statement in statements)
+
+
+def test_it_rejects_empty_input(engine):
+    with pytest.raises(ValueError):
+        DatabaseConnector().upload_chunks_to_db(iter([]), "dim_card_details", engine)
+    assert engine.statements() == ["ROLLBACK", "CLOSE"]
@@ -0,0 +1,39 @@
+import pandas as pd
+import pytest
+from src.database_utils import DatabaseConnector
+
+CHUNKS = [
+    pd.DataFrame({"date_uuid": ["a", "b", "a"], "product_quantity": [1, 2, 3]}),
+    pd.DataFrame({"date_uuid": ["c"], "product_quantity": [4]})
+]
+
+
+def test_it_defers_foreign_key_checks_to_a_commit_under_the_replace_lock(engine):
+    connection = DatabaseConnector()
+    connection.upsert_chunks_to_db(iter(CHUNKS), "orders_table", ("date_uuid",), engine)
+    statements = [statement.split(" (")[0] for statement in engine.statements()]
+    assert statements == [
+        "SET CONSTRAINTS ALL DEFERRED",
+        'CREATE UNIQUE INDEX IF NOT EXISTS "orders_table_date_uuid_key" ON "orders_table"',
+        'CREATE TEMP TABLE "orders_table_upsert"',
+        'TRUNCATE "orders_table_upsert"',
+        'COPY "orders_table_upsert"',
+        'INSERT INTO "orders_table"',
+        'TRUNCATE "orders_table_upsert"',
+        'COPY "orders_table_upsert"',
+        'INSERT INTO "orders_table"',
+        "SELECT pg_advisory_xact_lock(%s)",
+        "COMMIT",
+        "CLOSE"
+    ]
+    assert engine.log[-3][2] == (connection.REPLACE_LOCK_ID,)
+    assert engine.copies()[0] == "b,2\na,3\n"
+
+
+def test_it_rolls_back_without_taking_the_lock_on_error(engine):
+    engine.fail_on = lambda statement, payload: statement.startswith("INSERT")
+    with pytest.raises(RuntimeError):
+        DatabaseConnector().upsert_chunks_to_db(iter(CHUNKS), "orders_table", ("date_uuid",), engine)
+    statements = engine.statements()
+    assert statements[-2:] == ["ROLLBACK", "CLOSE"]
+    assert "SELECT pg_advisory_xact_lock(%s)" not in statements
@@ -0,0 +1,28 @@
+import pickle
+import numpy as np
+import pandas as pd
+from src.execution import builtin_object_frames, builtin_object_view
+
+
+def test_it_views_unpickled_object_arrays_with_the_builtin_dtype():
+    values = pickle.loads(pickle.dumps(np.array(["a", None], dtype=object)))
+    view = builtin_object_view(values)
+    assert view.dtype is np.dtype(object)
+    assert view.base is values
+
+
+def test_it_returns_other_values_as_they_are():
+    values = np.array([1, 2])
+    categories = pd.Categorical(["a", "b"])
+    assert builtin_object_view(values) is values
+    assert builtin_object_view(categories) is categories
+
+
+def test_astype_str_leaves_the_objects_of_unpickled_frames_alone():
+    df = pickle.loads(pickle.dumps(pd.DataFrame({"name": ["a", np.nan], "id": [1, 2]})))
+    frame, number = builtin_object_frames((df, 1))
+    frame["name"].astype(str)
+    assert pd.isna(df.loc[1, "name"])
+    assert frame["name"].to_numpy().dtype is np.dtype(object)
+    pd.testing.assert_frame_equal(frame, df)
+    assert number == 1
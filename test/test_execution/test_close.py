@@ -0,0 +1,15 @@
+from operator import add
+from src.execution import ThreadBackend
+
+
+def test_it_starts_new_workers_after_closing():
+    backend = ThreadBackend(max_workers=2)
+    first = backend.executor()
+    backend.close()
+    assert backend.map(add, [1], [2]) == [3]
+    assert backend.executor() is not first
+    backend.close()
+
+
+def test_it_can_be_closed_before_any_map():
+    ThreadBackend().close()
@@ -0,0 +1,57 @@
+from operator import add
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from src.data_cleaning import DataCleaning, clean_partition
+from src.execution import BACKENDS, DaskBackend, ProcessBackend, SharedFrame
+
+
+@pytest.mark.parametrize("name", ["serial", "threads", "processes"])
+def test_it_returns_the_results_in_order(name):
+    with BACKENDS[name](max_workers=2) as backend:
+        assert backend.map(add, [1, 2, 3], [10, 20, 30]) == [11, 22, 33]
+
+
+@pytest.mark.parametrize("name", ["serial", "threads", "processes"])
+def test_it_raises_the_errors_of_the_calls(name):
+    with BACKENDS[name](max_workers=2) as backend:
+        with pytest.raises(TypeError):
+            backend.map(add, [1, "a"], [1, 2])
+
+
+def test_dask_backend_runs_on_a_local_cluster():
+    pytest.importorskip("dask.distributed")
+    with DaskBackend(max_workers=2) as backend:
+        assert backend.map(add, [1, 2, 3], [10, 20, 30]) == [11, 22, 33]
+
+
+def shared_files():
+    return {name for name in os.listdir(SharedFrame.HANDOFF_DIR) if name.startswith("frame-")}
+
+
+def test_process_backend_hands_dataframes_over_in_shared_memory():
+    df = pd.DataFrame({"id": [1, 2], "name": ["a", np.nan]})
+    before = shared_files()
+    with ProcessBackend(max_workers=2) as backend:
+        results = backend.map(add, [df, df], [df, df.iloc[::-1]])
+        with pytest.raises(TypeError):
+            backend.map(add, [df, df], [df, 1.5])
+    for result in results:
+        pd.testing.assert_frame_equal(result, df + df)
+    assert shared_files() == before
+
+
+@pytest.mark.parametrize("shared_memory", [True, False])
+def test_process_workers_do_not_turn_missing_values_into_text(shared_memory):
+    df = pd.DataFrame({
+        "product_name": ["a", "b", "c"],
+        "product_price": ["£1.00", "£2.00", "£3.00"],
+        "weight": ["1kg", np.nan, "bad"],
+        "category": ["x", "y", "x"],
+        "date_added": ["2020-01-02", "2020-01-03", "2020-01-04"],
+        "removed": ["Still_avaliable", "Removed", "Still_avaliable"]
+    })
+    with ProcessBackend(max_workers=1, shared_memory=shared_memory) as backend:
+        [(_, _, unmatched_weights)] = backend.map(clean_partition, [DataCleaning()], [df], ["products"])
+    assert unmatched_weights["weight"].tolist() == ["bad"]
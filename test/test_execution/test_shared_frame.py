@@ -0,0 +1,73 @@
+import os
+import pickle
+import numpy as np
+import pandas as pd
+from src.execution import SharedFrame
+
+
+def make_frame():
+    return pd.DataFrame({
+        "id": [1, 2, 3],
+        "price": [1.5, np.nan, 2.0],
+        "date": pd.to_datetime(["2020-01-01", None, "2020-01-03"]),
+        "flag": [True, False, True],
+        "name": ["a", np.nan, "c"],
+        "code": ["x", None, "z"],
+        "mixed": ["a", 1, np.nan],
+        "weight_class": pd.Categorical(["light", None, "heavy"], ordered=True),
+        "quantity": pd.array([1, None, 3], dtype="Int16"),
+        "uuid": pd.array(["u1", None, "u3"], dtype="string[pyarrow]")
+    }, index=[10, 11, 12])
+
+
+def load(df):
+    frame = pickle.loads(pickle.dumps(SharedFrame(df)))
+    try:
+        return frame.load()
+    finally:
+        frame.unlink()
+
+
+def test_it_returns_the_shared_frame():
+    pd.testing.assert_frame_equal(load(make_frame()), make_frame())
+
+
+def test_it_keeps_nan_and_none_in_text_columns():
+    result = load(make_frame())
+    assert result["name"].tolist()[1] is not None and np.isnan(result["name"].tolist()[1])
+    assert result["code"].tolist()[1] is None
+
+
+def test_numpy_columns_are_read_only_views_of_the_file():
+    result = load(make_frame())
+    assert not result["id"].to_numpy().flags.writeable
+    assert not result["date"].to_numpy().flags.writeable
+
+
+def test_it_keeps_duplicate_columns_and_empty_frames():
+    df = pd.DataFrame([[1, "a"], [2, "b"]], columns=["a", "a"])
+    pd.testing.assert_frame_equal(load(df), df)
+    pd.testing.assert_frame_equal(load(pd.DataFrame(index=pd.RangeIndex(3))), pd.DataFrame(index=pd.RangeIndex(3)))
+
+
+def test_text_columns_are_not_modified_by_astype():
+    result = load(make_frame())
+    result["mixed"].astype(str)
+    result["name"].astype(str)
+    assert pd.isna(result.loc[12, "mixed"]) and pd.isna(result.loc[11, "name"])
+
+
+def test_loaded_frames_outlive_the_file():
+    df = pd.DataFrame({"id": range(5), "name": list("abcde")})
+    frame = SharedFrame(df)
+    result = frame.load()
+    frame.unlink()
+    assert not os.path.exists(frame.path)
+    pd.testing.assert_frame_equal(result, df)
+
+
+def test_it_can_be_called_twice(tmp_path):
+    frame = SharedFrame(pd.DataFrame({"id": [1]}), handoff_dir=str(tmp_path))
+    frame.unlink()
+    frame.unlink()
+    assert os.listdir(tmp_path) == []
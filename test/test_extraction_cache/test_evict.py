@@ -0,0 +1,27 @@
+from datetime import datetime, timedelta, timezone
+import os
+import pandas as pd
+from src.extraction_cache import ExtractionCache
+
+NOW = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def test_it_removes_expired_entries_and_their_objects(tmp_path):
+    cache = ExtractionCache(str(tmp_path), ttl=timedelta(hours=1))
+    cache.store("old", pd.DataFrame({"a": [1]}), {}, now=NOW)
+    cache.store("new", pd.DataFrame({"a": [2]}), {}, now=NOW + timedelta(minutes=30))
+    evicted = cache.evict(now=NOW + timedelta(minutes=70))
+    assert evicted == ["old"]
+    assert len(os.listdir(tmp_path / "objects")) == 1
+    assert cache.lookup("new", now=NOW + timedelta(minutes=70)) is not None
+
+
+def test_it_removes_least_recently_used_entries_over_max_bytes(tmp_path):
+    cache = ExtractionCache(str(tmp_path))
+    first = cache.store("first", pd.DataFrame({"a": range(100)}), {}, now=NOW)
+    cache.store("second", pd.DataFrame({"a": range(100, 200)}), {}, now=NOW + timedelta(minutes=1))
+    cache.touch(cache.lookup("first", now=NOW), now=NOW + timedelta(minutes=2))
+    cache.max_bytes = first["size"] * 3 // 2
+    evicted = cache.evict(now=NOW + timedelta(minutes=3))
+    assert evicted == ["second"]
+    assert cache.lookup("first", now=NOW + timedelta(minutes=3)) is not None
@@ -0,0 +1,24 @@
+from datetime import datetime, timedelta, timezone
+import pandas as pd
+from src.extraction_cache import ExtractionCache
+
+NOW = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def test_it_returns_none_for_unknown_sources(tmp_path):
+    cache = ExtractionCache(str(tmp_path))
+    assert cache.lookup("http://example.com/missing.json") is None
+
+
+def test_it_returns_none_for_expired_entries(tmp_path):
+    cache = ExtractionCache(str(tmp_path), ttl=timedelta(hours=1))
+    cache.store("source", pd.DataFrame({"a": [1]}), {}, now=NOW)
+    assert cache.lookup("source", now=NOW + timedelta(minutes=59)) is not None
+    assert cache.lookup("source", now=NOW + timedelta(hours=1)) is None
+
+
+def test_touch_extends_the_entry_lifetime(tmp_path):
+    cache = ExtractionCache(str(tmp_path), ttl=timedelta(hours=1))
+    cache.store("source", pd.DataFrame({"a": [1]}), {}, now=NOW)
+    cache.touch(cache.lookup("source", now=NOW), now=NOW + timedelta(minutes=30))
+    assert cache.lookup("source", now=NOW + timedelta(minutes=80)) is not None
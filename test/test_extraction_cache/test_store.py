@@ -0,0 +1,30 @@
+import os
+import pandas as pd
+from src.extraction_cache import ExtractionCache
+
+
+def test_it_round_trips_a_dataframe(tmp_path):
+    cache = ExtractionCache(str(tmp_path))
+    df = pd.DataFrame({"a": [1, 2, 3], "b": ["x", None, "z"]}, index=[4, 5, 6])
+    cache.store("http://example.com/data.json", df, {"etag": '"abc"', "last_modified": None})
+    entry = cache.lookup("http://example.com/data.json")
+    assert entry["etag"] == '"abc"'
+    assert entry["rows"] == 3
+    assert cache.load(entry).equals(df)
+
+
+def test_it_shares_objects_with_identical_content(tmp_path):
+    cache = ExtractionCache(str(tmp_path))
+    df = pd.DataFrame({"a": [1, 2, 3]})
+    first = cache.store("s3://bucket/one.csv", df, {})
+    second = cache.store("s3://bucket/two.csv", df.copy(), {})
+    assert first["object"] == second["object"]
+    assert os.listdir(tmp_path / "objects") == [first["object"]]
+
+
+def test_it_stores_mixed_type_columns_as_strings(tmp_path):
+    cache = ExtractionCache(str(tmp_path))
+    df = pd.DataFrame({"card_number": [4971858637664481, "?4654492346226715", None]})
+    entry = cache.store("card_details.pdf", df, {})
+    result = cache.load(entry)
+    assert result["card_number"].tolist() == ["4971858637664481", "?4654492346226715", None]
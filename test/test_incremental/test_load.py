@@ -0,0 +1,96 @@
+from datetime import datetime, timezone
+import pandas as pd
+from src.incremental import IncrementalLoader
+
+SOURCE = pd.DataFrame({
+    "index": [0, 1, 2, 3, 4],
+    "date_uuid": ["a", "b", "c", "d", "e"],
+    "product_quantity": [1, 2, 3, 4, 5]
+})
+
+
+class StubExtractor():
+    def __init__(self, source):
+        self.source = source
+        self.calls = []
+
+    def read_rds_table_in_chunks(self, table_name, engine, chunksize):
+        self.calls.append(("full", table_name))
+        for start in range(0, len(self.source), chunksize):
+            yield self.source.iloc[start:start + chunksize]
+
+    def read_rds_table_since(self, table_name, engine, watermark_column, watermark, chunksize):
+        self.calls.append(("since", watermark))
+        new_rows = self.source[self.source[watermark_column] > watermark]
+        for start in range(0, len(new_rows), chunksize):
+            yield new_rows.iloc[start:start + chunksize]
+
+
+class StubConnector():
+    def __init__(self, state=None):
+        self.state = state
+        self.uploaded = None
+        self.upserted = None
+
+    def read_watermark(self, table_name, engine):
+        return self.state
+
+    def write_watermark(self, table_name, watermark, engine, full_refreshed_at=None):
+        previous = self.state["full_refreshed_at"] if self.state else None
+        self.state = {"watermark": watermark, "full_refreshed_at": full_refreshed_at or previous}
+
+    def upload_chunks_to_db(self, chunks, table_name, engine):
+        self.uploaded = pd.concat(list(chunks))
+
+    def upsert_chunks_to_db(self, chunks, table_name, key_columns, engine):
+        chunks = list(chunks)
+        self.upserted = (pd.concat(chunks) if chunks else None, key_columns)
+
+
+def clean(df):
+    return df.drop(columns="index")
+
+
+def load(loader, **kwargs):
+    loader.load("orders_table", "orders_table", clean, "index", ("date_uuid",), None, None, chunksize=2, **kwargs)
+
+
+def test_it_runs_full_refresh_without_watermark():
+    connection = StubConnector()
+    extractor = StubExtractor(SOURCE)
+    load(IncrementalLoader(connection, extractor))
+    assert extractor.calls == [("full", "orders_table")]
+    assert connection.uploaded["date_uuid"].tolist() == ["a", "b", "c", "d", "e"]
+    assert "index" not in connection.uploaded.columns
+    assert connection.state["watermark"] == 4
+    assert connection.state["full_refreshed_at"] is not None
+
+
+def test_it_upserts_only_rows_past_the_watermark():
+    refreshed_at = datetime.now(timezone.utc)
+    connection = StubConnector({"watermark": 2, "full_refreshed_at": refreshed_at})
+    extractor = StubExtractor(SOURCE)
+    load(IncrementalLoader(connection, extractor))
+    assert extractor.calls == [("since", 2)]
+    upserted, key_columns = connection.upserted
+    assert upserted["date_uuid"].tolist() == ["d", "e"]
+    assert key_columns == ("date_uuid",)
+    assert connection.uploaded is None
+    assert connection.state == {"watermark": 4, "full_refreshed_at": refreshed_at}
+
+
+def test_it_keeps_the_watermark_without_new_rows():
+    refreshed_at = datetime.now(timezone.utc)
+    connection = StubConnector({"watermark": 4, "full_refreshed_at": refreshed_at})
+    load(IncrementalLoader(connection, StubExtractor(SOURCE)))
+    assert connection.state == {"watermark": 4, "full_refreshed_at": refreshed_at}
+
+
+def test_it_forces_full_refresh():
+    refreshed_at = datetime.now(timezone.utc)
+    connection = StubConnector({"watermark": 4, "full_refreshed_at": refreshed_at})
+    extractor = StubExtractor(SOURCE)
+    load(IncrementalLoader(connection, extractor), full_refresh=True)
+    assert extractor.calls == [("full", "orders_table")]
+    assert len(connection.uploaded) == 5
+    assert connection.state["full_refreshed_at"] > refreshed_at
@@ -0,0 +1,24 @@
+from datetime import datetime, timedelta, timezone
+from src.incremental import IncrementalLoader
+
+loader = IncrementalLoader(connection=None, extractor=None, full_refresh_interval=timedelta(days=7))
+NOW = datetime(2024, 1, 10, tzinfo=timezone.utc)
+
+
+def test_it_needs_full_refresh_without_watermark():
+    assert loader.needs_full_refresh(None, NOW) is True
+
+
+def test_it_needs_full_refresh_without_previous_full_refresh():
+    state = {"watermark": 10, "full_refreshed_at": None}
+    assert loader.needs_full_refresh(state, NOW) is True
+
+
+def test_it_skips_full_refresh_within_interval():
+    state = {"watermark": 10, "full_refreshed_at": NOW - timedelta(days=6)}
+    assert loader.needs_full_refresh(state, NOW) is False
+
+
+def test_it_needs_full_refresh_after_interval():
+    state = {"watermark": 10, "full_refreshed_at": NOW - timedelta(days=7)}
+    assert loader.needs_full_refresh(state, NOW) is True
@@ -0,0 +1,46 @@
+import pandas as pd
+from src.instrumentation import Instrumentation
+
+instrumentation = Instrumentation()
+
+
+def make_report(**stages):
+    return {"stages": {
+        name: {"wall_time": wall_time, "cpu_time": 1.0, "process_peak_rss_growth": 1024}
+        for name, wall_time in stages.items()
+    }}
+
+
+def test_it_flags_stages_slower_than_the_threshold():
+    baseline = make_report(extract=10.0, clean=2.0)
+    current = make_report(extract=13.0, clean=2.1)
+    result = instrumentation.compare(baseline, current, threshold=0.2)
+    assert result.set_index("stage")["regression"].to_dict() == {"clean": False, "extract": True}
+    assert result.set_index("stage").loc["extract", "wall_time_ratio"] == 1.3
+
+
+def test_it_ignores_small_absolute_increases():
+    result = instrumentation.compare(make_report(upload=0.01), make_report(upload=0.03))
+    assert not result["regression"].any()
+
+
+def test_it_only_compares_stages_of_both_reports():
+    result = instrumentation.compare(make_report(extract=1.0), make_report(clean=1.0))
+    assert result.empty
+    assert "regression" in result.columns
+
+
+def test_it_does_not_flag_the_growth_of_the_process_peak_rss():
+    baseline, current = make_report(clean=2.0), make_report(clean=2.0)
+    current["stages"]["clean"]["process_peak_rss_growth"] = 10 * 1024
+    result = instrumentation.compare(baseline, current).set_index("stage")
+    assert result.loc["clean", "process_peak_rss_growth_ratio"] == 10
+    assert not result.loc["clean", "regression"]
+
+
+def test_it_compares_with_reports_lacking_a_metric():
+    baseline = make_report(clean=1.0)
+    del baseline["stages"]["clean"]["process_peak_rss_growth"]
+    result = instrumentation.compare(baseline, make_report(clean=2.0)).set_index("stage")
+    assert pd.isna(result.loc["clean", "process_peak_rss_growth_ratio"])
+    assert result.loc["clean", "regression"]
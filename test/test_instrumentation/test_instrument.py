@@ -0,0 +1,55 @@
+from time import sleep
+import pandas as pd
+from src.instrumentation import Instrumentation
+
+
+class StubConnector():
+    TABLE = "dim_users"
+
+    def upload_to_db(self, df, table_name, engine=None):
+        return None
+
+    def upload_chunks_to_db(self, chunks, table_name, engine=None):
+        for chunk in chunks:
+            sleep(0.01)
+
+    def read_chunks(self, table_name, chunks=3, rows=10):
+        for _ in range(chunks):
+            sleep(0.02)
+            yield pd.DataFrame({"a": range(rows)})
+
+    def init_db_engine(self):
+        return "engine"
+
+
+def test_it_records_dataframes_passed_in_and_returned():
+    instrumentation = Instrumentation()
+    connector = instrumentation.instrument(StubConnector(), "upload_*")
+    connector.upload_to_db(pd.DataFrame({"a": range(5)}), "dim_users")
+    metrics = instrumentation.stages["StubConnector.upload_to_db[dim_users]"]
+    assert metrics["calls"] == 1
+    assert metrics["rows_in"] == 5
+    assert metrics["bytes_in"] > 0
+    assert metrics["rows_out"] == 0
+
+
+def test_it_only_instruments_matching_public_methods():
+    instrumentation = Instrumentation()
+    connector = instrumentation.instrument(StubConnector(), "upload_*")
+    assert connector.init_db_engine() == "engine"
+    assert connector.TABLE == "dim_users"
+    assert instrumentation.stages == {}
+
+
+def test_it_measures_iterators_as_they_are_consumed():
+    instrumentation = Instrumentation()
+    connector = instrumentation.instrument(StubConnector())
+    chunks = connector.read_chunks("legacy_users")
+    connector.upload_chunks_to_db(chunks, "dim_users")
+    read = instrumentation.stages["StubConnector.read_chunks[legacy_users]"]
+    upload = instrumentation.stages["StubConnector.upload_chunks_to_db[dim_users]"]
+    assert read["calls"] == 1
+    assert read["rows_out"] == 30
+    assert upload["rows_in"] == 30
+    assert read["wall_time"] >= 0.06
+    assert 0.03 <= upload["wall_time"] < read["wall_time"]
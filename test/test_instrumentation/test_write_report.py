@@ -0,0 +1,27 @@
+import json
+import pandas as pd
+from src.instrumentation import Instrumentation
+
+
+def test_it_writes_a_json_report(tmp_path):
+    instrumentation = Instrumentation()
+    with instrumentation.measure("clean") as span:
+        span["rows_out"] += len(pd.DataFrame({"a": [1, 2]}))
+    path = tmp_path / "reports" / "run.json"
+    report = instrumentation.write_report(str(path), status="succeeded")
+    with open(path) as file:
+        written = json.load(file)
+    assert written == report
+    assert written["status"] == "succeeded"
+    assert set(written["stages"]["clean"]) == set(Instrumentation.METRICS)
+    assert written["stages"]["clean"]["rows_out"] == 2
+
+
+def test_it_accumulates_metrics_of_a_stage():
+    instrumentation = Instrumentation()
+    for _ in range(3):
+        with instrumentation.measure("clean") as span:
+            span["rows_in"] += 10
+    metrics = instrumentation.report()["stages"]["clean"]
+    assert metrics["calls"] == 3
+    assert metrics["rows_in"] == 30
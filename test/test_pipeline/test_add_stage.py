@@ -0,0 +1,23 @@
+import pytest
+from src.pipeline import Pipeline
+
+
+def test_it_registers_stages_in_order():
+    pipeline = Pipeline()
+    pipeline.add_stage("extract", lambda: 1)
+    pipeline.add_stage("clean", lambda value: value, depends_on=("extract",))
+    assert list(pipeline.stages) == ["extract", "clean"]
+    assert pipeline.stages["clean"].depends_on == ("extract",)
+
+
+def test_it_rejects_duplicate_stage_names():
+    pipeline = Pipeline()
+    pipeline.add_stage("extract", lambda: 1)
+    with pytest.raises(ValueError):
+        pipeline.add_stage("extract", lambda: 2)
+
+
+def test_it_rejects_unknown_dependencies():
+    pipeline = Pipeline()
+    with pytest.raises(ValueError):
+        pipeline.add_stage("clean", lambda value: value, depends_on=("extract",))
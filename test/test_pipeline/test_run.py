@@ -0,0 +1,73 @@
+from threading import Lock
+from time import sleep, perf_counter
+import pytest
+from src.pipeline import Pipeline
+
+
+def test_it_passes_dependency_results_in_order():
+    outputs = []
+    pipeline = Pipeline(max_workers=2)
+    pipeline.add_stage("extract_a", lambda: 2)
+    pipeline.add_stage("extract_b", lambda: 3)
+    pipeline.add_stage("combine", lambda a, b: a ** b, depends_on=("extract_a", "extract_b"))
+    pipeline.add_stage("load", lambda value: outputs.append(value), depends_on=("combine",))
+    durations = pipeline.run()
+    assert outputs == [8]
+    assert set(durations) == {"extract_a", "extract_b", "combine", "load"}
+
+
+def test_it_runs_independent_stages_concurrently():
+    pipeline = Pipeline(max_workers=3)
+    for name in ["users", "cards", "stores"]:
+        pipeline.add_stage(name, lambda: sleep(0.3))
+    start = perf_counter()
+    pipeline.run()
+    assert perf_counter() - start < 0.6
+
+
+def test_it_respects_max_workers():
+    lock = Lock()
+    state = {"running": 0, "peak": 0}
+
+    def stage():
+        with lock:
+            state["running"] += 1
+            state["peak"] = max(state["peak"], state["running"])
+        sleep(0.05)
+        with lock:
+            state["running"] -= 1
+
+    pipeline = Pipeline(max_workers=2)
+    for index in range(6):
+        pipeline.add_stage(f"stage_{index}", stage)
+    pipeline.run()
+    assert state["peak"] == 2
+
+
+def test_it_runs_a_stage_after_all_its_dependencies():
+    finished = []
+    pipeline = Pipeline(max_workers=4)
+    pipeline.add_stage("load_fast", lambda: finished.append("load_fast"))
+    pipeline.add_stage("load_slow", lambda: (sleep(0.2), finished.append("load_slow")))
+    pipeline.add_stage(
+        "build_schema",
+        lambda *_: finished.append("build_schema"),
+        depends_on=("load_fast", "load_slow")
+    )
+    pipeline.run()
+    assert finished[-1] == "build_schema"
+
+
+def test_it_raises_and_skips_dependents_on_failure():
+    finished = []
+
+    def fail():
+        raise RuntimeError("extract failed")
+
+    pipeline = Pipeline(max_workers=2)
+    pipeline.add_stage("extract", fail)
+    pipeline.add_stage("load", lambda value: finished.append("load"), depends_on=("extract",))
+    pipeline.add_stage("other", lambda: (sleep(0.1), finished.append("other")))
+    with pytest.raises(RuntimeError):
+        pipeline.run()
+    assert finished == ["other"]